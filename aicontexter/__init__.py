@@ -0,0 +1,22 @@
+"""AIContexter - gather a project's files into one context file for AI chats."""
+from .collector import (
+    DEFAULT_EXCLUDE_ENTRIES,
+    DEFAULT_SKIP_DIRS,
+    CollectionResult,
+    CollectorConfig,
+    FileCollector,
+    collect,
+    parse_filter_entries,
+    should_process_file,
+)
+
+__all__ = [
+    "DEFAULT_EXCLUDE_ENTRIES",
+    "DEFAULT_SKIP_DIRS",
+    "CollectionResult",
+    "CollectorConfig",
+    "FileCollector",
+    "collect",
+    "parse_filter_entries",
+    "should_process_file",
+]
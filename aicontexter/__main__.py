@@ -0,0 +1,364 @@
+"""Command-line entry point: ``python -m aicontexter``.
+
+Without arguments the Tk GUI is started. With a source folder the collection
+runs headless and tkinter is never imported.
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import Set
+
+from .batch import DEFAULT_PARALLEL_JOBS, load_manifest, run_batch
+from .collector import (
+    BUDGET_STRATEGIES,
+    COMMON_INCLUDE_TYPES,
+    DEFAULT_EXCLUDE_ENTRIES,
+    DEFAULT_WORKERS,
+    CollectorConfig,
+    FileCollector,
+    parse_filter_entries,
+    parse_include_extensions,
+)
+from .compaction import COMPACTION_MODES
+from .output import COMPRESSIONS, OUTPUT_FORMATS, compression_for_path, is_stdout
+from .profiles import list_profiles, load_profile, merge_config, save_profile
+from .reading import DEFAULT_EXCERPT_BYTES, OVERSIZE_MODES
+from .stats import PROFILE_ENV
+from .tokens import TOKENIZERS
+
+
+_SIZE_UNITS = {"": 1, "b": 1, "k": 1024, "kb": 1024, "m": 1024 ** 2, "mb": 1024 ** 2, "g": 1024 ** 3, "gb": 1024 ** 3}
+
+
+def parse_size(text: str) -> int:
+    """Parse a byte count such as '500000', '64KB' or '10M'."""
+    cleaned = text.strip().lower().replace("_", "")
+    number = cleaned.rstrip("kmgb")
+    unit = cleaned[len(number):]
+    try:
+        value = float(number) * _SIZE_UNITS[unit]
+    except (ValueError, KeyError):
+        raise argparse.ArgumentTypeError(f"invalid size '{text}' (use e.g. 500000, 64KB, 10MB)") from None
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"size must be positive, got '{text}'")
+    return int(value)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="aicontexter",
+        description="Collect a project's text files into a single context file. "
+                    "Run without arguments to open the GUI.",
+    )
+    parser.add_argument("source", nargs="?", help="Source folder to collect")
+    parser.add_argument("-o", "--output",
+                        help="Output file, or '-' for stdout (default: <source name>_collected.txt, .jsonl for --format jsonl)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="text",
+                        help="'text' (default) with ==== FILE ==== banners, or 'jsonl' with one JSON record per file "
+                             "(path, ext, size, encoding, content)")
+    parser.add_argument("--compress", choices=COMPRESSIONS,
+                        help="Compress the output while writing (default: from the output suffix, .gz or .zst; "
+                             "zstd needs the zstandard package)")
+    parser.add_argument("-p", "--prompt", default="", help="Task prompt written at the top of the output")
+    parser.add_argument("--prompt-file", help="Read the task prompt from this file")
+    parser.add_argument("--rank", action="store_true",
+                        help="Write the files most relevant to the task prompt first (BM25 over paths and contents)")
+    parser.add_argument("--top-k", type=int, metavar="K",
+                        help="Only collect the K files most relevant to the task prompt (implies --rank)")
+    parser.add_argument("-i", "--include", default="",
+                        help="Comma separated extensions to include (e.g. 'py,js'). "
+                             "When given, only these extensions are collected.")
+    parser.add_argument("-e", "--exclude", default=DEFAULT_EXCLUDE_ENTRIES,
+                        help="Comma separated extensions/names to exclude (default: the GUI's default list)")
+    parser.add_argument("--no-gitignore", action="store_true",
+                        help="Do not honour .gitignore/.ignore files")
+    parser.add_argument("--max-file-size", type=parse_size,
+                        help="Per-file size limit (e.g. 1MB); larger files are skipped or truncated (see --oversize)")
+    parser.add_argument("--oversize", choices=OVERSIZE_MODES, default="skip",
+                        help="What to do with files over --max-file-size: 'skip' (default) writes a marker, "
+                             "'truncate' writes the first and last --excerpt-bytes")
+    parser.add_argument("--excerpt-bytes", type=parse_size, default=DEFAULT_EXCERPT_BYTES,
+                        help=f"Head and tail size kept by --oversize truncate, at most half of --max-file-size "
+                             f"(default: {DEFAULT_EXCERPT_BYTES})")
+    parser.add_argument("--dedupe", action="store_true",
+                        help="Write files identical to an earlier one as a one-line '(identical to ...)' reference")
+    parser.add_argument("--compact", choices=COMPACTION_MODES,
+                        help="Shrink the output: 'strip' drops comments, docstrings and blank-line runs; "
+                             "'signatures' also replaces Python function bodies by '...'")
+    parser.add_argument("-j", "--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Number of parallel file readers (default: {DEFAULT_WORKERS}; 1 reads serially)")
+    parser.add_argument("--processes", action="store_true",
+                        help="Read and decode files in worker processes instead of threads")
+    parser.add_argument("--count-first", action="store_true",
+                        help="Count matching files before collecting so progress and the header include the total")
+    parser.add_argument("--cache", action="store_true",
+                        help="Reuse unchanged files from an incremental cache next to the output (<output>.cache.sqlite)")
+    parser.add_argument("--cache-file", help="Use this cache file instead of the sidecar (implies --cache)")
+    parser.add_argument("--tree-index", metavar="FILE",
+                        help="Keep the folder listings in FILE so later runs only list folders that changed")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted run from its checkpoint (<output>.checkpoint.json); "
+                             "needs the same source, output and options")
+    parser.add_argument("--max-tokens", type=int, help="Token budget for the whole output (estimated)")
+    parser.add_argument("--max-bytes", type=parse_size, help="Size budget for the whole output (e.g. 2MB)")
+    parser.add_argument("--split-tokens", type=int, metavar="N",
+                        help="Split the output into numbered parts of at most N estimated tokens "
+                             "(<output>.part001.txt, ...) indexed in <output>.parts.json")
+    parser.add_argument("--split-bytes", type=parse_size, metavar="SIZE",
+                        help="Split the output into numbered parts of at most SIZE bytes (e.g. 5MB)")
+    parser.add_argument("--budget-strategy", choices=BUDGET_STRATEGIES, default="stop",
+                        help="'stop' at the first file over budget (default) or 'skip' it and keep filling with files that fit")
+    parser.add_argument("--token-summary", action="store_true",
+                        help="Write a table of estimated tokens per file and directory into the header")
+    parser.add_argument("--tokenizer", choices=sorted(TOKENIZERS), default="heuristic",
+                        help="Token estimator: 'heuristic' (~4 chars/token, default) or 'tiktoken' (needs the tiktoken package)")
+    parser.add_argument("--stats", metavar="FILE",
+                        help="Write run statistics (time per phase, bytes, encodings, slowest files) to FILE as JSON")
+    parser.add_argument("--cprofile", metavar="FILE",
+                        help=f"Profile the run with cProfile and dump the data to FILE (or set {PROFILE_ENV}); "
+                             "combine with -j 1 to include reading")
+    parser.add_argument("--batch", metavar="MANIFEST",
+                        help="Run every job of a JSON manifest (source/output pairs with their own filters) "
+                             "concurrently on one shared reader pool; see aicontexter/batch.py for the format")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_PARALLEL_JOBS,
+                        help=f"Batch jobs running at the same time (default: {DEFAULT_PARALLEL_JOBS})")
+    parser.add_argument("--profile", metavar="NAME",
+                        help="Start from the settings saved as profile NAME (or a profile .json file); "
+                             "options given on the command line override it")
+    parser.add_argument("--save-profile", metavar="NAME",
+                        help="Save the effective settings as profile NAME; without a source folder only saves")
+    parser.add_argument("--list-profiles", action="store_true", help="List the saved profiles and exit")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Only print errors")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print every processed file")
+    parser.add_argument("--gui", action="store_true", help="Open the GUI even when other arguments are given")
+    return parser
+
+
+def config_from_args(args) -> CollectorConfig:
+    include_extensions = parse_include_extensions(args.include)
+    # Allow the GUI's grouped names (e.g. 'yml' also covers 'yaml')
+    for ext in list(include_extensions):
+        include_extensions.update(COMMON_INCLUDE_TYPES.get(ext, ()))
+
+    prompt = args.prompt
+    if args.prompt_file:
+        prompt = Path(args.prompt_file).read_text(encoding="utf-8")
+
+    return CollectorConfig(
+        use_all_files=not include_extensions,
+        include_extensions=include_extensions,
+        exclude_entries=parse_filter_entries(args.exclude),
+        prompt=prompt.strip(),
+        use_gitignore=not args.no_gitignore,
+        max_file_size=args.max_file_size,
+        oversize_mode=args.oversize,
+        excerpt_bytes=args.excerpt_bytes,
+        dedupe=args.dedupe,
+        compaction=args.compact,
+        resume=args.resume,
+        workers=args.workers,
+        use_processes=args.processes,
+        count_first=args.count_first,
+        use_cache=args.cache or bool(args.cache_file),
+        cache_path=Path(args.cache_file) if args.cache_file else None,
+        max_tokens=args.max_tokens,
+        max_bytes=args.max_bytes,
+        split_tokens=args.split_tokens,
+        split_bytes=args.split_bytes,
+        budget_strategy=args.budget_strategy,
+        token_summary=args.token_summary,
+        tokenizer=args.tokenizer,
+        output_format=args.format,
+        compression=args.compress or (compression_for_path(args.output) if args.output else None),
+        stats_path=Path(args.stats) if args.stats else None,
+        profile_path=Path(args.cprofile) if args.cprofile else None,
+        rank_files=args.rank,
+        tree_index_path=Path(args.tree_index) if args.tree_index else None,
+        top_k=args.top_k,
+    )
+
+
+# Command-line option (argparse dest) -> the CollectorConfig fields it sets
+OPTION_FIELDS = {
+    "include": ("use_all_files", "include_extensions"),
+    "exclude": ("exclude_entries",),
+    "prompt": ("prompt",),
+    "prompt_file": ("prompt",),
+    "no_gitignore": ("use_gitignore",),
+    "max_file_size": ("max_file_size",),
+    "oversize": ("oversize_mode",),
+    "excerpt_bytes": ("excerpt_bytes",),
+    "dedupe": ("dedupe",),
+    "compact": ("compaction",),
+    "resume": ("resume",),
+    "workers": ("workers",),
+    "processes": ("use_processes",),
+    "count_first": ("count_first",),
+    "cache": ("use_cache",),
+    "cache_file": ("use_cache", "cache_path"),
+    "max_tokens": ("max_tokens",),
+    "max_bytes": ("max_bytes",),
+    "split_tokens": ("split_tokens",),
+    "split_bytes": ("split_bytes",),
+    "budget_strategy": ("budget_strategy",),
+    "token_summary": ("token_summary",),
+    "tokenizer": ("tokenizer",),
+    "format": ("output_format",),
+    "compress": ("compression",),
+    "stats": ("stats_path",),
+    "cprofile": ("profile_path",),
+    "rank": ("rank_files",),
+    "tree_index": ("tree_index_path",),
+    "top_k": ("top_k",),
+}
+
+
+def explicit_options(argv=None) -> Set[str]:
+    """Destinations of the options actually given in ``argv``, whatever their value."""
+    parser = build_parser()
+    for action in parser._actions:
+        action.default = argparse.SUPPRESS
+    return set(vars(parser.parse_args(argv)))
+
+
+def build_config(args, explicit: Set[str]) -> CollectorConfig:
+    """The run's settings: the command line, on top of ``--profile`` if given.
+
+    ``explicit`` holds the options given on the command line (see
+    :func:`explicit_options`); only those override the profile.
+    """
+    config = config_from_args(args)
+    if args.profile:
+        names = {name for option in explicit for name in OPTION_FIELDS.get(option, ())}
+        if "output" in explicit and "compress" not in explicit and config.compression:
+            names.add("compression") # Implied by the output's suffix
+        config = merge_config(load_profile(args.profile), config, names)
+    return config
+
+
+def default_output_path(source_path: Path, config: CollectorConfig) -> Path:
+    name = f"{source_path.resolve().name}_collected.{'jsonl' if config.output_format == 'jsonl' else 'txt'}"
+    if config.compression:
+        name += {"gzip": ".gz", "zstd": ".zst"}[config.compression]
+    return Path(name)
+
+
+def _print_report(result, output_path: Path, prefix: str = "", verbose: bool = False):
+    destination = "stdout" if is_stdout(output_path) else output_path.resolve()
+    if result.output_parts:
+        destination = f"{result.output_parts} parts listed in {result.parts_manifest.resolve()}"
+    print(f"{prefix}Processed {result.processed_files} files. Output saved to: {destination}", file=sys.stderr)
+    if result.estimated_tokens:
+        print(f"{prefix}{result.token_summary_line()}", file=sys.stderr)
+    for line in (result.ranking_summary(), result.size_limit_summary(), result.budget_summary(),
+                 result.dedupe_summary(), result.compaction_summary(), result.resume_summary(), result.cache_summary(),
+                 result.tree_index_summary()):
+        if line:
+            print(f"{prefix}{line}", file=sys.stderr)
+    if verbose:
+        for line in result.stats.summary_lines():
+            print(f"{prefix}{line}", file=sys.stderr)
+
+
+def run_batch_command(args) -> int:
+    def progress(message, processed=None, total=None):
+        if processed is None or args.verbose:
+            print(message, file=sys.stderr)
+
+    try:
+        jobs = load_manifest(args.batch)
+        results = run_batch(jobs, workers=args.workers, parallel_jobs=args.jobs, use_processes=args.processes,
+                            progress=None if args.quiet else progress)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        print("Interrupted. Running jobs left checkpoints; add \"resume\": true to the manifest to continue.", file=sys.stderr)
+        return 130
+
+    failed = 0
+    for job_result in results:
+        prefix = f"[{job_result.job.name}] "
+        if job_result.error is not None:
+            failed += 1
+            print(f"{prefix}Error: {job_result.error}", file=sys.stderr)
+        elif job_result.result.total_files == 0:
+            failed += 1
+            print(f"{prefix}No files matching the criteria were found (or none fit into the budget).", file=sys.stderr)
+        elif not args.quiet:
+            _print_report(job_result.result, job_result.job.output, prefix, args.verbose)
+    if not args.quiet:
+        print(f"Batch finished: {len(results) - failed} of {len(results)} jobs succeeded.", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    explicit = explicit_options(argv)
+
+    if args.batch:
+        if args.source:
+            parser.error("a source folder cannot be combined with --batch")
+        return run_batch_command(args)
+
+    if args.list_profiles:
+        for name in list_profiles():
+            print(name)
+        return 0
+
+    if args.save_profile:
+        try:
+            saved_path = save_profile(args.save_profile, build_config(args, explicit))
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        if not args.quiet:
+            print(f"Saved profile '{args.save_profile}' to {saved_path}", file=sys.stderr)
+        if args.source is None and not args.gui:
+            return 0
+
+    if args.gui or args.source is None:
+        from .gui import main as gui_main # Deferred so headless runs never import tkinter
+        gui_main(profile=args.profile)
+        return 0
+
+    try:
+        config = build_config(args, explicit)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    source_path = Path(args.source)
+    output_path = Path(args.output) if args.output else default_output_path(source_path, config)
+
+    def progress(message, processed=None, total=None):
+        # Per-file updates are only shown when asked to
+        if processed is None or args.verbose:
+            print(message, file=sys.stderr)
+
+    try:
+        result = FileCollector(config, progress=None if args.quiet else progress).collect(source_path, output_path)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        # The collector records a checkpoint on the way out (except for ranked and split runs, which cannot resume)
+        if config.ranks_files or config.splits_output:
+            print("Interrupted.", file=sys.stderr)
+        else:
+            print("Interrupted. Run again with --resume and the same options to continue.", file=sys.stderr)
+        return 130
+
+    if result.total_files == 0 and result.omitted_files:
+        print("No file fit into the budget; nothing but the header was written.", file=sys.stderr)
+        return 1
+    if result.total_files == 0:
+        print("No files matching the criteria were found in the source folder or all were excluded.", file=sys.stderr)
+        return 1
+    if not args.quiet:
+        _print_report(result, output_path, verbose=args.verbose)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""Batch mode: many source/output pairs from one manifest, sharing one reader pool.
+
+A manifest is a JSON file::
+
+    {
+      "defaults": {"exclude": "png,jpg,lock", "max_tokens": 200000},
+      "jobs": [
+        {"source": "services/billing", "output": "ctx/billing.txt", "include": "py"},
+        {"source": "services/web", "output": "ctx/web.jsonl", "output_format": "jsonl"}
+      ]
+    }
+
+Each job accepts ``source`` (required), ``output``, ``name``, ``include`` and
+``exclude`` (comma separated like the command line, or lists), ``profile``
+(a saved profile the job's other settings are applied on top of) and any
+:class:`CollectorConfig` field. ``defaults`` apply to every job. Relative
+paths are resolved against the manifest's folder.
+"""
+import json
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+from typing import List, Optional
+
+from .collector import (
+    COMMON_INCLUDE_TYPES,
+    DEFAULT_WORKERS,
+    CollectionResult,
+    CollectorConfig,
+    FileCollector,
+    ProgressCallback,
+    parse_filter_entries,
+    parse_include_extensions,
+)
+from .profiles import is_profile_file, load_profile
+
+# Jobs writing at the same time; readers are shared, so this mostly bounds open outputs
+DEFAULT_PARALLEL_JOBS = 4
+
+_CONFIG_FIELDS = {f.name for f in fields(CollectorConfig)}
+# Set for the whole batch, not per job
+_BATCH_FIELDS = {"workers", "use_processes"}
+_PATH_FIELDS = {"cache_path", "stats_path", "profile_path", "tree_index_path"}
+
+
+@dataclass
+class BatchJob:
+    name: str
+    source: Path
+    output: Path
+    config: CollectorConfig
+
+
+@dataclass
+class BatchJobResult:
+    job: BatchJob
+    result: Optional[CollectionResult] = None
+    error: Optional[str] = None # Set instead of result when the job failed
+
+
+def _entries(value) -> str:
+    return ",".join(value) if isinstance(value, (list, tuple)) else str(value)
+
+
+def job_from_entry(entry: dict, base_dir: Path, defaults: Optional[dict] = None) -> BatchJob:
+    """Build a :class:`BatchJob` from one manifest entry (raises ValueError on bad entries)."""
+    settings = dict(defaults or {})
+    settings.update(entry)
+    if "source" not in settings:
+        raise ValueError(f"Batch job without 'source': {entry}")
+    source = base_dir / settings.pop("source")
+    name = str(settings.pop("name", source.name))
+    output = settings.pop("output", None)
+    profile = settings.pop("profile", None)
+    if profile and is_profile_file(profile):
+        profile = str(base_dir / profile)
+
+    options = {}
+    include = settings.pop("include", None)
+    if include:
+        include_extensions = parse_include_extensions(_entries(include))
+        for ext in list(include_extensions):
+            include_extensions.update(COMMON_INCLUDE_TYPES.get(ext, ()))
+        options.update(use_all_files=False, include_extensions=include_extensions)
+    if "exclude" in settings:
+        options["exclude_entries"] = parse_filter_entries(_entries(settings.pop("exclude")))
+    for key, value in settings.items():
+        if key in _BATCH_FIELDS:
+            raise ValueError(f"Batch job '{name}': '{key}' is set for the whole batch, not per job")
+        if key not in _CONFIG_FIELDS:
+            raise ValueError(f"Batch job '{name}': unknown setting '{key}'")
+        options[key] = base_dir / value if key in _PATH_FIELDS and value else value
+    try:
+        config = replace(load_profile(profile), **options) if profile else CollectorConfig(**options)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Batch job '{name}': {e}") from None
+    if not output:
+        output = f"{source.name}_collected.{'jsonl' if config.output_format == 'jsonl' else 'txt'}"
+    return BatchJob(name, source, base_dir / output, config)
+
+
+def load_manifest(path) -> List[BatchJob]:
+    """Read a batch manifest (see the module docstring). A bare list of jobs is accepted too."""
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if isinstance(manifest, list):
+        manifest = {"jobs": manifest}
+    base_dir = path.resolve().parent
+    jobs = [job_from_entry(entry, base_dir, manifest.get("defaults")) for entry in manifest.get("jobs", [])]
+    outputs = {}
+    for job in jobs:
+        other = outputs.setdefault(job.output.resolve(), job.name)
+        if other != job.name:
+            raise ValueError(f"Batch jobs '{other}' and '{job.name}' write to the same output {job.output}")
+    return jobs
+
+
+def run_batch(jobs: List[BatchJob], workers: int = DEFAULT_WORKERS, parallel_jobs: Optional[int] = None,
+              use_processes: bool = False, progress: Optional[ProgressCallback] = None,
+              cancel: Optional[threading.Event] = None) -> List[BatchJobResult]:
+    """Run ``jobs`` concurrently, all reading through one pool of ``workers`` readers.
+
+    Returns one :class:`BatchJobResult` per job, in manifest order. A failing
+    job is reported in its result and does not stop the others. Progress
+    messages are prefixed with the job's name.
+    """
+    parallel_jobs = max(1, min(parallel_jobs or DEFAULT_PARALLEL_JOBS, len(jobs) or 1))
+    cancel = cancel or threading.Event()
+    workers = max(1, workers)
+    if workers == 1:
+        readers = None # Each job reads serially in its own thread
+    elif use_processes:
+        readers = ProcessPoolExecutor(max_workers=workers)
+    else:
+        readers = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="aicontexter-reader")
+
+    def run(job: BatchJob) -> BatchJobResult:
+        def job_progress(message, processed=None, total=None):
+            progress(f"[{job.name}] {message}", processed, total)
+
+        job.config.workers = workers
+        collector = FileCollector(job.config, job_progress if progress else None, cancel, readers)
+        try:
+            return BatchJobResult(job, result=collector.collect(job.source, job.output))
+        except Exception as e:
+            return BatchJobResult(job, error=f"{type(e).__name__}: {e}")
+
+    try:
+        with ThreadPoolExecutor(max_workers=parallel_jobs, thread_name_prefix="aicontexter-job") as job_pool:
+            futures = [job_pool.submit(run, job) for job in jobs]
+            try:
+                return [future.result() for future in futures]
+            except KeyboardInterrupt:
+                # Running jobs stop at their next file and leave checkpoints; leaving the pool waits for them
+                cancel.set()
+                raise
+    finally:
+        if readers is not None:
+            readers.shutdown()
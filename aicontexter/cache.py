@@ -0,0 +1,125 @@
+"""Incremental collection cache.
+
+A small SQLite sidecar next to the output remembers every file's decoded text,
+keyed on (relative path, mtime_ns, size). On the next run unchanged files are
+served from the cache instead of being read and decoded again.
+"""
+import os
+import sqlite3
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .output import sidecar_path
+from .reading import ReadResult
+
+CACHE_SUFFIX = ".cache.sqlite"
+# Bump when the stored layout or the meaning of stored content changes
+SCHEMA_VERSION = 4
+# Stores are committed in batches; a crash only loses the current batch
+COMMIT_EVERY = 500
+
+
+def default_cache_path(output_path: Path) -> Path:
+    """Sidecar cache location for ``output_path`` (e.g. ``out.txt.cache.sqlite``)."""
+    return sidecar_path(output_path, CACHE_SUFFIX)
+
+
+def cache_files(cache_path: Path):
+    """The cache file plus the SQLite journal files that live next to it."""
+    return [Path(cache_path)] + [sidecar_path(cache_path, suffix) for suffix in ("-wal", "-shm", "-journal")]
+
+
+class CollectionCache:
+    """SQLite-backed cache of read results.
+
+    A connection is bound to the thread that created it, so lookups and stores
+    must happen on the collector's writer thread (see ``FileCollector.read_files``).
+    ``fingerprint`` describes the read settings; a cache written with different
+    settings is discarded instead of serving content produced under other rules.
+    """
+
+    def __init__(self, path: Path, fingerprint: str = ""):
+        self.path = Path(path)
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._pending = 0
+        self._seen = set()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS files")
+            self._conn.execute("DROP TABLE IF EXISTS meta")
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER,"
+            " encoding TEXT, content TEXT, error TEXT, binary INTEGER, decode_retries INTEGER, truncated INTEGER,"
+            " digest TEXT, compaction_saved INTEGER)"
+        )
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        if row is None or row[0] != fingerprint:
+            self._conn.execute("DELETE FROM files")
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)", (fingerprint,))
+        self._conn.commit()
+        # Only the keys are loaded up front; content is fetched per hit
+        self._known = {path: (mtime_ns, size) for path, mtime_ns, size
+                       in self._conn.execute("SELECT path, mtime_ns, size FROM files")}
+
+    def lookup(self, relative_path: str, file_path) -> Tuple[Optional[tuple], Optional[ReadResult]]:
+        """Return ``(key, cached_result)``.
+
+        ``key`` is what :meth:`store` needs after a miss; it is None when the
+        file cannot be stat'ed, in which case the read should not be cached.
+        """
+        self._seen.add(relative_path)
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            self.misses += 1
+            return None, None
+        key = (relative_path, st.st_mtime_ns, st.st_size)
+        if self._known.get(relative_path) == key[1:]:
+            row = self._conn.execute(
+                "SELECT encoding, content, error, binary, truncated, digest, compaction_saved FROM files WHERE path = ?",
+                (relative_path,)
+            ).fetchone()
+            if row is not None:
+                self.hits += 1
+                self.bytes_saved += st.st_size
+                encoding, content, error, binary, truncated, digest, compaction_saved = row
+                # decode_retries stays 0: nothing was decoded this run
+                return key, ReadResult(content=content, error=error, encoding=encoding, size=st.st_size,
+                                       binary=bool(binary), truncated=bool(truncated), cached=True, digest=digest,
+                                       compaction_saved=compaction_saved or 0)
+        self.misses += 1
+        return key, None
+
+    def store(self, key: tuple, read: ReadResult):
+        """Remember ``read`` for ``key``. OS errors are not cached so they are retried."""
+        if key is None or (read.content is None and not read.binary):
+            return
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files (path, mtime_ns, size, encoding, content, error, binary, decode_retries, truncated,"
+            " digest, compaction_saved) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (*key, read.encoding, read.content, read.error, int(read.binary), read.decode_retries, int(read.truncated),
+             read.digest, read.compaction_saved)
+        )
+        self._known[key[0]] = key[1:]
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self._conn.commit()
+            self._pending = 0
+
+    def close(self, prune: bool = True):
+        """Commit and close. With ``prune``, entries for files not seen this run are dropped."""
+        if prune:
+            stale = [(path,) for path in self._known if path not in self._seen]
+            self._conn.executemany("DELETE FROM files WHERE path = ?", stale)
+        self._conn.commit()
+        self._conn.close()
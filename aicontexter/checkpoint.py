@@ -0,0 +1,66 @@
+"""Checkpoints for resuming interrupted collections.
+
+While a collection runs, a small JSON sidecar next to the output records the
+last file completely written, the output size at that point and the running
+counters. Because the walker's order is deterministic, a resumed run truncates
+the output back to that size, skips every file up to the recorded one without
+reading it and appends the rest.
+"""
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+from .output import TMP_SUFFIX, atomic_write_text, sidecar_path
+
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+# Bump when the recorded fields change meaning
+CHECKPOINT_VERSION = 1
+# Seconds between checkpoint saves while writing; a crash loses at most this much work
+CHECKPOINT_INTERVAL = 2.0
+
+
+def default_checkpoint_path(output_path: Path) -> Path:
+    """Sidecar checkpoint location for ``output_path`` (e.g. ``out.txt.checkpoint.json``)."""
+    return sidecar_path(output_path, CHECKPOINT_SUFFIX)
+
+
+def checkpoint_files(checkpoint_path: Path):
+    """The checkpoint plus the temporary file used to replace it atomically."""
+    return [Path(checkpoint_path), sidecar_path(checkpoint_path, TMP_SUFFIX)]
+
+
+@dataclass
+class Checkpoint:
+    """State of a collection after its last completely written file."""
+    source: str # Resolved source folder
+    fingerprint: str # Settings that shape the output; a resume needs the same ones
+    last_file: str = "" # Relative path (OS separators) of the last file written
+    output_size: int = 0 # Bytes of output that belong to completed files
+    counters: Dict[str, int] = field(default_factory=dict) # CollectionResult counters and budget usage
+    digests: Dict[str, str] = field(default_factory=dict) # Deduplication index (digest -> relative path)
+    version: int = CHECKPOINT_VERSION
+
+    def save(self, path: Path):
+        """Write atomically, so a crash while saving leaves the previous checkpoint intact."""
+        atomic_write_text(path, json.dumps(asdict(self)))
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["Checkpoint"]:
+        """The checkpoint at ``path``, or None if there is none or it is unreadable."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            checkpoint = cls(**data)
+        except (OSError, ValueError, TypeError):
+            return None
+        return checkpoint if checkpoint.version == CHECKPOINT_VERSION else None
+
+
+def remove_checkpoint(path: Path):
+    for leftover in checkpoint_files(path):
+        try:
+            os.remove(leftover)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,1074 @@
+"""Headless collection engine.
+
+Everything needed to scan a source folder, filter files and write the combined
+output lives here. This module must never import tkinter so it can be used from
+scripts and the command line without a display.
+"""
+import cProfile
+import functools
+import hashlib
+import json
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Callable, List, Optional, Set, Tuple
+
+from .cache import CollectionCache, cache_files, default_cache_path
+from .checkpoint import CHECKPOINT_INTERVAL, Checkpoint, checkpoint_files, default_checkpoint_path, remove_checkpoint
+from .compaction import COMPACTION_MODES
+from .filters import FilterRules
+from .output import OUTPUT_FORMATS, check_compression, format_record, is_stdout, open_output
+from .ranking import RelevanceIndex, query_terms
+from .reading import (
+    BINARY_SNIFF_BYTES,
+    DEFAULT_EXCERPT_BYTES,
+    ENCODINGS_TO_TRY,
+    OVERSIZE_MODES,
+    ReadLimits,
+    content_digest,
+    format_bytes,
+    read_text_file,
+)
+from .splitting import PartWriter, manifest_path, part_pattern
+from .stats import PROFILE_ENV, CollectionStats, TimedFilter, timed_iter
+from .tokens import TokenSummary, get_tokenizer
+from .treeindex import TreeIndex, tree_index_files
+from .walker import OwnFiles, ScannedFile, WalkStats, walk_files, walk_order_key
+
+# Define directories to always skip during traversal
+DEFAULT_SKIP_DIRS = {'.git', '__pycache__', '.svn', '.hg', '.vscode', '.idea', 'node_modules'} # Added node_modules
+
+# Define file extensions/names to always exclude by default in the UI
+DEFAULT_EXCLUDE_ENTRIES = ( # Renamed for clarity (includes names and extensions)
+    # Binary/Archives/Media
+    "png,jpg,jpeg,gif,webp,ico,pdf,zip,rar,exe,dll,obj,o,so,a,lib,"
+    "bin,svg,woff,woff2,ttf,eot,otf,gz,tar,bz2,7z,"
+    "mp3,mp4,mov,avi,mkv,flv,wmv,"
+    "doc,docx,xls,xlsx,ppt,pptx,odt,ods,odp,"
+    "iso,img,dmg,"
+    "pyc,pyo,class,"
+    # Databases
+    "sqlite,sqlite3,db,db3,mdb,accdb,sqlitedb,"
+    # Metadata/OS specific - ensure names are lowercase
+    "ds_store,thumbs.db,"
+    # Common lock files
+    "lock, yarn.lock, package-lock.json" # Added common lock files
+)
+
+# Names known to cause issues, excluded regardless of the user's exclude list
+ALWAYS_EXCLUDED_ENTRIES = {"ds_store", "thumbs.db"}
+
+# Extensions selectable through the "common file types" checkboxes
+COMMON_INCLUDE_TYPES = {
+    "php": ("php",),
+    "py": ("py",),
+    "xml": ("xml",),
+    "js": ("js",),
+    "css": ("css",),
+    "yml": ("yml", "yaml"),
+    "vcl": ("vcl",),
+}
+
+SEPARATOR = "=" * 80
+
+# Header line telling the reader what compaction left out
+COMPACTION_NOTES = {
+    "strip": "Comments, docstrings and repeated blank lines were removed from the files.",
+    "signatures": ("Comments, docstrings and repeated blank lines were removed from the files, "
+                   "and Python function bodies replaced by '...'."),
+}
+
+# Same default as ThreadPoolExecutor; reading is dominated by open/read latency
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+# Files read ahead per worker; bounds memory between the read and write stages
+READ_AHEAD_PER_WORKER = 4
+# Discovered paths buffered between the scan and read stages
+SCAN_QUEUE_SIZE = 1024
+
+BUDGET_STRATEGIES = ("stop", "skip")
+
+# progress(message, processed, total): processed is None for phase messages,
+# total is None while the number of files is not known yet
+ProgressCallback = Callable[[str, Optional[int], Optional[int]], None]
+
+
+def parse_filter_entries(entry_string: str) -> Set[str]:
+    """Convert a comma-separated string of names/extensions into a lowercase set."""
+    if not entry_string:
+        return set()
+    parsed = set()
+    for item in entry_string.split(','):
+        cleaned_item = item.strip().lower()
+        if cleaned_item:
+            # Store entries exactly as cleaned (e.g., 'ds_store', 'py', 'license', '.env')
+            parsed.add(cleaned_item)
+    return parsed
+
+
+def parse_include_extensions(entry_string: str) -> Set[str]:
+    """Parse custom include entries, keeping only the ones that look like extensions."""
+    # Only add extensions from custom includes, not full names
+    return {inc.lstrip('.') for inc in parse_filter_entries(entry_string)
+            if os.path.sep not in inc and '.' not in inc} # Basic check for extension format
+
+
+def normalize_relative_path(path: str) -> str:
+    """A relative path in the '/' separated form the walker matches ``excluded_paths`` against."""
+    return str(path).strip().replace(os.sep, '/').strip('/')
+
+
+@dataclass
+class CollectorConfig:
+    """Settings for a collection run, independent of any UI."""
+    use_all_files: bool = True
+    include_extensions: Set[str] = field(default_factory=set)
+    exclude_entries: Set[str] = field(default_factory=lambda: parse_filter_entries(DEFAULT_EXCLUDE_ENTRIES))
+    skip_dirs: Set[str] = field(default_factory=lambda: set(DEFAULT_SKIP_DIRS))
+    prompt: str = ""
+    workers: int = DEFAULT_WORKERS # Parallel readers; 1 reads serially in the calling thread
+    use_processes: bool = False # Read/decode in worker processes instead of threads
+    count_first: bool = False # Count matching files before streaming so progress has a percentage
+    use_cache: bool = False # Reuse unchanged files from an incremental cache
+    cache_path: Optional[Path] = None # Defaults to a sidecar next to the output (see default_cache_path)
+    max_tokens: Optional[int] = None # Budget for the estimated tokens of the whole output
+    max_bytes: Optional[int] = None # Budget for the output size in bytes
+    budget_strategy: str = "stop" # "stop" at the first file over budget, or "skip" it and keep filling
+    token_summary: bool = False # Write a tokens-per-file/directory table into the header
+    tokenizer: str = "heuristic" # Name registered in tokens.TOKENIZERS
+    use_gitignore: bool = True # Honour .gitignore/.ignore files (and parent .gitignores inside a repository)
+    max_file_size: Optional[int] = None # Per-file size cap in bytes, checked from stat before opening
+    oversize_mode: str = "skip" # "skip" oversized files or "truncate" them to a head/tail excerpt
+    excerpt_bytes: int = DEFAULT_EXCERPT_BYTES # Head and tail size kept by "truncate"
+    dedupe: bool = False # Write files identical to an earlier one as a one-line reference
+    resume: bool = False # Continue an interrupted run from its checkpoint instead of starting over
+    output_format: str = "text" # "text" with ==== FILE ==== banners, or "jsonl" with one record per file
+    compression: Optional[str] = None # None, "gzip" or "zstd" (needs the zstandard package); streamed
+    stats_path: Optional[Path] = None # Write the run statistics (see stats.CollectionStats) here as JSON
+    profile_path: Optional[Path] = None # Dump cProfile data here (pstats format); also set by AICONTEXTER_PROFILE
+    rank_files: bool = False # Write files most relevant to the prompt first (BM25, see ranking)
+    top_k: Optional[int] = None # Keep only the K most relevant files; implies rank_files
+    tree_index_path: Optional[Path] = None # Load/save the directory listings here so later runs only re-list changed folders
+    excluded_paths: Set[str] = field(default_factory=set) # Relative folders/files ('/' separated) to leave out, e.g. unticked in the preview
+    compaction: Optional[str] = None # None, "strip" (comments, docstrings, blank runs) or "signatures" (Python bodies too)
+    split_tokens: Optional[int] = None # Split the output into numbered parts of at most this many estimated tokens
+    split_bytes: Optional[int] = None # ... or of at most this many bytes (before compression)
+
+    def __post_init__(self):
+        # Normalise so callers can pass any iterable of mixed-case entries
+        self.include_extensions = {ext.strip().lower().lstrip('.') for ext in self.include_extensions if ext.strip()}
+        self.exclude_entries = {entry.strip().lower() for entry in self.exclude_entries if entry.strip()}
+        self.exclude_entries.update(ALWAYS_EXCLUDED_ENTRIES)
+        self.skip_dirs = {d.lower() for d in self.skip_dirs}
+        self.excluded_paths = {normalize_relative_path(p) for p in self.excluded_paths if normalize_relative_path(p)}
+        if self.oversize_mode not in OVERSIZE_MODES:
+            raise ValueError(f"oversize_mode must be one of {', '.join(OVERSIZE_MODES)}, not '{self.oversize_mode}'")
+        if self.budget_strategy not in BUDGET_STRATEGIES:
+            raise ValueError(f"budget_strategy must be one of {', '.join(BUDGET_STRATEGIES)}, not '{self.budget_strategy}'")
+        if self.output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"output_format must be one of {', '.join(OUTPUT_FORMATS)}, not '{self.output_format}'")
+        if self.token_summary and self.output_format != "text":
+            raise ValueError("The token summary is only available for the text output format")
+        check_compression(self.compression)
+        if self.top_k is not None and self.top_k < 1:
+            raise ValueError(f"top_k must be at least 1, not {self.top_k}")
+        if self.compaction is not None and self.compaction not in COMPACTION_MODES:
+            raise ValueError(f"compaction must be one of {', '.join(COMPACTION_MODES)}, not '{self.compaction}'")
+        for name in ("split_tokens", "split_bytes"):
+            if getattr(self, name) is not None and getattr(self, name) < 1:
+                raise ValueError(f"{name} must be at least 1, not {getattr(self, name)}")
+        if self.split_tokens and self.split_bytes:
+            raise ValueError("Split the output by tokens or by bytes, not both")
+        if self.splits_output and self.token_summary:
+            raise ValueError("The token summary cannot be combined with splitting the output")
+
+    @property
+    def resumable(self) -> bool:
+        """Whether the output can be cut back and appended to, which checkpoints rely on."""
+        # The token summary spools the body until the end; compressed streams cannot be truncated.
+        # Ranked runs are not written in walk order, which resuming relies on; split runs write many files.
+        return (not self.token_summary and self.compression is None and not self.ranks_files
+                and not self.splits_output)
+
+    @property
+    def splits_output(self) -> bool:
+        return bool(self.split_tokens or self.split_bytes)
+
+    @property
+    def ranks_files(self) -> bool:
+        return self.rank_files or self.top_k is not None
+
+    @property
+    def has_budget(self) -> bool:
+        return bool(self.max_tokens or self.max_bytes)
+
+    def read_limits(self) -> Optional[ReadLimits]:
+        if self.max_file_size is None:
+            return None
+        return ReadLimits(self.max_file_size, self.oversize_mode, self.excerpt_bytes)
+
+    def compile_filters(self) -> FilterRules:
+        """Freeze the include/exclude settings into a matcher for one run."""
+        return FilterRules(self.use_all_files, self.include_extensions, self.exclude_entries)
+
+
+@dataclass
+class CollectionResult:
+    """Summary of a finished collection run."""
+    source_path: Path
+    output_path: Path
+    total_files: int = 0
+    processed_files: int = 0
+    scanned_dirs: int = 0
+    skipped_dirs: int = 0
+    ignored_paths: int = 0
+    skipped_large_files: int = 0 # Over the size limit, not read
+    truncated_files: int = 0 # Over the size limit, head/tail excerpt written
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_bytes_saved: int = 0
+    estimated_tokens: int = 0 # Whole output, header included; only counted when a budget, token summary or token split is enabled
+    file_tokens: int = 0 # Of those, the files alone (the token summary's total)
+    omitted_files: int = 0 # Files left out because they did not fit the budget
+    budget_exhausted: bool = False # Collection stopped early at the budget
+    duplicate_files: int = 0 # Written as a reference to an identical earlier file
+    duplicate_bytes_saved: int = 0
+    cancelled: bool = False # Stopped by the cancellation token; a checkpoint was left for resuming
+    resumed_files: int = 0 # Files kept from the interrupted run this one resumed
+    ranked_files: int = 0 # Files scored by the relevance ranking
+    ranked_kept: int = 0 # Of those, the files kept by the top-K cut
+    ranking_terms: int = 0 # Prompt terms the files were scored against; without any, walk order is kept
+    index_listed_dirs: int = 0 # Folders listed from disk while a tree index was in use
+    index_reused_dirs: int = 0 # Folders served unchanged from the tree index
+    compacted_files: int = 0 # Files written shorter by compaction
+    compaction_bytes_saved: int = 0
+    output_parts: int = 0 # Parts written when the output was split
+    parts_manifest: Optional[Path] = None # Index listing the files of every part
+    stats: CollectionStats = field(default_factory=CollectionStats)
+
+    def token_summary_line(self) -> str:
+        """One-line token estimate, empty when tokens were not counted."""
+        if not self.estimated_tokens:
+            return ""
+        return (f"Estimated tokens: {self.estimated_tokens:,} including the header "
+                f"({self.file_tokens:,} in the files)")
+
+    def size_limit_summary(self) -> str:
+        """One-line report of files hit by the per-file size limit, empty when none were."""
+        parts = []
+        if self.skipped_large_files:
+            parts.append(f"{self.skipped_large_files} skipped")
+        if self.truncated_files:
+            parts.append(f"{self.truncated_files} truncated")
+        return f"Files over the size limit: {', '.join(parts)}" if parts else ""
+
+    def budget_summary(self) -> str:
+        """One-line budget report, empty when nothing was left out."""
+        if not self.omitted_files:
+            return ""
+        if self.budget_exhausted:
+            return "Budget reached: collection stopped early, remaining files were not collected"
+        return f"Budget reached: {self.omitted_files} files did not fit and were left out"
+
+    def dedupe_summary(self) -> str:
+        """One-line deduplication report, empty when no duplicates were found."""
+        if not self.duplicate_files:
+            return ""
+        return (f"Duplicates: {self.duplicate_files} files identical to an earlier one, "
+                f"{format_bytes(self.duplicate_bytes_saved)} not repeated")
+
+    def compaction_summary(self) -> str:
+        """One-line compaction report, empty when nothing was compacted."""
+        if not self.compacted_files:
+            return ""
+        return (f"Compaction: {self.compacted_files} files compacted, "
+                f"{format_bytes(self.compaction_bytes_saved)} removed")
+
+    def split_summary(self) -> str:
+        """One-line report of the parts a split output was written to, empty otherwise."""
+        if not self.output_parts:
+            return ""
+        return f"Split into {self.output_parts} parts, listed in {self.parts_manifest}"
+
+    def resume_summary(self) -> str:
+        """One-line report for cancelled or resumed runs, empty otherwise."""
+        if self.cancelled and self.ranked_files:
+            return f"Cancelled after {self.processed_files} files; ranked runs cannot be resumed"
+        if self.cancelled and self.output_parts:
+            return f"Cancelled after {self.processed_files} files; split runs cannot be resumed"
+        if self.cancelled:
+            return f"Cancelled after {self.processed_files} files; the partial output can be resumed"
+        if self.resumed_files:
+            return f"Resumed: {self.resumed_files} files kept from the interrupted run"
+        return ""
+
+    def ranking_summary(self) -> str:
+        """One-line relevance ranking report, empty when files were not ranked."""
+        if not self.ranked_files:
+            return ""
+        if not self.ranking_terms:
+            return f"Ranking: the prompt has no terms to rank by, {self.ranked_kept} files kept in walk order"
+        if self.ranked_kept < self.ranked_files:
+            return f"Ranking: the {self.ranked_kept} files most relevant to the prompt, out of {self.ranked_files}"
+        return f"Ranking: {self.ranked_files} files ordered by relevance to the prompt"
+
+    def tree_index_summary(self) -> str:
+        """One-line tree index report, empty when no index was used."""
+        if not (self.index_listed_dirs or self.index_reused_dirs):
+            return ""
+        return (f"Tree index: {self.index_reused_dirs} folders unchanged, "
+                f"{self.index_listed_dirs} listed from disk")
+
+    def cache_summary(self) -> str:
+        """One-line cache report, empty when no cache was used."""
+        if not (self.cache_hits or self.cache_misses):
+            return ""
+        return (f"Cache: {self.cache_hits} hits, {self.cache_misses} misses, "
+                f"{format_bytes(self.cache_bytes_saved)} not re-read")
+
+
+def should_process_file(file_path: Path, config: CollectorConfig) -> bool:
+    """Check if a given file should be included based on exclusion/inclusion rules."""
+    return config.compile_filters().matches(Path(file_path).name)
+
+
+def _iter_in_background(iterable, maxsize):
+    """Run ``iterable`` in a producer thread, handing items over through a bounded queue.
+
+    Exceptions raised by the producer are re-raised in the consumer. If the
+    consumer stops early the producer is told to stop at its next item.
+    """
+    items = queue.Queue(maxsize)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except BaseException as e: # Forward everything, the consumer decides
+            put((done, e))
+            return
+        put((done, None))
+
+    producer = threading.Thread(target=produce, name="aicontexter-scanner", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item, error = items.get()
+            if item is done:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+# CollectionResult counters carried over when a run is resumed
+CHECKPOINT_COUNTERS = ("processed_files", "skipped_large_files", "truncated_files", "omitted_files",
+                       "duplicate_files", "duplicate_bytes_saved", "compacted_files", "compaction_bytes_saved",
+                       "file_tokens")
+
+
+class FileCollector:
+    """Scan a source folder and write every matching file into one combined output file.
+
+    The run is a streaming pipeline: a scanner thread discovers files, a pool
+    of readers decodes them and the calling thread writes them out, with
+    bounded buffers between the stages. Nothing is held for the whole tree.
+
+    ``cancel`` is an optional ``threading.Event`` checked by the scan and write
+    loops; setting it ends the run early with ``result.cancelled`` set.
+    ``executor`` is an optional reader pool shared with other collectors (see
+    ``batch``); it is used instead of a private pool and is not shut down.
+    ``tree_index`` is an optional :class:`TreeIndex` of the source folder kept
+    between runs; otherwise one is loaded from ``config.tree_index_path`` if set.
+    """
+
+    def __init__(self, config: Optional[CollectorConfig] = None, progress: Optional[ProgressCallback] = None,
+                 cancel: Optional[threading.Event] = None, executor=None, tree_index: Optional[TreeIndex] = None):
+        self.config = config or CollectorConfig()
+        self._progress = progress
+        self._cancel = cancel
+        self._executor = executor
+        self.tree_index = tree_index
+
+    def _cancelled(self) -> bool:
+        return self._cancel is not None and self._cancel.is_set()
+
+    def _report(self, message: str, processed: Optional[int] = None, total: Optional[int] = None):
+        if self._progress is not None:
+            self._progress(message, processed, total)
+
+    def _own_files(self, output_path: Path) -> OwnFiles:
+        """Files written by this run (output, cache), which must never be collected."""
+        own_files = []
+        if not is_stdout(output_path):
+            own_files.append(output_path)
+            own_files.extend(checkpoint_files(default_checkpoint_path(output_path)))
+        own_patterns = []
+        if self.config.splits_output and not is_stdout(output_path):
+            # Parts are created while the walk is still running
+            own_files.append(manifest_path(output_path))
+            own_patterns.append(part_pattern(output_path))
+        own_files.extend(path for path in (self.config.stats_path, self._profile_path()) if path)
+        if self.config.tree_index_path:
+            own_files.extend(tree_index_files(self.config.tree_index_path))
+        if self.config.use_cache:
+            own_files.extend(cache_files(self._cache_path(output_path)))
+        return OwnFiles(own_files, own_patterns)
+
+    def _cache_path(self, output_path: Path) -> Path:
+        if self.config.cache_path:
+            return Path(self.config.cache_path)
+        if is_stdout(output_path):
+            raise ValueError("The cache needs an explicit cache file when writing to stdout")
+        return default_cache_path(output_path)
+
+    def iter_files(self, source_path: Path, output_path: Path, result: CollectionResult,
+                   timings: Optional[CollectionStats] = None):
+        """Walk ``source_path`` and yield a :class:`ScannedFile` for every file to process, in sorted order.
+
+        With ``timings``, the time spent walking is added to its scan field, item
+        by item so that whatever the consumer does between items is left out.
+        The filter checks are only timed on their own when statistics or a
+        profile were asked for, so plain runs do not pay for a timer per check.
+        """
+        stats = WalkStats()
+        index = self.tree_index
+        listed_dirs, reused_dirs = (index.listed_dirs, index.reused_dirs) if index is not None else (0, 0)
+        rules = self.config.compile_filters()
+        if timings is not None and self._detailed_timings():
+            rules = TimedFilter(rules, timings)
+        files = walk_files(source_path, rules, self.config.skip_dirs,
+                           self._own_files(output_path), stats, self.config.use_gitignore, self._cancel, index,
+                           self.config.excluded_paths)
+        try:
+            yield from timed_iter(files, timings, "scan_seconds") if timings is not None else files
+        finally:
+            files.close()
+            result.scanned_dirs += stats.scanned_dirs
+            result.skipped_dirs += stats.skipped_dirs
+            result.ignored_paths += stats.ignored_paths
+            if index is not None:
+                result.index_listed_dirs += index.listed_dirs - listed_dirs
+                result.index_reused_dirs += index.reused_dirs - reused_dirs
+
+    def count_files(self, source_path: Path, output_path: Path, result: CollectionResult) -> int:
+        """Count-only pre-pass: walk and filter without reading anything."""
+        return sum(1 for _ in self.iter_files(source_path, output_path, result))
+
+    def read_files(self, files, cache: Optional[CollectionCache] = None):
+        """Yield ``(ScannedFile, ReadResult)`` for each file, in input order.
+
+        ``files`` may be any iterable, including a generator that is still
+        scanning. Up to ``config.workers * READ_AHEAD_PER_WORKER`` files are read
+        concurrently; results are handed back in the order they were given so
+        the output is identical to a serial run. With a ``cache``, unchanged
+        files are served from it and fresh reads are stored back; the cache is
+        only touched from this (the consuming) thread.
+        """
+        workers = max(1, self.config.workers)
+        if self._executor is not None:
+            executor = self._executor
+            max_in_flight = workers * READ_AHEAD_PER_WORKER
+        elif workers == 1:
+            executor = None
+            max_in_flight = 1
+        elif self.config.use_processes:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            max_in_flight = workers * READ_AHEAD_PER_WORKER
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="aicontexter-reader")
+            max_in_flight = workers * READ_AHEAD_PER_WORKER
+
+        limits = self.config.read_limits()
+        # A partial of a module-level function stays picklable for the process pool
+        if limits or self.config.dedupe or self.config.compaction:
+            read_file = functools.partial(read_text_file, limits=limits, hash_content=self.config.dedupe,
+                                          compaction=self.config.compaction)
+        else:
+            read_file = read_text_file
+
+        def finish(entry):
+            scanned, key, pending = entry
+            read = pending.result() if isinstance(pending, Future) else pending
+            if cache is not None and not read.cached:
+                cache.store(key, read)
+            return scanned, read
+
+        window = deque()
+        try:
+            for scanned in files:
+                key = None
+                pending = None
+                if cache is not None:
+                    key, pending = cache.lookup(scanned.relative_path.replace(os.sep, '/'), scanned.path)
+                if pending is None:
+                    pending = executor.submit(read_file, scanned.path) if executor else read_file(scanned.path)
+                window.append((scanned, key, pending))
+                if len(window) >= max_in_flight:
+                    yield finish(window.popleft())
+            while window:
+                yield finish(window.popleft())
+        finally:
+            # Drop queued reads if the consumer stopped early
+            for _, _, pending in window:
+                if isinstance(pending, Future):
+                    pending.cancel()
+            if executor is not None and executor is not self._executor:
+                executor.shutdown()
+
+    def _cache_fingerprint(self) -> str:
+        """Settings that change what a read produces; a cache built under others is discarded."""
+        return f"{','.join(ENCODINGS_TO_TRY)}:{BINARY_SNIFF_BYTES}:{self.config.read_limits()}:{self.config.compaction}"
+
+    def _checkpoint_fingerprint(self) -> str:
+        """Settings that shape the output; a checkpoint written under others cannot be resumed."""
+        config = self.config
+        settings = (config.use_all_files, sorted(config.include_extensions), sorted(config.exclude_entries),
+                    sorted(config.skip_dirs), config.prompt, config.use_gitignore, config.read_limits(),
+                    config.dedupe, config.max_tokens, config.max_bytes, config.budget_strategy,
+                    config.token_summary, config.tokenizer, config.count_first, config.output_format,
+                    config.ranks_files, config.top_k, sorted(config.excluded_paths), config.compaction,
+                    config.split_tokens, config.split_bytes)
+        return hashlib.sha1(repr(settings).encode('utf-8')).hexdigest()
+
+    def find_checkpoint(self, source, output) -> Optional[Checkpoint]:
+        """The checkpoint an interrupted run left for ``output``, if it can be resumed with the current settings."""
+        output_path = Path(output)
+        if is_stdout(output_path) or not self.config.resumable:
+            return None
+        checkpoint = Checkpoint.load(default_checkpoint_path(output_path))
+        if checkpoint is None:
+            return None
+        if checkpoint.source != str(Path(source).resolve()) or checkpoint.fingerprint != self._checkpoint_fingerprint():
+            return None
+        try:
+            if output_path.stat().st_size < checkpoint.output_size:
+                return None # The partial output was cut or replaced since
+        except OSError:
+            return None
+        return checkpoint
+
+    def rank_files(self, source_path: Path, output_path: Path, result: CollectionResult,
+                   timings: Optional[CollectionStats] = None) -> Tuple[List[ScannedFile], int]:
+        """Relevance pass: read every matching file once and order them by BM25 score against the prompt.
+
+        Only term counts are kept while indexing, the content is read again
+        when the files are written. Files matching no prompt term keep walk
+        order after the others. Returns the files to write (the first
+        ``config.top_k`` with a limit) and the number of files ranked.
+        """
+        terms = query_terms(self.config.prompt)
+        result.ranking_terms = len(terms)
+        if not terms:
+            self._report("The task prompt has no terms to rank by, keeping walk order.")
+        index = RelevanceIndex(terms)
+        files = []
+        scanned = _iter_in_background(self.iter_files(source_path, output_path, result, timings), SCAN_QUEUE_SIZE)
+        # Without terms there is nothing to score, so nothing needs reading
+        reads = self.read_files(scanned) if terms else ((scanned_file, None) for scanned_file in scanned)
+        try:
+            for scanned_file, read in reads:
+                if self._cancelled():
+                    break
+                files.append(scanned_file)
+                if read is not None:
+                    index.add(scanned_file.relative_path, read.content)
+                self._report(f"Ranking ({len(files)}): {scanned_file.relative_path}", len(files), None)
+        finally:
+            reads.close()
+            scanned.close()
+        ranked = [files[doc] for doc in index.ranking()] if terms else files
+        return ranked[:self.config.top_k], len(files)
+
+    def _format_intro(self, source_path: Path, result: Optional[CollectionResult] = None) -> str:
+        """Source, task prompt and notes on how the files were chosen: the start of every header."""
+        prompt = self.config.prompt
+        header = f"Source Folder: {source_path.resolve()}\n"
+        if prompt:
+            header += f"Task Prompt:\n---\n{prompt}\n---\n\n"
+        else:
+            header += "Task Prompt: (Not provided)\n\n"
+        if result is not None and result.ranked_files and result.ranking_terms:
+            header += "Files are ordered by relevance to the task prompt"
+            if result.ranked_kept < result.ranked_files:
+                header += f" (the {result.ranked_kept} most relevant of {result.ranked_files})"
+            header += ".\n"
+        if self.config.compaction:
+            header += COMPACTION_NOTES[self.config.compaction] + "\n"
+        return header
+
+    def _format_header(self, source_path: Path, total_files: Optional[int], result: Optional[CollectionResult] = None) -> str:
+        header = self._format_intro(source_path, result)
+        if total_files is not None:
+            header += f"Collected {total_files} files matching criteria:\n"
+        else:
+            # Streaming without a known total: the count goes into the footer instead
+            header += "Collected files matching criteria (count at the end):\n"
+        return header
+
+    def _format_part_header(self, source_path: Path, result: CollectionResult, number: int, file_count: int,
+                            output_path: Path) -> str:
+        """Header of one part of a split output."""
+        return (self._format_intro(source_path, result)
+                + f"Part {number} of a split collection, with {file_count} files "
+                  f"(all parts are listed in {manifest_path(output_path).name}):\n"
+                + SEPARATOR + "\n\n")
+
+    def _format_block(self, scanned_file: ScannedFile, read, piece: Optional[Tuple[int, int]] = None) -> str:
+        """The ``==== FILE ====`` block for one file, separator included (or its JSONL record).
+
+        ``piece=(i, n)`` marks the i-th of n pieces a file too large for one part was cut into.
+        """
+        if self.config.output_format == "jsonl":
+            return format_record(scanned_file.relative_path, scanned_file.extension, read, piece=piece)
+        file_ext_display = scanned_file.extension or "no extension"
+        compacted = f" (compacted, {read.compaction_saved} bytes removed)" if read.compaction_saved else ""
+        if piece is not None:
+            compacted += f" (piece {piece[0]} of {piece[1]})"
+        body = read.content if read.content is not None else read.error + "\n"
+        return (f"==== FILE: {scanned_file.relative_path} [{file_ext_display}]{compacted} ====\n\n"
+                f"{body}\n\n{SEPARATOR}\n\n")
+
+    def _split_block(self, scanned_file: ScannedFile, read, room: int, measure) -> List[Tuple[str, int]]:
+        """``(block, cost)`` pieces of a file too large for one part, cut at line boundaries.
+
+        Only a single line larger than a part (minified code, data) is cut in
+        the middle. ``measure`` must be additive across lines, as both the
+        byte count and the token estimates are (near enough). Lines are
+        measured as written, so JSON escaping counts in JSONL records.
+        """
+        line_cost = measure
+        if self.config.output_format == "jsonl":
+            def line_cost(text):
+                return measure(json.dumps(text, ensure_ascii=False)[1:-1])
+        # The banner and separator, measured with the widest piece numbers
+        room -= measure(self._format_block(scanned_file, replace(read, content=""), (99999, 99999)))
+        room = max(1, room)
+        chunks = []
+        current, current_cost = [], 0
+        for line in read.content.splitlines(keepends=True):
+            cost = line_cost(line)
+            if current and current_cost + cost > room:
+                chunks.append("".join(current))
+                current, current_cost = [], 0
+            while cost > room:
+                cut = max(1, len(line) * room // cost)
+                while cut > 1 and line_cost(line[:cut]) > room:
+                    cut = max(1, min(cut - 1, cut * room // line_cost(line[:cut])))
+                chunks.append(line[:cut])
+                line = line[cut:]
+                cost = line_cost(line)
+            if line:
+                current.append(line)
+                current_cost += cost
+        if current:
+            chunks.append("".join(current))
+        pieces = []
+        for number, chunk in enumerate(chunks, 1):
+            # The compaction note goes with the first piece only
+            piece_read = replace(read, content=chunk, compaction_saved=read.compaction_saved if number == 1 else 0)
+            block = self._format_block(scanned_file, piece_read, (number, len(chunks)))
+            pieces.append((block, measure(block)))
+        return pieces
+
+    def _format_duplicate(self, scanned_file: ScannedFile, read, original_path: str) -> str:
+        """One-line stand-in for a file whose content was already written under ``original_path``."""
+        if self.config.output_format == "jsonl":
+            return format_record(scanned_file.relative_path, scanned_file.extension, read, original_path)
+        return f"==== FILE: {scanned_file.relative_path} (identical to {original_path}) ====\n\n{SEPARATOR}\n\n"
+
+    def _budget_note(self) -> Optional[str]:
+        limits = []
+        if self.config.max_tokens:
+            limits.append(f"{self.config.max_tokens:,} tokens")
+        if self.config.max_bytes:
+            limits.append(format_bytes(self.config.max_bytes))
+        return f"budget {' / '.join(limits)} ({self.config.budget_strategy})" if limits else None
+
+    def _detailed_timings(self) -> bool:
+        """Whether the run's statistics are saved or profiled, which justifies timing every filter check."""
+        return bool(self.config.stats_path or self._profile_path())
+
+    def _profile_path(self) -> Optional[str]:
+        return self.config.profile_path or os.environ.get(PROFILE_ENV) or None
+
+    def collect(self, source, output) -> CollectionResult:
+        """Collect files from ``source`` into ``output``.
+
+        Returns a :class:`CollectionResult`. When no file matches the filters
+        nothing is written and ``result.total_files`` is 0. ``result.stats``
+        holds the run statistics, also saved to ``config.stats_path`` if set.
+        With a profile path the run is profiled with cProfile; only this
+        thread is profiled, so use ``workers=1`` to include reading.
+        """
+        profile_path = self._profile_path()
+        profiler = cProfile.Profile() if profile_path else None
+        start = time.perf_counter()
+        index = self._open_tree_index(source)
+        try:
+            if profiler is not None:
+                result = profiler.runcall(self._collect, source, output)
+            else:
+                result = self._collect(source, output)
+        finally:
+            if profiler is not None:
+                profiler.dump_stats(profile_path)
+        if index is not None and self.config.tree_index_path and index.dirty:
+            index.save(self.config.tree_index_path)
+        result.stats.wall_seconds = time.perf_counter() - start
+        if self.config.stats_path:
+            result.stats.save(self.config.stats_path)
+        return result
+
+    def _open_tree_index(self, source) -> Optional[TreeIndex]:
+        if self.tree_index is not None:
+            if self.tree_index.root != str(Path(source).resolve()):
+                raise ValueError(f"The tree index is for {self.tree_index.root}, not {source}")
+        elif self.config.tree_index_path:
+            self.tree_index = TreeIndex.load(self.config.tree_index_path, source)
+        return self.tree_index
+
+    def _collect(self, source, output) -> CollectionResult:
+        source_path = Path(source)
+        output_path = Path(output)
+        if not source_path.is_dir():
+            raise NotADirectoryError(f"Source folder not found or is not a directory: {source_path}")
+        if self.config.splits_output and is_stdout(output_path):
+            raise ValueError("A split output needs an output file, not stdout")
+
+        result = CollectionResult(source_path=source_path, output_path=output_path)
+        if not is_stdout(output_path):
+            # Created before scanning so the walker can recognise the output's folder by inode
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+        total_files = None
+        ranked = None
+        if self.config.ranks_files:
+            self._report("Ranking files by relevance to the task prompt...")
+            rank_start = time.perf_counter()
+            ranked, result.ranked_files = self.rank_files(source_path, output_path, result, result.stats)
+            result.stats.rank_seconds = time.perf_counter() - rank_start
+            if self._cancelled():
+                result.cancelled = True
+                return result
+            # Ranking saw every file, so the total is known like with count_first
+            total_files = result.ranked_kept = len(ranked)
+            self._report(f"Ranked {result.ranked_files} files, writing {total_files}.")
+            if total_files == 0:
+                return result
+        elif self.config.count_first:
+            self._report("Counting files...")
+            count_result = CollectionResult(source_path=source_path, output_path=output_path)
+            count_start = time.perf_counter()
+            total_files = self.count_files(source_path, output_path, count_result)
+            result.stats.count_seconds = time.perf_counter() - count_start
+            if self._cancelled():
+                result.cancelled = True
+                return result
+            self._report(f"Found {total_files} files to process (scanned {count_result.scanned_dirs} dirs, "
+                         f"skipped {count_result.skipped_dirs} hidden/system dirs, "
+                         f"{count_result.ignored_paths} paths ignored by .gitignore).")
+            if total_files == 0:
+                result.scanned_dirs, result.skipped_dirs = count_result.scanned_dirs, count_result.skipped_dirs
+                result.ignored_paths = count_result.ignored_paths
+                return result
+        else:
+            self._report("Scanning and collecting files...")
+
+        config = self.config
+        tokenizer = get_tokenizer(config.tokenizer)
+        count_tokens = config.has_budget or config.token_summary or bool(config.split_tokens)
+        measure_bytes = bool(config.max_bytes or config.split_bytes)
+        # Every count the summary table or the footer can show is at most this
+        budget_limit = config.max_tokens or config.max_bytes
+        summary = TokenSummary(budget_limit) if config.token_summary else None
+        # The summary table goes into the header, so the body is spooled until the end
+        spool_body = summary is not None
+        # With a budget the number of files written is only known at the end
+        header_total = None if config.has_budget else total_files
+        used_tokens = used_bytes = 0
+        text_output = config.output_format == "text"
+        # Budget held back for text written after the files (the summary table, the footer), at its largest
+        reserved_tokens = reserved_bytes = 0
+        closing_text = None
+        if config.has_budget and text_output and not config.splits_output:
+            if summary is not None:
+                closing_text = "\n" + summary.skeleton(self._budget_note())
+            else:
+                closing_text = self._collection_footer(budget_limit)
+            reserved_tokens, reserved_bytes = tokenizer(closing_text), _utf8_size(closing_text)
+        # Content digest -> relative path of the first file written with that content
+        written_digests = {} if config.dedupe else None
+
+        checkpoint_path = default_checkpoint_path(output_path) if config.resumable and not is_stdout(output_path) else None
+        resume_from = self.find_checkpoint(source_path, output_path) if config.resume and checkpoint_path else None
+        if config.resume and resume_from is None:
+            self._report("No resumable checkpoint for these settings, starting over.")
+        if resume_from is None and checkpoint_path is not None:
+            remove_checkpoint(checkpoint_path)
+        fingerprint = self._checkpoint_fingerprint()
+        last_file = ""
+        last_checkpoint = time.monotonic()
+        writing = False
+
+        def save_checkpoint():
+            out_file.flush()
+            counters = {name: getattr(result, name) for name in CHECKPOINT_COUNTERS}
+            counters.update(used_tokens=used_tokens, used_bytes=used_bytes)
+            Checkpoint(str(source_path.resolve()), fingerprint, last_file, out_file.buffer.tell(),
+                       counters, written_digests or {}).save(checkpoint_path)
+
+        cache = CollectionCache(self._cache_path(output_path), self._cache_fingerprint()) if config.use_cache else None
+        stats = result.stats
+        if ranked is not None:
+            scanned = (scanned_file for scanned_file in ranked)
+        else:
+            scanned = _iter_in_background(self.iter_files(source_path, output_path, result, stats), SCAN_QUEUE_SIZE)
+        out_file = None
+        parts = None # PartWriter taking the blocks instead of out_file when the output is split
+        pending_files = scanned
+        if resume_from is not None:
+            # Drop whatever was written after the last checkpoint and continue behind it
+            os.truncate(output_path, resume_from.output_size)
+            out_file = open_output(output_path, append=True)
+            for name, value in resume_from.counters.items():
+                if name in CHECKPOINT_COUNTERS:
+                    setattr(result, name, value)
+            used_tokens = resume_from.counters.get("used_tokens", 0)
+            used_bytes = resume_from.counters.get("used_bytes", 0)
+            if written_digests is not None:
+                written_digests.update(resume_from.digests)
+            result.resumed_files = result.processed_files
+            last_file = resume_from.last_file
+            self._report(f"Resuming after {last_file} ({result.resumed_files} files already written)...")
+            # Files up to the checkpoint are skipped before they are read
+            resume_key = walk_order_key(last_file)
+            pending_files = (f for f in scanned if walk_order_key(f.relative_path) > resume_key)
+        reads = self.read_files(pending_files, cache)
+        completed = False
+        loop_start = time.perf_counter()
+        try:
+            for scanned_file, read in timed_iter(reads, stats, "wait_seconds"):
+                if self._cancelled():
+                    break
+                stats.add_read(scanned_file.relative_path, read)
+                if out_file is None and parts is None:
+                    # Opened on the first match so an empty run leaves no file behind
+                    # JSONL output is nothing but one record per file
+                    header = (self._format_header(source_path, header_total, result) + SEPARATOR + "\n\n"
+                              if text_output else "")
+                    if config.splits_output:
+                        parts = self._open_parts(source_path, output_path, result, tokenizer)
+                    elif spool_body:
+                        out_file = tempfile.TemporaryFile('w+', encoding='utf-8', errors='replace')
+                    else:
+                        out_file = open_output(output_path, config.compression)
+                        write_start = time.perf_counter()
+                        out_file.write(header)
+                        stats.write_seconds += time.perf_counter() - write_start
+                    if count_tokens:
+                        # The spooled header is written at the end, with the file count: never longer than this one
+                        used_tokens += tokenizer(header)
+                        used_bytes += len(header.encode('utf-8', 'replace'))
+
+                relative_path = scanned_file.relative_path
+                digest = None
+                if written_digests is not None and read.content:
+                    # Cache entries written without deduplication carry no digest yet
+                    digest = read.digest or content_digest(read.content)
+                original_path = written_digests.get(digest) if digest else None
+                if original_path is not None:
+                    block = self._format_duplicate(scanned_file, read, original_path)
+                else:
+                    block = self._format_block(scanned_file, read)
+                tokens = tokenizer(block) if count_tokens else 0
+                size = len(block.encode('utf-8', 'replace')) if measure_bytes else 0
+                if count_tokens:
+                    # The file's rows in the summary table take room in the budget too
+                    rows = summary.added_rows(relative_path, tokens) if closing_text and summary is not None else ""
+                    if not self._fits(used_tokens + reserved_tokens, used_bytes + reserved_bytes,
+                                      tokens + (tokenizer(rows) if rows else 0), size + _utf8_size(rows)):
+                        result.omitted_files += 1
+                        if summary is not None:
+                            row = summary.omitted_row(relative_path, tokens) if closing_text else ""
+                            listed = not row or self._fits(used_tokens + reserved_tokens,
+                                                           used_bytes + reserved_bytes, tokenizer(row), _utf8_size(row))
+                            if row and listed:
+                                reserved_tokens += tokenizer(row)
+                                reserved_bytes += _utf8_size(row)
+                            summary.omit(relative_path, tokens, listed)
+                        if config.budget_strategy == "stop":
+                            result.budget_exhausted = True
+                            break
+                        last_file = relative_path
+                        continue
+                    used_tokens += tokens
+                    result.file_tokens += tokens
+                    used_bytes += size
+                    if rows:
+                        reserved_tokens += tokenizer(rows)
+                        reserved_bytes += _utf8_size(rows)
+                    if summary is not None:
+                        summary.add(relative_path, tokens)
+
+                writing = True
+                write_start = time.perf_counter()
+                if parts is not None:
+                    cost = tokens if config.split_tokens else size
+                    if cost > parts.capacity and original_path is None and read.content:
+                        measure = tokenizer if config.split_tokens else _utf8_size
+                        for piece, piece_cost in self._split_block(scanned_file, read, parts.capacity, measure):
+                            parts.add(relative_path, piece, piece_cost)
+                    else:
+                        parts.add(relative_path, block, cost)
+                else:
+                    out_file.write(block)
+                stats.write_seconds += time.perf_counter() - write_start
+                writing = False
+                result.processed_files += 1
+                if original_path is not None:
+                    result.duplicate_files += 1
+                    result.duplicate_bytes_saved += len(read.content.encode('utf-8', 'replace'))
+                elif digest is not None:
+                    # Registered only once written, so a reference never points at a file left out by the budget
+                    written_digests[digest] = relative_path
+                if read.compaction_saved and original_path is None:
+                    result.compacted_files += 1
+                    result.compaction_bytes_saved += read.compaction_saved
+                if read.too_large:
+                    result.skipped_large_files += 1
+                elif read.truncated:
+                    result.truncated_files += 1
+                last_file = relative_path
+                self._report(f"Processing ({result.processed_files}{f'/{total_files}' if total_files else ''}): {relative_path}",
+                             result.processed_files, total_files)
+                if checkpoint_path is not None and time.monotonic() - last_checkpoint >= CHECKPOINT_INTERVAL:
+                    save_checkpoint()
+                    last_checkpoint = time.monotonic()
+
+            stats.format_seconds = max(0.0, time.perf_counter() - loop_start - stats.wait_seconds - stats.write_seconds)
+            # The walker also stops on cancellation, which ends the loop like a finished scan would
+            if self._cancelled() and not result.budget_exhausted:
+                result.cancelled = True
+                self._report(f"Cancelled after {result.processed_files} files.")
+            elif out_file is not None:
+                if spool_body:
+                    self._report("Writing token summary...")
+                    table = "\n" + summary.render(self._budget_note())
+                    with open_output(output_path, config.compression) as final_file:
+                        final_file.write(self._format_header(source_path, result.processed_files, result))
+                        final_file.write(table + SEPARATOR + "\n\n")
+                        out_file.seek(0)
+                        shutil.copyfileobj(out_file, final_file)
+                    used_tokens += tokenizer(table)
+                elif header_total is None and text_output:
+                    footer = self._collection_footer(result.processed_files)
+                    out_file.write(footer)
+                    if count_tokens:
+                        used_tokens += tokenizer(footer)
+            if parts is not None:
+                # Also after a cancellation: what was collected so far is still written and indexed
+                write_start = time.perf_counter()
+                footer = self._parts_footer(result.processed_files) if text_output and not result.cancelled else None
+                result.parts_manifest = parts.close(footer, not result.cancelled, source_path)
+                stats.write_seconds += time.perf_counter() - write_start
+                result.output_parts = len(parts.parts)
+                stats.bytes_written = parts.bytes_written
+            completed = not result.cancelled
+        finally:
+            reads.close()
+            scanned.close()
+            if parts is not None and result.parts_manifest is None:
+                parts.abort()
+            if out_file is not None:
+                if completed:
+                    if checkpoint_path is not None:
+                        remove_checkpoint(checkpoint_path)
+                elif checkpoint_path is not None and not writing:
+                    # Cancelled or failed between files: record exactly how far the output got.
+                    # A failure inside a write leaves the last periodic checkpoint in place.
+                    try:
+                        save_checkpoint()
+                    except OSError:
+                        pass
+                out_file.close()
+            if cache is not None:
+                # Keep stale entries after a failed or partial run, it may not have seen every file
+                cache.close(prune=completed and resume_from is None and config.top_k is None)
+                result.cache_hits, result.cache_misses = cache.hits, cache.misses
+                result.cache_bytes_saved = cache.bytes_saved
+
+        if out_file is not None and not is_stdout(output_path):
+            try:
+                stats.bytes_written = output_path.stat().st_size
+            except OSError:
+                pass
+        result.estimated_tokens = used_tokens
+        result.total_files = result.processed_files
+        return result
+
+    def _fits(self, used_tokens: int, used_bytes: int, tokens: int, size: int) -> bool:
+        """Whether ``tokens``/``size`` more still fit the budget after ``used_tokens``/``used_bytes``."""
+        config = self.config
+        return not ((config.max_tokens and used_tokens + tokens > config.max_tokens)
+                    or (config.max_bytes and used_bytes + size > config.max_bytes))
+
+    @staticmethod
+    def _collection_footer(processed_files: int) -> str:
+        return f"End of collection: {processed_files} files.\n"
+
+    def _parts_footer(self, processed_files: int):
+        """Footer of the last part, given the number of parts."""
+        return lambda part_count: f"End of collection: {processed_files} files in {part_count} parts.\n"
+
+    def _open_parts(self, source_path: Path, output_path: Path, result: CollectionResult, tokenizer) -> PartWriter:
+        """The :class:`PartWriter` of a split run, with room left in every part for its header and footer."""
+        config = self.config
+        measure = tokenizer if config.split_tokens else _utf8_size
+        reserved = 0
+        if config.output_format == "text":
+            # Measured with the widest numbers a part can show
+            reserved = (measure(self._format_part_header(source_path, result, 99999, 999999, output_path))
+                        + measure(self._parts_footer(999999999)(99999)))
+
+        def header_for(part):
+            if config.output_format != "text":
+                return ""
+            return self._format_part_header(source_path, result, part.number, len(part.files), output_path)
+
+        limit = config.split_tokens or config.split_bytes
+        if limit <= reserved:
+            raise ValueError(f"A part size of {limit} leaves no room for files next to the part header "
+                             f"({reserved} {'tokens' if config.split_tokens else 'bytes'})")
+        return PartWriter(output_path, limit - reserved, config.compression, header_for)
+
+
+def _utf8_size(text: str) -> int:
+    return len(text.encode('utf-8', 'replace'))
+
+
+def collect(source, output, config: Optional[CollectorConfig] = None,
+            progress: Optional[ProgressCallback] = None, cancel: Optional[threading.Event] = None) -> CollectionResult:
+    """Convenience wrapper: ``FileCollector(config, progress, cancel).collect(source, output)``."""
+    return FileCollector(config, progress, cancel).collect(source, output)
@@ -0,0 +1,283 @@
+"""Code-aware compaction: drop text that costs tokens but rarely helps the reader.
+
+Two modes:
+
+- ``strip``: Python files lose their comments and docstrings; other files lose
+  full-line comments in the syntax their extension implies (``#``, ``//``,
+  ``--``, ``/* */``, ``<!-- -->``).
+- ``signatures``: as ``strip``, and Python function bodies are replaced by
+  ``...`` (found with ``ast``, so only files that parse), leaving a stub-like
+  outline of classes, signatures and module code.
+
+Every file also loses trailing whitespace, and runs of blank lines are cut to
+one, inside multi-line strings too. Otherwise only whole comments, docstrings
+and bodies are removed.
+
+Python is scanned with one regular expression that matches string literals
+and comments, so a ``#`` inside a string is never taken for a comment. This is
+many times faster than ``tokenize`` (pure Python before 3.12) or ``ast``, and
+works on files that do not parse (Python 2, templates, truncated excerpts). A
+docstring is a string alone on its lines, first in the file or right after a
+``def``/``class`` header.
+"""
+import ast
+import re
+import sys
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+COMPACTION_MODES = ("strip", "signatures")
+
+PYTHON_EXTENSIONS = {"py", "pyw", "pyi"}
+
+_HASH = (("#",), None)
+_SLASH = (("//",), ("/*", "*/"))
+# Extension -> (prefixes of full-line comments, (block comment open, close) or None)
+COMMENT_SYNTAX: Dict[str, Tuple[Tuple[str, ...], Optional[Tuple[str, str]]]] = {
+    **{ext: _HASH for ext in ("sh", "bash", "zsh", "fish", "rb", "pl", "pm", "r", "yaml", "yml", "toml",
+                              "cfg", "conf", "mk", "cmake", "tf", "ps1", "nim", "jl", "ex", "exs", "coffee")},
+    **{ext: _SLASH for ext in ("c", "h", "cc", "cpp", "cxx", "hpp", "hh", "cs", "java", "kt", "kts", "scala",
+                               "go", "rs", "swift", "dart", "js", "jsx", "mjs", "cjs", "ts", "tsx", "groovy",
+                               "gradle", "scss", "less", "proto", "zig", "v")},
+    "php": (("//", "#"), ("/*", "*/")),
+    "css": ((), ("/*", "*/")),
+    "sql": (("--",), ("/*", "*/")),
+    "lua": (("--",), None),
+    "hs": (("--",), None),
+    "ini": ((";", "#"), None),
+    "tex": (("%",), None),
+    "erl": (("%",), None),
+    **{ext: ((), ("<!--", "-->")) for ext in ("html", "htm", "xml", "xhtml", "svg", "vue", "xaml")},
+}
+# Comments that change how a file is built or interpreted
+KEPT_COMMENTS = ("#!", "//go:", "// +build", "/// <reference", "#[")
+# Whitespace is part of the content: left as is
+VERBATIM_EXTENSIONS = {"diff", "patch"}
+# Trailing spaces are meaningful (Markdown line breaks)
+KEEP_TRAILING_SPACE = {"md", "markdown"}
+
+# A Python string literal or a comment (prefixes need no matching, they do not change where a string ends)
+_PY_STRING_OR_COMMENT = re.compile(r"""
+    (?:'''(?:\\.|[^\\])*?'''|\"\"\"(?:\\.|[^\\])*?\"\"\"|'(?:\\.|[^\\'\n])*'|"(?:\\.|[^\\"\n])*")
+  | \#[^\n]*
+""", re.VERBOSE | re.DOTALL)
+# What may precede a docstring on its line
+_DOCSTRING_LEAD = re.compile(r"[ \t]*[rRuU]?")
+_HEADER_RE = re.compile(r"[ \t]*(?:async[ \t]+def|def|class)[ \t]")
+# A def/class header is looked for this many lines above the colon ending it
+MAX_HEADER_LINES = 30
+# Fields holding the statements nested in a statement (match_case is new in Python 3.10)
+_BODY_FIELDS = ("body", "orelse", "finalbody", "handlers", "cases")
+_BLOCKS = (ast.stmt, ast.ExceptHandler) + ((ast.match_case,) if hasattr(ast, "match_case") else ())
+
+
+def compact_text(content: str, extension: str, mode: str = "strip") -> str:
+    """``content`` of a file with extension ``extension`` (lowercase, no dot) compacted in ``mode``."""
+    if mode not in COMPACTION_MODES:
+        raise ValueError(f"Compaction must be one of {', '.join(COMPACTION_MODES)}, not '{mode}'")
+    if extension in VERBATIM_EXTENSIONS:
+        return content
+    if extension in PYTHON_EXTENSIONS:
+        outline = python_signatures(content) if mode == "signatures" else None
+        compacted = strip_python(outline if outline is not None else content)
+    elif extension in COMMENT_SYNTAX:
+        compacted = strip_comment_lines(content, *COMMENT_SYNTAX[extension])
+    else:
+        compacted = content
+    return squeeze_blank_lines(compacted, strip_trailing=extension not in KEEP_TRAILING_SPACE,
+                               final_newline=content.endswith('\n'))
+
+
+def _indent(line: str) -> str:
+    return line[:len(line) - len(line.lstrip())]
+
+
+def _line_end(source: str, position: int) -> int:
+    end = source.find('\n', position)
+    return len(source) if end == -1 else end
+
+
+def _header_indent(source: str, colon: int) -> Optional[str]:
+    """Indentation of the ``def``/``class`` header ending at the colon at offset ``colon``, None for other statements."""
+    line_start = source.rfind('\n', 0, colon) + 1
+    for _ in range(MAX_HEADER_LINES):
+        header = _HEADER_RE.match(source, line_start)
+        if header is not None:
+            # Only a header if no statement ends between it and the colon
+            code = _PY_STRING_OR_COMMENT.sub('""', source[line_start:colon])
+            depth = 0
+            for i, char in enumerate(code):
+                if char in '([{':
+                    depth += 1
+                elif char in ')]}':
+                    depth -= 1
+                elif depth == 0 and (char == ':' or (char == '\n' and code[i - 1] != '\\')):
+                    return None
+            return _indent(source[line_start:header.end()]) if depth == 0 else None
+        if line_start == 0:
+            return None
+        line_start = source.rfind('\n', 0, line_start - 1) + 1
+    return None
+
+
+def _next_code_indent(lines: List[str], row: int) -> Optional[int]:
+    """Indentation width of the first line after ``row`` (1-based) holding code, None at the end."""
+    for line in lines[row:]:
+        stripped = line.lstrip()
+        if stripped and not stripped.startswith('#'):
+            return len(line) - len(stripped)
+    return None
+
+
+def strip_python(source: str) -> str:
+    """``source`` without comments and docstrings."""
+    lines = source.split('\n')
+    dropped: Set[int] = set() # 1-based line numbers
+    replaced: Dict[int, str] = {}
+    row = 1 # Line of offset `counted`
+    counted = 0
+    code_start = 0 # Where the code after the previous match begins
+    last_code = None # Offset of the last character of code so far (comments aside)
+
+    for match in _PY_STRING_OR_COMMENT.finditer(source):
+        start, end = match.span()
+        code = source[code_start:start]
+        if code.endswith(('r', 'R', 'u', 'U')):
+            code = code[:-1] # A string prefix, as in r"""doc"""
+        code = code.rstrip()
+        if code:
+            last_code = code_start + len(code) - 1
+        code_start = end
+        row += source.count('\n', counted, start)
+        counted = start
+        line_start = source.rfind('\n', 0, start) + 1
+
+        if source[start] == '#':
+            if row in dropped or row in replaced or (row == 1 and source.startswith("#!")):
+                continue
+            before = source[line_start:start].rstrip()
+            if before:
+                replaced[row] = before
+            else:
+                dropped.add(row)
+            continue
+
+        previous, last_code = last_code, end - 1
+        rest = source[end:_line_end(source, end)].strip(" \t;")
+        if _DOCSTRING_LEAD.fullmatch(source, line_start, start) is None or (rest and not rest.startswith('#')):
+            continue # Part of a larger statement
+        if previous is None:
+            header_indent = None # The module docstring
+        elif source[previous] == ':':
+            header_indent = _header_indent(source, previous)
+            if header_indent is None:
+                continue
+        else:
+            continue
+        end_row = row + source.count('\n', start, end)
+        dropped.update(range(row, end_row + 1))
+        if header_indent is not None:
+            next_indent = _next_code_indent(lines, end_row)
+            if next_indent is None or next_indent <= len(header_indent):
+                # The docstring was the whole body, which must not become empty
+                dropped.discard(row)
+                replaced[row] = _indent(lines[row - 1]) + "..."
+
+    return '\n'.join(replaced.get(number, line) for number, line in enumerate(lines, 1) if number not in dropped)
+
+
+def _column(line: str, byte_offset: int) -> int:
+    """Character index of an ``ast`` column, which counts UTF-8 bytes."""
+    return len(line.encode('utf-8')[:byte_offset].decode('utf-8', 'ignore'))
+
+
+def _statements(node) -> Iterator[ast.AST]:
+    """The statements (and except/case clauses) directly nested in ``node``."""
+    for name in _BODY_FIELDS:
+        for child in getattr(node, name, ()):
+            if isinstance(child, _BLOCKS):
+                yield child
+
+
+def python_signatures(source: str) -> Optional[str]:
+    """``source`` with every function body replaced by ``...``, or None if it is not valid Python.
+
+    Classes and module-level code are kept, so methods, class attributes,
+    imports and constants still show; nested functions go with their parent's body.
+    """
+    if sys.version_info < (3, 8):
+        return None # Nodes have no end positions before 3.8
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError, MemoryError, RecursionError):
+        return None
+    lines = source.split('\n')
+    edits: List[Tuple[int, int, str]] = [] # (first line, last line, replacement), 1-based and inclusive
+
+    def visit(node):
+        for child in _statements(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                body = child.body[0]
+                start = min([body.lineno] + [d.lineno for d in getattr(body, 'decorator_list', [])])
+                line = lines[body.lineno - 1]
+                if start == body.lineno and line[:_column(line, body.col_offset)].strip():
+                    # The body starts on the signature's line: def f(): return 1
+                    edits.append((body.lineno, child.end_lineno, line[:_column(line, body.col_offset)] + "..."))
+                else:
+                    edits.append((start, child.end_lineno, _indent(lines[start - 1]) + "..."))
+            else:
+                visit(child)
+
+    visit(tree)
+    # Bottom-up, so earlier line numbers stay valid; visit() does not find bodies in source order
+    # (a try's else/finally come before its handlers)
+    for first, last, replacement in sorted(edits, reverse=True):
+        lines[first - 1:last] = [replacement]
+    return '\n'.join(lines)
+
+
+def strip_comment_lines(content: str, prefixes: Tuple[str, ...], block: Optional[Tuple[str, str]]) -> str:
+    """Drop lines holding nothing but a comment (block comments included)."""
+    kept = []
+    in_block = False
+    for line in content.split('\n'):
+        stripped = line.strip()
+        if in_block:
+            end = stripped.find(block[1])
+            if end == -1:
+                continue
+            in_block = False
+            rest = stripped[end + len(block[1]):]
+            if rest.strip():
+                kept.append(_indent(line) + rest.lstrip())
+            continue
+        if block is not None and stripped.startswith(block[0]):
+            end = stripped.find(block[1], len(block[0]))
+            if end == -1:
+                in_block = True
+                continue
+            if not stripped[end + len(block[1]):].strip():
+                continue
+        elif prefixes and stripped.startswith(prefixes) and not stripped.startswith(KEPT_COMMENTS):
+            continue
+        kept.append(line)
+    return '\n'.join(kept)
+
+
+def squeeze_blank_lines(content: str, strip_trailing: bool = True, final_newline: bool = True) -> str:
+    """Cut runs of blank lines to one and drop blank lines at the start and end."""
+    kept = []
+    blank = True # Drops leading blank lines
+    for line in content.split('\n'):
+        if strip_trailing:
+            line = line.rstrip()
+        if not line.strip():
+            if not blank:
+                kept.append("")
+            blank = True
+            continue
+        blank = False
+        kept.append(line)
+    while kept and not kept[-1]:
+        kept.pop()
+    text = '\n'.join(kept)
+    return text + '\n' if final_newline and text else text
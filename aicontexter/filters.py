@@ -0,0 +1,42 @@
+"""Precompiled include/exclude matching on plain file names."""
+from typing import Iterable
+
+
+def file_extension(name: str) -> str:
+    """Lowercase extension without the dot, with the same rules as ``Path.suffix``.
+
+    ``'a.tar.gz'`` -> ``'gz'``; ``'.env'``, ``'a.'`` and ``'Makefile'`` -> ``''``.
+    """
+    dot = name.rfind('.')
+    if 0 < dot < len(name) - 1:
+        return name[dot + 1:].lower()
+    return ""
+
+
+class FilterRules:
+    """Include/exclude rules compiled once per run.
+
+    Matching works on bare names so the walker never has to build a ``Path``
+    per file; each check is a lowercase plus at most two set lookups.
+    """
+    __slots__ = ("use_all_files", "exclude_entries", "include_extensions")
+
+    def __init__(self, use_all_files: bool, include_extensions: Iterable[str], exclude_entries: Iterable[str]):
+        self.use_all_files = use_all_files
+        self.exclude_entries = frozenset(exclude_entries)
+        self.include_extensions = frozenset(include_extensions)
+
+    def matches(self, name: str) -> bool:
+        """Check if a file called ``name`` should be included."""
+        name_lower = name.lower()
+        # --- RULE 1: Check Exclusions (full name, then extension) ---
+        if name_lower in self.exclude_entries:
+            return False
+        extension = file_extension(name_lower)
+        if extension and extension in self.exclude_entries:
+            return False
+        # --- RULE 2: "Process All Text Files" Mode ---
+        if self.use_all_files:
+            return True
+        # --- RULE 3: Specific Include Filters Mode: extension required and listed ---
+        return bool(extension) and extension in self.include_extensions
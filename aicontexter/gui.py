@@ -0,0 +1,1078 @@
+import tkinter as tk
+from tkinter import filedialog, messagebox, simpledialog, ttk
+import queue
+import threading
+import traceback # For detailed error logging
+from dataclasses import replace
+from pathlib import Path
+from typing import Optional
+
+from .collector import (
+    ALWAYS_EXCLUDED_ENTRIES,
+    BUDGET_STRATEGIES,
+    COMMON_INCLUDE_TYPES,
+    DEFAULT_EXCLUDE_ENTRIES,
+    DEFAULT_SKIP_DIRS,
+    OVERSIZE_MODES,
+    OUTPUT_FORMATS,
+    CollectorConfig,
+    FileCollector,
+    parse_filter_entries,
+    parse_include_extensions,
+)
+from .compaction import COMPACTION_MODES
+from .output import COMPRESSIONS, check_compression
+from .preview import (
+    STATUS_INCLUDED,
+    STATUS_SKIPPED,
+    TreeRollup,
+    estimate_tokens_for_size,
+    is_excluded,
+    list_directory,
+    resolve_status,
+)
+from .profiles import default_profiles_dir, delete_profile, list_profiles, load_profile, save_profile
+from .reading import format_bytes
+from .stats import default_stats_path
+from .treeindex import TreeIndex
+from .walker import OwnFiles
+
+# Fonts are resolved in main() once a Tk root exists
+default_font_family = 'Segoe UI'
+default_font_size = 10
+default_font = (None, default_font_size)
+
+# The worker thread never touches widgets; its events are applied by the Tk loop at ~15 Hz
+PROGRESS_POLL_MS = 66
+
+
+class FileCollectorApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("File Collector")
+        self.root.geometry("800x650")
+        self.root.resizable(True, True)
+
+        self.source_folder = tk.StringVar()
+        self.output_file = tk.StringVar()
+        self.progress_var = tk.DoubleVar()
+        self.status_var = tk.StringVar(value="Ready")
+
+        self.use_all_files = tk.BooleanVar(value=True)
+
+        self.include_php = tk.BooleanVar(value=False)
+        self.include_py = tk.BooleanVar(value=True)
+        self.include_xml = tk.BooleanVar(value=False)
+        self.include_js = tk.BooleanVar(value=True)
+        self.include_css = tk.BooleanVar(value=True)
+        self.include_yml = tk.BooleanVar(value=False)
+        self.include_vcl = tk.BooleanVar(value=False)
+
+        self.use_gitignore = tk.BooleanVar(value=True)
+        self.use_cache = tk.BooleanVar(value=False)
+        self.max_tokens = tk.StringVar()
+        self.max_file_size_mb = tk.StringVar()
+        self.oversize_mode = tk.StringVar(value="skip")
+        self.budget_strategy = tk.StringVar(value="stop")
+        self.token_summary = tk.BooleanVar(value=False)
+        self.dedupe = tk.BooleanVar(value=False)
+        self.output_format = tk.StringVar(value="text")
+        self.compression = tk.StringVar(value="none")
+        self.compaction = tk.StringVar(value="none")
+        self.split_tokens = tk.StringVar()
+        self.save_stats = tk.BooleanVar(value=False)
+        self.remember_tree = tk.BooleanVar(value=True)
+        self.rank_files = tk.BooleanVar(value=False)
+        self.top_k = tk.StringVar()
+
+        self.custom_include = tk.StringVar()
+        self.custom_exclude = tk.StringVar(value=DEFAULT_EXCLUDE_ENTRIES)
+
+        self.profile_name = tk.StringVar()
+
+        self.config = CollectorConfig()
+        # Settings without a widget (workers, skip dirs, ...) come from here; a loaded profile replaces it
+        self._base_config = CollectorConfig()
+        self._ui_events = queue.SimpleQueue()
+        self._job_running = False
+        self._cancel_event = threading.Event()
+        self._tree_index = None # Listings of the last source folder, reused by the next generation
+        self._polling = False
+        # Preview tab state; unticked paths ('/' separated) are left out of the next generation
+        self.preview_summary_var = tk.StringVar(value="Press 'Load Preview' to see which files will be collected.")
+        self._preview_source = None
+        self._preview_config = None
+        self._preview_rollup = None
+        self._preview_running = False
+        self._preview_cancel = threading.Event()
+        self._preview_entries = {}
+        self._unticked = set()
+
+        self.create_widgets()
+        self.update_file_type_state() # Ensure UI state matches initial vars
+
+    def create_widgets(self):
+        self.notebook = ttk.Notebook(self.root)
+        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        self.main_tab = ttk.Frame(self.notebook, padding=20)
+        self.notebook.add(self.main_tab, text="Main")
+
+        self.preview_tab = ttk.Frame(self.notebook, padding=20)
+        self.notebook.add(self.preview_tab, text="Preview")
+
+        self.file_types_tab = ttk.Frame(self.notebook, padding=20)
+        self.notebook.add(self.file_types_tab, text="File Types")
+
+        # The Options tab holds more groups than fit into the default window height, so it scrolls
+        options_page = ttk.Frame(self.notebook)
+        self.notebook.add(options_page, text="Options")
+        self.options_tab = self._scrollable_frame(options_page, padding=20)
+
+        self.create_main_tab()
+        self.create_preview_tab()
+        self.create_file_types_tab()
+        self.create_options_tab()
+
+    def _scrollable_frame(self, parent, **frame_options) -> ttk.Frame:
+        """A frame filling ``parent`` that scrolls vertically when its content is taller than the window."""
+        canvas = tk.Canvas(parent, highlightthickness=0, borderwidth=0,
+                           background=ttk.Style().lookup("TFrame", "background"))
+        scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=canvas.yview)
+        canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        frame = ttk.Frame(canvas, **frame_options)
+        window = canvas.create_window((0, 0), window=frame, anchor=tk.NW)
+        frame.bind("<Configure>", lambda event: canvas.configure(scrollregion=canvas.bbox("all")))
+        # The frame follows the canvas width, so fill=X and wrapping labels behave as in the other tabs
+        canvas.bind("<Configure>", lambda event: canvas.itemconfigure(window, width=event.width))
+
+        def on_wheel(event):
+            # Windows/macOS report a delta, X11 sends buttons 4 (up) and 5 (down)
+            up = event.num == 4 or getattr(event, "delta", 0) > 0
+            canvas.yview_scroll(-1 if up else 1, "units")
+
+        def bind_wheel(event):
+            for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+                canvas.bind_all(sequence, on_wheel)
+
+        def unbind_wheel(event):
+            for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+                canvas.unbind_all(sequence)
+
+        # The wheel scrolls the page only while the pointer is over it
+        canvas.bind("<Enter>", bind_wheel)
+        canvas.bind("<Leave>", unbind_wheel)
+        return frame
+
+    def create_main_tab(self):
+        prompt_frame = ttk.LabelFrame(self.main_tab, text="Task Prompt", padding=10)
+        prompt_frame.pack(fill=tk.X, expand=False, pady=(0, 10))
+
+        prompt_scrollbar = ttk.Scrollbar(prompt_frame, orient=tk.VERTICAL)
+        self.prompt_text_area = tk.Text(
+            prompt_frame, height=5, width=70, wrap=tk.WORD,
+            yscrollcommand=prompt_scrollbar.set, undo=True,
+            font=default_font # Apply font
+        )
+        prompt_scrollbar.config(command=self.prompt_text_area.yview)
+        prompt_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.prompt_text_area.pack(fill=tk.BOTH, expand=True)
+
+        desc_label = ttk.Label(
+            prompt_frame,
+            text="Enter a description of your task here. This will be included at the beginning of the output file.",
+            wraplength=700, justify=tk.LEFT
+        )
+        desc_label.pack(anchor=tk.W, pady=(5, 0))
+
+        source_frame = ttk.Frame(self.main_tab)
+        source_frame.pack(fill=tk.X, pady=10)
+        ttk.Label(source_frame, text="Source Folder:").pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Entry(source_frame, textvariable=self.source_folder, width=60).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
+        ttk.Button(source_frame, text="Browse...", command=self.browse_source).pack(side=tk.LEFT)
+
+        output_frame = ttk.Frame(self.main_tab)
+        output_frame.pack(fill=tk.X, pady=10)
+        ttk.Label(output_frame, text="Output File:").pack(side=tk.LEFT, padx=(0, 16))
+        ttk.Entry(output_frame, textvariable=self.output_file, width=60).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
+        ttk.Button(output_frame, text="Browse...", command=self.browse_output).pack(side=tk.LEFT)
+
+        file_type_frame = ttk.LabelFrame(self.main_tab, text="File Types", padding=10)
+        file_type_frame.pack(fill=tk.X, expand=False, pady=10)
+
+        self.process_all_files_cb = ttk.Checkbutton(
+            file_type_frame,
+            text="Process all text files (ignore 'Include' filters, still apply 'Exclude' filters)",
+            variable=self.use_all_files,
+            command=self.update_file_type_state
+        )
+        self.process_all_files_cb.pack(anchor=tk.W)
+
+        ttk.Label(
+            file_type_frame,
+            text="Uncheck the box above to use specific 'Include' filters. 'Exclude' filters on the next tab always apply."
+        ).pack(anchor=tk.W, pady=(5, 0))
+
+        progress_status_frame = ttk.Frame(self.main_tab)
+        progress_status_frame.pack(fill=tk.X, pady=(15, 5))
+
+        ttk.Label(progress_status_frame, text="Progress:").pack(side=tk.LEFT)
+        self.progress_bar = ttk.Progressbar(progress_status_frame, variable=self.progress_var, length=400, mode="determinate")
+        self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+
+        status_frame = ttk.Frame(self.main_tab)
+        status_frame.pack(fill=tk.X, pady=(0, 10))
+        self.status_label = ttk.Label(status_frame, textvariable=self.status_var, foreground="blue", anchor=tk.W)
+        self.status_label.pack(fill=tk.X)
+
+        button_frame = ttk.Frame(self.main_tab)
+        button_frame.pack(pady=20)
+        self.generate_button = ttk.Button(button_frame, text="Generate Combined File", command=self.generate_file)
+        self.generate_button.pack(side=tk.LEFT, padx=5)
+        self.cancel_button = ttk.Button(button_frame, text="Cancel", command=self.cancel_generation, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+
+    def create_preview_tab(self):
+        toolbar = ttk.Frame(self.preview_tab)
+        toolbar.pack(fill=tk.X, pady=(0, 10))
+        ttk.Button(toolbar, text="Load Preview", command=self.load_preview).pack(side=tk.LEFT)
+        ttk.Button(toolbar, text="Tick / Untick Selected", command=self.toggle_preview_selection).pack(side=tk.LEFT, padx=5)
+        ttk.Button(toolbar, text="Tick All", command=self.tick_all_preview).pack(side=tk.LEFT)
+
+        tree_frame = ttk.Frame(self.preview_tab)
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+        tree_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL)
+        self.preview_tree = ttk.Treeview(
+            tree_frame, columns=("use", "status", "size", "tokens"),
+            selectmode="extended", yscrollcommand=tree_scrollbar.set
+        )
+        tree_scrollbar.config(command=self.preview_tree.yview)
+        self.preview_tree.heading("#0", text="Name", anchor=tk.W)
+        self.preview_tree.heading("use", text="Use")
+        self.preview_tree.heading("status", text="Status", anchor=tk.W)
+        self.preview_tree.heading("size", text="Size", anchor=tk.E)
+        self.preview_tree.heading("tokens", text="Tokens (est.)", anchor=tk.E)
+        self.preview_tree.column("#0", width=330)
+        self.preview_tree.column("use", width=40, anchor=tk.CENTER, stretch=False)
+        self.preview_tree.column("status", width=80, stretch=False)
+        self.preview_tree.column("size", width=150, anchor=tk.E, stretch=False)
+        self.preview_tree.column("tokens", width=100, anchor=tk.E, stretch=False)
+        tree_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.preview_tree.pack(fill=tk.BOTH, expand=True)
+        # Folders are listed when first opened
+        self.preview_tree.bind("<<TreeviewOpen>>", self._on_preview_open)
+        self.preview_tree.bind("<space>", self.toggle_preview_selection)
+
+        ttk.Label(self.preview_tab, textvariable=self.preview_summary_var, anchor=tk.W).pack(fill=tk.X, pady=(10, 0))
+        ttk.Label(
+            self.preview_tab,
+            text="Uses the filters of the 'File Types' and 'Options' tabs. Unticked files and folders (Space or the "
+                 "button above) are left out of the next generation. Folder totals are counted in the background; "
+                 "tokens are estimated at about 4 characters per token.",
+            wraplength=700, justify=tk.LEFT
+        ).pack(anchor=tk.W, pady=(5, 0))
+
+    def create_file_types_tab(self):
+        self.file_type_status_label = ttk.Label(
+            self.file_types_tab, text="", foreground="darkorange",
+            font=(default_font_family, default_font_size, "italic") # Use defined font
+        )
+        self.file_type_status_label.pack(anchor=tk.W, pady=(0, 10))
+
+        include_frame = ttk.LabelFrame(self.file_types_tab, text="Include File Types (Only used if 'Process all text files' is UNCHECKED)", padding=10)
+        include_frame.pack(fill=tk.X, expand=False, pady=5)
+
+        common_types_frame = ttk.Frame(include_frame)
+        common_types_frame.pack(fill=tk.X, pady=5)
+
+        common_file_types = [
+            ("PHP (*.php)", self.include_php), ("Python (*.py)", self.include_py),
+            ("XML (*.xml)", self.include_xml), ("JavaScript (*.js)", self.include_js),
+            ("CSS (*.css)", self.include_css), ("YAML (*.yml, *.yaml)", self.include_yml),
+            ("VCL (*.vcl)", self.include_vcl)
+        ]
+
+        self.file_type_checkbuttons = []
+        cols = 3
+        for i, (text, var) in enumerate(common_file_types):
+            cb = ttk.Checkbutton(common_types_frame, text=text, variable=var)
+            cb.grid(row=i // cols, column=i % cols, sticky=tk.W, padx=10, pady=2)
+            self.file_type_checkbuttons.append(cb)
+
+        ttk.Label(include_frame, text="Additional file types to include (comma separated, e.g. 'html,txt,md'):").pack(anchor=tk.W, pady=(15, 2))
+        self.include_entry = ttk.Entry(include_frame, textvariable=self.custom_include, width=70)
+        self.include_entry.pack(fill=tk.X, pady=(0, 5))
+
+        exclude_frame = ttk.LabelFrame(self.file_types_tab, text="Exclude File Types & Names (These are ALWAYS excluded)", padding=10)
+        exclude_frame.pack(fill=tk.X, expand=False, pady=10)
+
+        ttk.Label(exclude_frame, text=f"Comma separated list (e.g. 'jpg,png,pdf,LICENSE'). Also skips directories like {', '.join(sorted(DEFAULT_SKIP_DIRS))}.").pack(anchor=tk.W, pady=5)
+        exclude_scrollbar_y = ttk.Scrollbar(exclude_frame, orient=tk.VERTICAL)
+        exclude_scrollbar_x = ttk.Scrollbar(exclude_frame, orient=tk.HORIZONTAL)
+        self.exclude_text_area = tk.Text(
+            exclude_frame, height=4, width=70, wrap=tk.NONE,
+            yscrollcommand=exclude_scrollbar_y.set,
+            xscrollcommand=exclude_scrollbar_x.set,
+            undo=True,
+            font=default_font # Apply font
+        )
+        self.exclude_text_area.insert(tk.END, self.custom_exclude.get())
+        self.exclude_text_area.bind("<<Modified>>", self._update_custom_exclude_var)
+
+        exclude_scrollbar_y.config(command=self.exclude_text_area.yview)
+        exclude_scrollbar_x.config(command=self.exclude_text_area.xview)
+        exclude_scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
+        exclude_scrollbar_x.pack(side=tk.BOTTOM, fill=tk.X)
+        self.exclude_text_area.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.exclude_text_area.edit_modified(False)
+
+        ttk.Checkbutton(
+            exclude_frame,
+            text="Honour .gitignore and .ignore files (ignored folders are skipped entirely)",
+            variable=self.use_gitignore
+        ).pack(anchor=tk.W, pady=(5, 0))
+
+        help_frame = ttk.LabelFrame(self.file_types_tab, text="How Filters Work", padding=10)
+        help_frame.pack(fill=tk.X, expand=False, pady=10)
+
+        help_text = ("• On the 'Main' tab:\n"
+                     "  - CHECK 'Process all text files' to include most text files (respecting Excludes).\n"
+                     "  - UNCHECK it to use the specific 'Include' filters below (still respecting Excludes).\n"
+                     "• Included types (tab): Only used when 'Process all text files' is UNCHECKED.\n"
+                     "• Excluded types/names (tab): These files/extensions are *always* skipped.\n"
+                     f"• Hidden/system directories ({', '.join(sorted(DEFAULT_SKIP_DIRS))}, etc.) are always skipped.\n"
+                     "• Files and folders matched by .gitignore/.ignore files are skipped unless that option is unchecked.\n"
+                     "• Enter extensions without the dot (e.g., 'py'). Enter full names for specific files (e.g., 'LICENSE', '.env').\n"
+                     "• Files without extensions are included only if 'Process all text files' is checked (and they aren't explicitly excluded by name).")
+        ttk.Label(help_frame, text=help_text, justify=tk.LEFT).pack(anchor=tk.W)
+
+    def create_options_tab(self):
+        profile_frame = ttk.LabelFrame(self.options_tab, text="Profiles", padding=10)
+        profile_frame.pack(fill=tk.X, expand=False, pady=5)
+
+        profile_row = ttk.Frame(profile_frame)
+        profile_row.pack(fill=tk.X)
+        ttk.Label(profile_row, text="Profile:").pack(side=tk.LEFT, padx=(0, 5))
+        self.profile_combobox = ttk.Combobox(
+            profile_row, textvariable=self.profile_name, values=list_profiles(),
+            state="readonly", width=25
+        )
+        self.profile_combobox.pack(side=tk.LEFT)
+        ttk.Button(profile_row, text="Load", command=self.load_selected_profile).pack(side=tk.LEFT, padx=(10, 5))
+        ttk.Button(profile_row, text="Save As...", command=self.save_profile_as).pack(side=tk.LEFT, padx=5)
+        ttk.Button(profile_row, text="Delete", command=self.delete_selected_profile).pack(side=tk.LEFT, padx=5)
+        ttk.Label(
+            profile_frame,
+            text=f"A profile stores the filters and every option of this tab (and the task prompt) in {default_profiles_dir()}. "
+                 "Use it from the command line with --profile NAME.",
+            wraplength=700, justify=tk.LEFT
+        ).pack(anchor=tk.W, pady=(5, 0))
+
+        performance_frame = ttk.LabelFrame(self.options_tab, text="Performance", padding=10)
+        performance_frame.pack(fill=tk.X, expand=False, pady=5)
+
+        ttk.Checkbutton(
+            performance_frame,
+            text="Use incremental cache (re-read only files changed since the last run)",
+            variable=self.use_cache
+        ).pack(anchor=tk.W)
+        ttk.Label(
+            performance_frame,
+            text="The cache is stored next to the output file as '<output>.cache.sqlite'.",
+            wraplength=700, justify=tk.LEFT
+        ).pack(anchor=tk.W, pady=(5, 0))
+
+        ttk.Checkbutton(
+            performance_frame,
+            text="Remember the folder tree between generations (only folders that changed are listed again)",
+            variable=self.remember_tree
+        ).pack(anchor=tk.W, pady=(10, 0))
+        ttk.Checkbutton(
+            performance_frame,
+            text="Write files identical to an earlier one as a one-line reference instead of repeating them",
+            variable=self.dedupe
+        ).pack(anchor=tk.W, pady=(5, 0))
+        ttk.Checkbutton(
+            performance_frame,
+            text="Save run statistics (time per phase, encodings, slowest files) as '<output>.stats.json'",
+            variable=self.save_stats
+        ).pack(anchor=tk.W, pady=(5, 0))
+
+        large_files_frame = ttk.LabelFrame(self.options_tab, text="Large Files", padding=10)
+        large_files_frame.pack(fill=tk.X, expand=False, pady=10)
+
+        size_frame = ttk.Frame(large_files_frame)
+        size_frame.pack(fill=tk.X)
+        ttk.Label(size_frame, text="Max file size in MB (empty = no limit):").pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Entry(size_frame, textvariable=self.max_file_size_mb, width=8).pack(side=tk.LEFT, padx=5)
+        ttk.Label(size_frame, text="Larger files are:").pack(side=tk.LEFT, padx=(15, 5))
+        ttk.Combobox(
+            size_frame, textvariable=self.oversize_mode, values=OVERSIZE_MODES,
+            state="readonly", width=9
+        ).pack(side=tk.LEFT)
+        ttk.Label(
+            large_files_frame,
+            text="'skip' writes a one-line marker instead of the file, 'truncate' keeps only the beginning and the end "
+                 "of the file. Oversized files are never loaded into memory as a whole.",
+            wraplength=700, justify=tk.LEFT
+        ).pack(anchor=tk.W, pady=(5, 0))
+
+        budget_frame = ttk.LabelFrame(self.options_tab, text="Output Budget", padding=10)
+        budget_frame.pack(fill=tk.X, expand=False, pady=10)
+
+        max_tokens_frame = ttk.Frame(budget_frame)
+        max_tokens_frame.pack(fill=tk.X)
+        ttk.Label(max_tokens_frame, text="Max tokens (empty = no limit):").pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Entry(max_tokens_frame, textvariable=self.max_tokens, width=12).pack(side=tk.LEFT, padx=5)
+        ttk.Label(max_tokens_frame, text="When a file does not fit:").pack(side=tk.LEFT, padx=(15, 5))
+        ttk.Combobox(
+            max_tokens_frame, textvariable=self.budget_strategy, values=BUDGET_STRATEGIES,
+            state="readonly", width=8
+        ).pack(side=tk.LEFT)
+
+        ttk.Checkbutton(
+            budget_frame,
+            text="Write a token summary (tokens per file and directory) into the header",
+            variable=self.token_summary
+        ).pack(anchor=tk.W, pady=(10, 0))
+        ttk.Label(
+            budget_frame,
+            text="Tokens are estimated at about 4 characters per token. 'stop' ends the collection at the first file "
+                 "that does not fit, 'skip' leaves it out and keeps adding files that still fit.",
+            wraplength=700, justify=tk.LEFT
+        ).pack(anchor=tk.W, pady=(5, 0))
+
+        relevance_frame = ttk.LabelFrame(self.options_tab, text="Relevance", padding=10)
+        relevance_frame.pack(fill=tk.X, expand=False, pady=10)
+
+        ttk.Checkbutton(
+            relevance_frame,
+            text="Write the files most relevant to the task prompt first",
+            variable=self.rank_files
+        ).pack(anchor=tk.W)
+        top_k_frame = ttk.Frame(relevance_frame)
+        top_k_frame.pack(fill=tk.X, pady=(5, 0))
+        ttk.Label(top_k_frame, text="Keep only the most relevant files (empty = all):").pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Entry(top_k_frame, textvariable=self.top_k, width=8).pack(side=tk.LEFT, padx=5)
+        ttk.Label(
+            relevance_frame,
+            text="Files are scored against the words of the task prompt (BM25 over file paths and contents), "
+                 "which reads every file once more. Combined with a budget, the most relevant files are kept.",
+            wraplength=700, justify=tk.LEFT
+        ).pack(anchor=tk.W, pady=(5, 0))
+
+        format_frame = ttk.LabelFrame(self.options_tab, text="Output Format", padding=10)
+        format_frame.pack(fill=tk.X, expand=False, pady=10)
+
+        format_row = ttk.Frame(format_frame)
+        format_row.pack(fill=tk.X)
+        ttk.Label(format_row, text="Format:").pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Combobox(
+            format_row, textvariable=self.output_format, values=OUTPUT_FORMATS,
+            state="readonly", width=8
+        ).pack(side=tk.LEFT)
+        ttk.Label(format_row, text="Compression:").pack(side=tk.LEFT, padx=(15, 5))
+        ttk.Combobox(
+            format_row, textvariable=self.compression, values=("none",) + COMPRESSIONS,
+            state="readonly", width=8
+        ).pack(side=tk.LEFT)
+        ttk.Label(format_row, text="Compaction:").pack(side=tk.LEFT, padx=(15, 5))
+        ttk.Combobox(
+            format_row, textvariable=self.compaction, values=("none",) + COMPACTION_MODES,
+            state="readonly", width=10
+        ).pack(side=tk.LEFT)
+        split_row = ttk.Frame(format_frame)
+        split_row.pack(fill=tk.X, pady=(10, 0))
+        ttk.Label(split_row, text="Split into parts of at most this many tokens (empty = one file):").pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Entry(split_row, textvariable=self.split_tokens, width=12).pack(side=tk.LEFT, padx=5)
+        ttk.Label(
+            format_frame,
+            text="'jsonl' writes one JSON record per file (path, ext, size, encoding, content) for other tools. "
+                 "Compression is applied while writing; zstd needs the 'zstandard' package. "
+                 "Compaction 'strip' removes comments, docstrings and repeated blank lines; "
+                 "'signatures' also replaces Python function bodies by '...'. "
+                 "A split output is written as '<output>.part001.txt', '<output>.part002.txt', ... with an index "
+                 "of the files in each part in '<output>.parts.json'; files only span parts when larger than one.",
+            wraplength=700, justify=tk.LEFT
+        ).pack(anchor=tk.W, pady=(5, 0))
+
+    def _apply_options(self, config: CollectorConfig) -> bool:
+        """Copy the Options tab into ``config``. Shows an error and returns False on invalid input."""
+        max_tokens = self.max_tokens.get().strip().replace(",", "").replace("_", "")
+        if max_tokens and not (max_tokens.isdigit() and int(max_tokens) > 0):
+            messagebox.showerror("Error", "Max tokens must be a positive whole number (or empty for no limit).", parent=self.root)
+            return False
+        split_tokens = self.split_tokens.get().strip().replace(",", "").replace("_", "")
+        if split_tokens and not (split_tokens.isdigit() and int(split_tokens) > 0):
+            messagebox.showerror("Error", "The part size must be a positive whole number of tokens (or empty for one file).", parent=self.root)
+            return False
+        top_k = self.top_k.get().strip()
+        if top_k and not (top_k.isdigit() and int(top_k) > 0):
+            messagebox.showerror("Error", "The number of most relevant files must be a positive whole number (or empty for all).", parent=self.root)
+            return False
+        max_file_size_mb = self.max_file_size_mb.get().strip()
+        try:
+            max_file_size = float(max_file_size_mb) if max_file_size_mb else None
+        except ValueError:
+            max_file_size = -1
+        if max_file_size is not None and max_file_size <= 0:
+            messagebox.showerror("Error", "Max file size must be a positive number of MB (or empty for no limit).", parent=self.root)
+            return False
+        config.max_file_size = int(max_file_size * 1024 * 1024) if max_file_size else None
+        config.oversize_mode = self.oversize_mode.get()
+        config.use_gitignore = self.use_gitignore.get()
+        config.use_cache = self.use_cache.get()
+        config.max_tokens = int(max_tokens) if max_tokens else None
+        config.budget_strategy = self.budget_strategy.get()
+        config.token_summary = self.token_summary.get()
+        config.dedupe = self.dedupe.get()
+        config.output_format = self.output_format.get()
+        config.compression = None if self.compression.get() == "none" else self.compression.get()
+        config.compaction = None if self.compaction.get() == "none" else self.compaction.get()
+        if split_tokens:
+            config.split_tokens, config.split_bytes = int(split_tokens), None
+        else:
+            config.split_tokens = None # A part size in bytes can only come from a profile
+        config.rank_files = self.rank_files.get()
+        config.top_k = int(top_k) if top_k else None
+        if config.token_summary and config.output_format != "text":
+            messagebox.showerror("Error", "The token summary is only available for the 'text' output format.", parent=self.root)
+            return False
+        if config.token_summary and config.splits_output:
+            messagebox.showerror("Error", "The token summary cannot be combined with splitting the output into parts.", parent=self.root)
+            return False
+        try:
+            check_compression(config.compression)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e), parent=self.root)
+            return False
+        return True
+
+    def _result_details(self, result) -> list:
+        """Extra report lines (tokens, budget, cache) for the completion message."""
+        details = []
+        if result.estimated_tokens:
+            details.append(result.token_summary_line())
+        details.extend(line for line in (result.ranking_summary(), result.size_limit_summary(), result.budget_summary(),
+                                         result.dedupe_summary(), result.compaction_summary(),
+                                         result.split_summary(), result.resume_summary(), result.cache_summary(),
+                                         result.tree_index_summary()) if line)
+        return details
+
+    def _update_custom_exclude_var(self, event=None):
+        """Update the custom_exclude StringVar when the Text widget changes."""
+        if hasattr(self, 'exclude_text_area') and self.exclude_text_area.edit_modified():
+             current_text = self.exclude_text_area.get("1.0", tk.END).strip()
+             self.custom_exclude.set(current_text)
+             self.exclude_text_area.edit_modified(False)
+             # Rebuild filters immediately when exclude changes
+             self._build_filter_sets()
+
+
+    def update_file_type_state(self):
+        """Enable or disable the file type filter widgets based on the 'use_all_files' checkbox."""
+        use_specific_includes = not self.use_all_files.get()
+        include_state = tk.NORMAL if use_specific_includes else tk.DISABLED
+        exclude_state = tk.NORMAL # Exclude widget is always active
+
+        if hasattr(self, 'file_type_status_label'):
+             if use_specific_includes:
+                 self.file_type_status_label.config(text="Using specific 'Include' filters below (and 'Exclude' filters).")
+             else:
+                 self.file_type_status_label.config(text="Ignoring 'Include' filters (using 'Process all text files' option). 'Exclude' filters still apply.")
+
+        if hasattr(self, 'file_type_checkbuttons'):
+            for cb in self.file_type_checkbuttons:
+                 if cb.winfo_exists():
+                    cb.config(state=include_state)
+        if hasattr(self, 'include_entry') and self.include_entry.winfo_exists():
+            self.include_entry.config(state=include_state)
+        if hasattr(self, 'exclude_text_area') and self.exclude_text_area.winfo_exists():
+             self.exclude_text_area.config(state=exclude_state) # Ensure exclude text is always editable
+
+        self._build_filter_sets() # Rebuild filters whenever state changes
+
+    def _parse_filter_entries(self, entry_string):
+        """Convert a comma-separated string of names/extensions into a lowercase set."""
+        return parse_filter_entries(entry_string)
+
+
+    def _build_filter_sets(self):
+        """Update the collector config (include/exclude sets) based on UI."""
+        include_types = set()
+        # Build include set ONLY if specific filters are enabled
+        if not self.use_all_files.get():
+            for key, var in self._include_type_vars().items():
+                if var.get():
+                    include_types.update(COMMON_INCLUDE_TYPES[key])
+            include_types.update(parse_include_extensions(self.custom_include.get()))
+
+        self.config = replace(
+            self._base_config,
+            use_all_files=self.use_all_files.get(),
+            include_extensions=include_types,
+            # Build exclude set from the text area (via the StringVar)
+            exclude_entries=self._parse_filter_entries(self.custom_exclude.get()),
+        )
+
+
+    def _include_type_vars(self) -> dict:
+        return {
+            "php": self.include_php, "py": self.include_py, "xml": self.include_xml,
+            "js": self.include_js, "css": self.include_css, "yml": self.include_yml,
+            "vcl": self.include_vcl,
+        }
+
+    # --- Profiles ---
+
+    def _refresh_profile_list(self):
+        self.profile_combobox.config(values=list_profiles())
+
+    def load_selected_profile(self):
+        name = self.profile_name.get()
+        if not name:
+            messagebox.showerror("Error", "Please select a profile to load.", parent=self.root)
+            return
+        self.load_profile_named(name)
+
+    def load_profile_named(self, name: str):
+        try:
+            config = load_profile(name)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e), parent=self.root)
+            return
+        self._apply_profile(config)
+        self.profile_name.set(name)
+        self.status_var.set(f"Loaded profile '{name}'")
+
+    def _apply_profile(self, config: CollectorConfig):
+        """Set every widget from ``config``; settings without a widget are kept for the next generation."""
+        self.use_all_files.set(config.use_all_files)
+        if config.include_extensions or not config.use_all_files:
+            remaining = set(config.include_extensions)
+            for key, var in self._include_type_vars().items():
+                checked = all(ext in config.include_extensions for ext in COMMON_INCLUDE_TYPES[key])
+                var.set(checked)
+                if checked:
+                    remaining.difference_update(COMMON_INCLUDE_TYPES[key])
+            self.custom_include.set(",".join(sorted(remaining)))
+        exclude_text = ",".join(sorted(config.exclude_entries - ALWAYS_EXCLUDED_ENTRIES))
+        self.custom_exclude.set(exclude_text)
+        self.exclude_text_area.delete("1.0", tk.END)
+        self.exclude_text_area.insert(tk.END, exclude_text)
+        self.exclude_text_area.edit_modified(False)
+
+        self.use_gitignore.set(config.use_gitignore)
+        self.use_cache.set(config.use_cache)
+        self.max_tokens.set(str(config.max_tokens) if config.max_tokens else "")
+        self.max_file_size_mb.set(f"{config.max_file_size / (1024 * 1024):g}" if config.max_file_size else "")
+        self.oversize_mode.set(config.oversize_mode)
+        self.budget_strategy.set(config.budget_strategy)
+        self.token_summary.set(config.token_summary)
+        self.dedupe.set(config.dedupe)
+        self.output_format.set(config.output_format)
+        self.compression.set(config.compression or "none")
+        self.compaction.set(config.compaction or "none")
+        self.split_tokens.set(str(config.split_tokens) if config.split_tokens else "")
+        self.rank_files.set(config.rank_files)
+        self.top_k.set(str(config.top_k) if config.top_k else "")
+        if config.prompt:
+            self.prompt_text_area.delete("1.0", tk.END)
+            self.prompt_text_area.insert("1.0", config.prompt)
+
+        self._base_config = config
+        self.update_file_type_state()
+
+    def save_profile_as(self):
+        name = simpledialog.askstring("Save Profile", "Profile name:", initialvalue=self.profile_name.get(), parent=self.root)
+        if not name:
+            return
+        self._update_custom_exclude_var()
+        self._build_filter_sets()
+        if not self._apply_options(self.config):
+            return
+        self.config.prompt = self.prompt_text_area.get("1.0", tk.END).strip()
+        try:
+            path = save_profile(name.strip(), self.config)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not save the profile:\n{e}", parent=self.root)
+            return
+        self._base_config = self.config
+        self._refresh_profile_list()
+        self.profile_name.set(name.strip())
+        self.status_var.set(f"Saved profile '{name.strip()}' to {path}")
+
+    def delete_selected_profile(self):
+        name = self.profile_name.get()
+        if not name:
+            return
+        if not messagebox.askyesno("Delete Profile", f"Delete the profile '{name}'?", parent=self.root):
+            return
+        try:
+            delete_profile(name)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not delete the profile:\n{e}", parent=self.root)
+            return
+        self.profile_name.set("")
+        self._refresh_profile_list()
+
+    # --- Preview tab ---
+
+    def load_preview(self):
+        source_str = self.source_folder.get()
+        if not source_str or not Path(source_str).is_dir():
+            messagebox.showerror("Error", "Please select an existing source folder first.", parent=self.root)
+            return
+        self._update_custom_exclude_var()
+        self._build_filter_sets()
+        if not self._apply_options(self.config):
+            return
+        source_path = Path(source_str)
+        if self._preview_source is None or self._preview_source.resolve() != source_path.resolve():
+            self._unticked = set()
+
+        self._preview_cancel.set() # Stop the rollup of a previous preview
+        self._preview_cancel = threading.Event()
+        self._preview_source = source_path
+        self._preview_config = self.config
+        self._preview_rollup = TreeRollup(source_path, self.config)
+        self._preview_entries = {}
+        self.preview_tree.delete(*self.preview_tree.get_children())
+        self._insert_preview_children("", "")
+        self._refresh_preview()
+
+        output_str = self.output_file.get()
+        own_files = OwnFiles([Path(output_str)]) if output_str else None
+        self._preview_running = True
+        threading.Thread(
+            target=self._preview_rollup_thread,
+            args=(self._preview_rollup, own_files, self._preview_cancel),
+            daemon=True
+        ).start()
+        self._start_polling()
+
+    def _preview_rollup_thread(self, rollup: TreeRollup, own_files, cancel: threading.Event):
+        try:
+            rollup.run(own_files, cancel, on_progress=lambda: self._post_to_ui(self._refresh_preview, rollup))
+        except Exception:
+            print("--- ERROR DURING PREVIEW ---")
+            traceback.print_exc()
+        finally:
+            self._post_to_ui(self._finish_preview, rollup)
+
+    def _finish_preview(self, rollup: TreeRollup):
+        if rollup is self._preview_rollup:
+            self._preview_running = False
+            self._refresh_preview(rollup)
+
+    def _insert_preview_children(self, parent: str, relative_dir: str):
+        try:
+            entries = list_directory(self._preview_source, relative_dir, self._preview_config)
+        except OSError as e:
+            self.preview_tree.insert(parent, tk.END, text=f"(Could not list folder: {e})")
+            return
+        for entry in entries:
+            self._preview_entries[entry.relative_path] = entry
+            self.preview_tree.insert(parent, tk.END, iid=entry.relative_path, text=entry.name,
+                                     values=self._preview_values(entry))
+            if entry.is_dir and entry.status != STATUS_SKIPPED:
+                # Placeholder so the folder can be opened; replaced by its entries on first open
+                self.preview_tree.insert(entry.relative_path, tk.END, iid=entry.relative_path + "/\0", text="Loading...")
+
+    def _on_preview_open(self, event=None):
+        item = self.preview_tree.focus()
+        placeholder = item + "/\0"
+        if item and self.preview_tree.exists(placeholder):
+            self.preview_tree.delete(placeholder)
+            self._insert_preview_children(item, item)
+
+    def _preview_values(self, entry) -> tuple:
+        rollup = self._preview_rollup
+        use = "\u2718" if is_excluded(entry.relative_path, self._unticked) else "\u2714"
+        status = resolve_status(entry, rollup)
+        size_text = tokens_text = ""
+        if entry.is_dir:
+            if status == STATUS_INCLUDED and rollup is not None and entry.relative_path in rollup.dirs:
+                files, size = rollup.totals(entry.relative_path, self._unticked)
+                pending = "" if rollup.done else "+"
+                size_text = f"{format_bytes(size)}{pending} in {files}{pending} files"
+                tokens_text = f"~{estimate_tokens_for_size(size):,}{pending}"
+        elif entry.size is not None:
+            size_text = format_bytes(entry.size)
+            if status == STATUS_INCLUDED:
+                tokens_text = f"~{estimate_tokens_for_size(entry.size):,}"
+        return use, status, size_text, tokens_text
+
+    def _refresh_preview(self, rollup: Optional[TreeRollup] = None):
+        """Update the loaded rows and the summary; ``rollup`` is the one that posted the update, if any."""
+        if rollup is not None and rollup is not self._preview_rollup:
+            return # Posted by the rollup of an older preview
+        for iid, entry in self._preview_entries.items():
+            if self.preview_tree.exists(iid):
+                self.preview_tree.item(iid, values=self._preview_values(entry))
+        rollup = self._preview_rollup
+        if rollup is None:
+            return
+        files, size = rollup.totals("", self._unticked)
+        summary = f"Selected: {files} files, {format_bytes(size)}, ~{estimate_tokens_for_size(size):,} tokens"
+        if self._unticked:
+            summary += f" ({len(self._unticked)} unticked paths left out)"
+        if not rollup.done:
+            summary += " - still counting..."
+        self.preview_summary_var.set(summary)
+
+    def toggle_preview_selection(self, event=None):
+        for iid in self.preview_tree.selection():
+            if iid not in self._preview_entries:
+                continue
+            if iid in self._unticked:
+                self._unticked.discard(iid)
+            elif not is_excluded(iid, self._unticked):
+                self._unticked.add(iid)
+            # Entries inside an unticked folder follow the folder
+        self._refresh_preview()
+        return "break" # Keep Space from also toggling the focused row open
+
+    def tick_all_preview(self):
+        self._unticked = set()
+        self._refresh_preview()
+
+    def browse_source(self):
+        folder_path = filedialog.askdirectory(title="Select Source Folder", initialdir=Path.home())
+        if folder_path:
+            self.source_folder.set(folder_path)
+
+    def browse_output(self):
+        source_name = Path(self.source_folder.get()).name
+        initial_filename = f"{source_name}_collected.txt" if source_name else "collected_files.txt"
+        file_path = filedialog.asksaveasfilename(
+            title="Save Output File As...",
+            initialdir=Path.home(), initialfile=initial_filename,
+            defaultextension=".txt",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        if file_path:
+            self.output_file.set(file_path)
+
+    def generate_file(self):
+        source_str = self.source_folder.get()
+        output_str = self.output_file.get()
+        prompt = self.prompt_text_area.get("1.0", tk.END).strip()
+
+        if not source_str:
+            messagebox.showerror("Error", "Please select a source folder.", parent=self.root)
+            return
+        source_path = Path(source_str)
+        if not source_path.is_dir():
+            messagebox.showerror("Error", f"Source folder not found or is not a directory:\n{source_path}", parent=self.root)
+            return
+
+        if not output_str:
+            messagebox.showerror("Error", "Please specify an output file path.", parent=self.root)
+            return
+        output_path = Path(output_str)
+
+        # Safety check: Prevent output inside source
+        try:
+            resolved_output = output_path.resolve()
+            resolved_source = source_path.resolve()
+            # Use is_relative_to for robust check across OS/mount points if possible
+            # Add explicit check for equality too
+            if resolved_output == resolved_source or resolved_output.is_relative_to(resolved_source):
+                 if not messagebox.askyesno("Warning", "The output file is inside the source folder. This could lead to processing the output file itself on subsequent runs.\n\nContinue anyway?", parent=self.root, icon='warning'):
+                     return
+        except (OSError, ValueError) as e: # Catch resolution errors or ValueError from is_relative_to (e.g. different drives)
+             print(f"Warning: Could not perform output/source path check - {e}")
+
+
+        # Ensure filter sets are up-to-date before starting thread
+        # Force update from text area in case user didn't trigger the <<Modified>> event
+        self._update_custom_exclude_var()
+        self._build_filter_sets()
+        if not self._apply_options(self.config):
+            return
+        self.config.stats_path = default_stats_path(output_path) if self.save_stats.get() else None
+        if self._unticked and self._preview_source is not None and self._preview_source.resolve() == source_path.resolve():
+            self.config.excluded_paths = set(self._unticked)
+
+        self.config.prompt = prompt
+        self.config.count_first = True # The progress bar needs the total up front
+        self.config.resume = False
+        if FileCollector(self.config).find_checkpoint(source_path, output_path) is not None:
+            answer = messagebox.askyesnocancel(
+                "Resume",
+                "A previous collection into this output file was interrupted.\n\n"
+                "Resume it (Yes), or start over (No)?",
+                parent=self.root
+            )
+            if answer is None:
+                return
+            self.config.resume = answer
+
+        self.generate_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.status_var.set("Starting collection...")
+        self.progress_var.set(0)
+        self.status_label.config(foreground="blue")
+
+        tree_index = None
+        if self.remember_tree.get():
+            if self._tree_index is None or self._tree_index.root != str(source_path.resolve()):
+                self._tree_index = TreeIndex(source_path)
+            tree_index = self._tree_index
+
+        self._cancel_event = threading.Event()
+        self._job_running = True
+        threading.Thread(
+            target=self.collect_files_thread,
+            args=(source_path, output_path, self.config, self._cancel_event, tree_index),
+            daemon=True
+        ).start()
+        self._start_polling()
+
+    # --- Worker -> UI events ---
+    # Tk is not thread-safe: the worker only puts events on a queue, and the main loop
+    # applies them on a timer. Progress events are coalesced so a fast scan of many small
+    # files costs one widget update per tick instead of one per file.
+
+    def _report_progress(self, message, processed=None, total=None):
+        self._ui_events.put(("progress", message, processed, total))
+
+    def _post_to_ui(self, func, *args):
+        self._ui_events.put(("call", func, args))
+
+    def _start_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(PROGRESS_POLL_MS, self._drain_ui_events)
+
+    def cancel_generation(self):
+        # Checked by the worker between files; it stops and leaves a checkpoint for resuming
+        self._cancel_event.set()
+        self.cancel_button.config(state=tk.DISABLED)
+        self.status_var.set("Cancelling...")
+
+    def _finish_job(self):
+        self._job_running = False
+        self.generate_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+
+    def _apply_progress(self, message, processed, total):
+        self.status_var.set(message)
+        if processed is not None and total:
+            self.progress_var.set((processed / total) * 100)
+
+    def _drain_ui_events(self):
+        latest_progress = None
+        while True:
+            try:
+                event = self._ui_events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == "progress":
+                latest_progress = event[1:]
+                continue
+            # Calls run in order, after any progress posted before them
+            if latest_progress is not None:
+                self._apply_progress(*latest_progress)
+                latest_progress = None
+            _, func, args = event
+            func(*args)
+        if latest_progress is not None:
+            self._apply_progress(*latest_progress)
+        if self._job_running or self._preview_running:
+            self.root.after(PROGRESS_POLL_MS, self._drain_ui_events)
+        else:
+            self._polling = False
+
+    def collect_files_thread(self, source_path: Path, output_path: Path, config: CollectorConfig,
+                             cancel: threading.Event, tree_index: Optional[TreeIndex] = None):
+        try:
+            collector = FileCollector(config, progress=self._report_progress, cancel=cancel, tree_index=tree_index)
+            result = collector.collect(source_path, output_path)
+
+            if result.cancelled:
+                self._post_to_ui(self.status_var.set, f"Cancelled ({result.processed_files} files written). "
+                                                      + ("" if config.ranks_files or config.splits_output
+                                                         else "Generate again to resume."))
+                self._post_to_ui(lambda: self.status_label.config(foreground="darkorange"))
+                return
+
+            if result.total_files == 0 and not result.omitted_files:
+                self._post_to_ui(self.status_var.set, "Ready (No matching files found)")
+                self._post_to_ui(lambda: messagebox.showwarning(
+                    "No Files Found",
+                    "No files matching the criteria were found in the source folder or all were excluded.\n"
+                    f"Checked {result.scanned_dirs} directories, skipped {result.skipped_dirs} hidden/system directories (like .git) "
+                    f"and {result.ignored_paths} paths ignored by .gitignore.\n"
+                    "Please check the folder contents and your file type filters (especially Excludes).",
+                    parent=self.root
+                ))
+                return
+
+            processed_files = result.processed_files
+            final_message = (f"File collection complete!\n\n"
+                             f"Processed {processed_files} files.\n"
+                             + "".join(f"{line}\n" for line in self._result_details(result)) +
+                             f"Output saved to:\n{(result.parts_manifest or output_path).resolve()}\n\n"
+                             + "\n".join(result.stats.summary_lines()))
+            self._post_to_ui(self.status_var.set, " - ".join([f"Ready (Completed: {processed_files} files)"] + self._result_details(result)))
+            self._post_to_ui(lambda: self.status_label.config(foreground="green"))
+            self._post_to_ui(lambda: messagebox.showinfo("Success", final_message, parent=self.root))
+
+        except Exception as e:
+            print("--- ERROR DURING FILE COLLECTION ---")
+            traceback.print_exc()
+            print("------------------------------------")
+            error_details = f"An error occurred during file collection:\n\n{type(e).__name__}: {e}\n\n(Check console output for more details)"
+            self._post_to_ui(self.status_var.set, "Error occurred (See console for details)")
+            self._post_to_ui(lambda: self.status_label.config(foreground="red"))
+            self._post_to_ui(lambda: messagebox.showerror("Error", error_details, parent=self.root))
+
+        finally:
+            self._post_to_ui(self._finish_job)
+
+
+def main(profile: Optional[str] = None):
+    global default_font_family, default_font
+
+    root = tk.Tk()
+    style = ttk.Style()
+    available_themes = style.theme_names()
+    # Prefer more modern themes
+    if 'clam' in available_themes: style.theme_use('clam')
+    elif 'vista' in available_themes: style.theme_use('vista')
+    elif 'aqua' in available_themes: style.theme_use('aqua')
+    elif 'gtk' in available_themes: style.theme_use('gtk')
+    elif 'winxpnative' in available_themes: style.theme_use('winxpnative')
+
+    try:
+        import tkinter.font
+        font_families = tkinter.font.families()
+        if default_font_family not in font_families:
+             # Basic fallback font logic
+             if 'Helvetica' in font_families: default_font_family = 'Helvetica'
+             elif 'Arial' in font_families: default_font_family = 'Arial'
+             else: default_font_family = None
+
+        default_font = (default_font_family, default_font_size)
+        bold_font = (default_font_family, default_font_size, 'bold')
+    except Exception:
+        default_font = (None, default_font_size)
+        bold_font = (None, default_font_size, 'bold')
+
+    style.configure('TButton', font=default_font, padding=5)
+    style.configure('TLabel', font=default_font)
+    style.configure('TEntry', font=default_font, padding=3)
+    style.configure('TCheckbutton', font=default_font)
+    style.configure('TFrame', background=style.lookup('TFrame', 'background'))
+    style.configure('TLabelframe', font=bold_font, padding=10)
+    style.configure('TLabelframe.Label', font=bold_font)
+    style.configure('TNotebook.Tab', font=default_font, padding=[10, 5])
+
+    app = FileCollectorApp(root)
+    if profile:
+        app.load_profile_named(profile)
+    root.mainloop()
@@ -0,0 +1,203 @@
+"""``.gitignore``/``.ignore`` support for the walker.
+
+Each ignore file is compiled once into regular expressions when the walker
+enters its directory. Rules are applied to directories before descending, so
+ignored subtrees (``dist/``, ``venv/``, ``target/``, ...) are never listed.
+"""
+import os
+import re
+from typing import List, Optional, Tuple
+
+IGNORE_FILE_NAMES = (".gitignore", ".ignore")
+
+# Windows file systems are case-insensitive, so git defaults to core.ignorecase there
+_RE_FLAGS = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+
+
+def _translate_glob(pattern: str) -> str:
+    """Translate a gitignore glob (no leading/trailing slash handling) into a regex fragment."""
+    i, n = 0, len(pattern)
+    parts = []
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern.startswith('**', i):
+                j = i + 2
+                at_segment_start = i == 0 or pattern[i - 1] == '/'
+                at_segment_end = j == n or pattern[j] == '/'
+                if at_segment_start and at_segment_end:
+                    if j == n:
+                        parts.append('.*') # 'dir/**': everything inside
+                    else:
+                        parts.append('(?:.*/)?') # '**/': zero or more directories
+                        j += 1
+                    i = j
+                    continue
+                i = j # Any other '**' is a plain '*'
+            else:
+                i += 1
+            parts.append('[^/]*')
+            continue
+        if c == '?':
+            parts.append('[^/]')
+        elif c == '[':
+            j = pattern.find(']', i + 2 if pattern.startswith('[!', i) or pattern.startswith('[]', i) else i + 1)
+            if j == -1:
+                parts.append(re.escape(c))
+            else:
+                stuff = pattern[i + 1:j].replace('\\', '\\\\')
+                if stuff.startswith('!'):
+                    stuff = '^' + stuff[1:]
+                parts.append(f'[{stuff}]')
+                i = j
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            parts.append(re.escape(pattern[i]))
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return ''.join(parts)
+
+
+def parse_ignore_line(line: str) -> Optional[Tuple[str, bool, bool]]:
+    """Parse one line into ``(regex, negated, dir_only)``, or None for blanks and comments."""
+    line = line.rstrip('\r\n')
+    # Trailing spaces are ignored unless escaped with a backslash
+    stripped = line.rstrip(' ')
+    if stripped.endswith('\\') and len(stripped) < len(line):
+        stripped += ' '
+    line = stripped
+    if not line or line.startswith('#'):
+        return None
+    negated = line.startswith('!')
+    if negated:
+        line = line[1:]
+    elif line.startswith('\\#') or line.startswith('\\!'):
+        line = line[1:]
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+    # A slash at the start or in the middle anchors the pattern to the ignore file's folder
+    anchored = '/' in line
+    line = line.lstrip('/')
+    prefix = '' if anchored else '(?:.*/)?'
+    return f'^{prefix}{_translate_glob(line)}$', negated, dir_only
+
+
+class IgnoreRules:
+    """The compiled rules of one ignore file, matching paths relative to its folder."""
+    __slots__ = ("base_prefix", "rebase", "_rules", "_any_re", "_dir_re")
+
+    def __init__(self, lines, base_prefix: str = "", rebase: str = ""):
+        # Paths handed to match() are relative to the walk root. base_prefix is this file's
+        # folder below the root; rebase is the root's path below this file's folder when
+        # the file lives above the root.
+        self.base_prefix = base_prefix
+        self.rebase = rebase
+        rules = [rule for rule in map(parse_ignore_line, lines) if rule is not None]
+        self._rules: List[Tuple[re.Pattern, bool, bool]] = []
+        self._any_re = self._dir_re = None
+        if any(negated for _, negated, _ in rules):
+            # Order matters with negations: the last matching rule wins
+            self._rules = [(re.compile(regex, _RE_FLAGS), negated, dir_only) for regex, negated, dir_only in rules]
+        else:
+            # Without negations any match ignores the path, so one alternation per kind is enough
+            any_rules = [regex for regex, _, dir_only in rules if not dir_only]
+            dir_rules = [regex for regex, _, dir_only in rules if dir_only]
+            self._any_re = re.compile('|'.join(any_rules), _RE_FLAGS) if any_rules else None
+            self._dir_re = re.compile('|'.join(dir_rules), _RE_FLAGS) if dir_rules else None
+
+    @classmethod
+    def from_file(cls, path: str, base_prefix: str = "", rebase: str = "") -> Optional["IgnoreRules"]:
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                rules = cls(f, base_prefix, rebase)
+        except OSError:
+            return None
+        return rules if rules else None
+
+    def __bool__(self):
+        return bool(self._rules or self._any_re or self._dir_re)
+
+    def match(self, relative_path: str, is_dir: bool) -> Optional[bool]:
+        """True if ignored, False if re-included by a negation, None if no rule matches.
+
+        ``relative_path`` uses '/' separators and is relative to the walk root.
+        """
+        if self.rebase:
+            relative_path = self.rebase + relative_path
+        elif self.base_prefix:
+            if not relative_path.startswith(self.base_prefix):
+                return None
+            relative_path = relative_path[len(self.base_prefix):]
+        if self._rules:
+            for regex, negated, dir_only in reversed(self._rules):
+                if (is_dir or not dir_only) and regex.match(relative_path):
+                    return not negated
+            return None
+        if self._any_re is not None and self._any_re.match(relative_path):
+            return True
+        if is_dir and self._dir_re is not None and self._dir_re.match(relative_path):
+            return True
+        return None
+
+
+def is_ignored(chain, relative_path: str, is_dir: bool) -> bool:
+    """Apply a chain of :class:`IgnoreRules`, outermost first; deeper files take precedence."""
+    for rules in reversed(chain):
+        decision = rules.match(relative_path, is_dir)
+        if decision is not None:
+            return decision
+    return False
+
+
+def load_ignore_rules(dir_path: str, base_prefix: str, names) -> list:
+    """Compile the ignore files present in ``dir_path``.
+
+    ``names`` is the set of entry names already listed by the walker, so no
+    extra system calls are made for folders without ignore files.
+    """
+    loaded = []
+    for name in IGNORE_FILE_NAMES:
+        if name in names:
+            rules = IgnoreRules.from_file(os.path.join(dir_path, name), base_prefix)
+            if rules is not None:
+                loaded.append(rules)
+    return loaded
+
+
+def root_ignore_rules(root: str) -> list:
+    """Rules that apply to the walk root from outside it.
+
+    When collecting a sub-folder of a repository, the ``.gitignore`` files of
+    the parent folders up to the repository root still apply, as does
+    ``.git/info/exclude``. Their patterns are matched against paths re-based
+    onto their own folder.
+    """
+    chain = []
+    root = os.path.abspath(root)
+    current, below = root, ""
+    while True:
+        if current != root:
+            # Reversed because the whole chain is reversed below
+            for name in reversed(IGNORE_FILE_NAMES):
+                path = os.path.join(current, name)
+                if os.path.isfile(path):
+                    rules = IgnoreRules.from_file(path, rebase=below)
+                    if rules is not None:
+                        chain.append(rules)
+        if os.path.isdir(os.path.join(current, ".git")):
+            exclude = IgnoreRules.from_file(os.path.join(current, ".git", "info", "exclude"), rebase=below)
+            if exclude is not None:
+                chain.append(exclude)
+            break
+        parent = os.path.dirname(current)
+        if parent == current:
+            # Not inside a repository: parent folders' ignore files do not apply
+            return []
+        below = os.path.basename(current) + "/" + below
+        current = parent
+    chain.reverse() # Outermost first
+    return chain
+
@@ -0,0 +1,111 @@
+"""Output formats and streams: plain text or JSONL, optionally compressed, to a file or stdout."""
+import gzip
+import io
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Optional, Tuple
+
+OUTPUT_FORMATS = ("text", "jsonl")
+COMPRESSIONS = ("gzip", "zstd")
+# Output "path" that streams to standard output
+STDOUT = "-"
+# Suffix of the temporary file an atomic write goes through
+TMP_SUFFIX = ".tmp"
+
+_COMPRESSION_SUFFIXES = {".gz": "gzip", ".gzip": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+
+
+def is_stdout(output) -> bool:
+    return os.fspath(output) == STDOUT
+
+
+def sidecar_path(path, suffix: str) -> Path:
+    """A file next to ``path`` named after it (``out.txt`` + ``.cache.sqlite`` -> ``out.txt.cache.sqlite``)."""
+    path = Path(path)
+    return path.with_name(path.name + suffix)
+
+
+def atomic_write_text(path, text: str):
+    """Write ``text`` to ``path`` through a temporary file and ``os.replace``.
+
+    A crash while writing leaves the previous file intact, never a partial one.
+    """
+    tmp_path = sidecar_path(path, TMP_SUFFIX)
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def compression_for_path(output) -> Optional[str]:
+    """Compression implied by the output's suffix (``.gz``, ``.zst``), or None."""
+    if is_stdout(output):
+        return None
+    return _COMPRESSION_SUFFIXES.get(Path(output).suffix.lower())
+
+
+def check_compression(compression: Optional[str]):
+    """Raise ValueError for unknown compressions or a missing optional dependency."""
+    if compression is None:
+        return
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Compression must be one of {', '.join(COMPRESSIONS)}, not '{compression}'")
+    if compression == "zstd":
+        try:
+            import zstandard # noqa: F401 Optional dependency, only needed for zstd output
+        except ImportError:
+            raise ValueError("zstd compression needs the 'zstandard' package (pip install zstandard)") from None
+
+
+def open_output(output, compression: Optional[str] = None, append: bool = False):
+    """Open the output as a UTF-8 text stream. ``output`` may be :data:`STDOUT`.
+
+    Compression is streaming: data is compressed as it is written, nothing is
+    buffered for the whole collection. Closing the stream never closes stdout.
+    """
+    check_compression(compression)
+    if is_stdout(output):
+        raw = open(sys.stdout.fileno(), 'wb', closefd=False)
+    else:
+        raw = open(output, 'ab' if append else 'wb')
+    if compression == "gzip":
+        # Closing a GzipFile given a fileobj leaves that file open, so it is closed with the wrapper
+        raw = _ClosingGzipFile(fileobj=raw, mode='wb')
+    elif compression == "zstd":
+        import zstandard
+        raw = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+    return io.TextIOWrapper(raw, encoding='utf-8', errors='replace')
+
+
+class _ClosingGzipFile(gzip.GzipFile):
+    def close(self):
+        fileobj = self.fileobj
+        try:
+            super().close()
+        finally:
+            if fileobj is not None:
+                fileobj.close()
+
+
+def format_record(relative_path: str, extension: str, read, identical_to: Optional[str] = None,
+                  piece: Optional[Tuple[int, int]] = None) -> str:
+    """One JSONL line for a collected file (or, with ``piece=(i, n)``, for the i-th of its n pieces)."""
+    record = {
+        "path": relative_path.replace(os.sep, '/'),
+        "ext": extension,
+        "size": read.size,
+        "encoding": read.encoding,
+        "content": read.content if identical_to is None else None,
+    }
+    if identical_to is not None:
+        record["identical_to"] = identical_to.replace(os.sep, '/')
+    elif read.error is not None:
+        record["error"] = read.error
+    if read.truncated:
+        record["truncated"] = True
+    if read.compaction_saved and identical_to is None:
+        record["compaction_saved"] = read.compaction_saved
+    if piece is not None:
+        record["piece"], record["pieces"] = piece
+    return json.dumps(record, ensure_ascii=False) + "\n"
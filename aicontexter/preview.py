@@ -0,0 +1,152 @@
+"""Data behind the GUI's preview tab.
+
+:func:`list_directory` lists one folder with the filter status of every entry,
+so the tree can be loaded lazily as folders are expanded. :class:`TreeRollup`
+walks the whole source in the background, exactly as a collection would, and
+adds up the included files and bytes per folder. Its results let the preview
+tell files left out by ``.gitignore`` apart from included ones.
+
+Relative paths here are '/' separated (see ``normalize_relative_path``), the
+form ``CollectorConfig.excluded_paths`` takes.
+"""
+import os
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .collector import CollectorConfig
+from .tokens import CHARS_PER_TOKEN
+from .walker import OwnFiles, walk_files
+
+STATUS_INCLUDED = "included"
+STATUS_EXCLUDED = "excluded" # By the include/exclude filters
+STATUS_SKIPPED = "skipped" # Skipped folder (.git, node_modules, ...) or a symlinked one
+STATUS_IGNORED = "ignored" # By .gitignore/.ignore, or one of the collection's own files
+STATUS_NO_FILES = "no files" # Folder without any included file
+
+
+class PreviewEntry(NamedTuple):
+    name: str
+    relative_path: str # '/' separated
+    is_dir: bool
+    size: Optional[int] # Files only; None when it cannot be stat'ed
+    status: str
+
+
+def estimate_tokens_for_size(size: int) -> int:
+    """Token estimate from a byte count, matching the heuristic tokenizer."""
+    return (size + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _join(relative_dir: str, name: str) -> str:
+    return f"{relative_dir}/{name}" if relative_dir else name
+
+
+def list_directory(source, relative_dir: str, config: CollectorConfig) -> List[PreviewEntry]:
+    """Entries of one folder below ``source``, folders first, each with its filter status.
+
+    The status only reflects the name filters and skipped folders; see
+    :func:`resolve_status` for the ``.gitignore`` rules.
+    """
+    rules = config.compile_filters()
+    dir_path = os.path.join(source, *relative_dir.split('/')) if relative_dir else os.fspath(source)
+    with os.scandir(dir_path) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    dirs, files = [], []
+    for entry in entries:
+        relative_path = _join(relative_dir, entry.name)
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if is_dir:
+            skipped = entry.name.lower() in config.skip_dirs or entry.is_symlink()
+            status = STATUS_SKIPPED if skipped else STATUS_INCLUDED
+            dirs.append(PreviewEntry(entry.name, relative_path, True, None, status))
+            continue
+        try:
+            size = entry.stat().st_size
+        except OSError:
+            size = None
+        status = STATUS_INCLUDED if rules.matches(entry.name) else STATUS_EXCLUDED
+        files.append(PreviewEntry(entry.name, relative_path, False, size, status))
+    return dirs + files
+
+
+def resolve_status(entry: PreviewEntry, rollup: Optional["TreeRollup"]) -> str:
+    """The entry's status once a finished ``rollup`` tells which files the walk actually kept."""
+    if entry.status != STATUS_INCLUDED or rollup is None or not rollup.done:
+        return entry.status
+    if entry.is_dir:
+        return STATUS_INCLUDED if entry.relative_path in rollup.dirs else STATUS_NO_FILES
+    return STATUS_INCLUDED if entry.relative_path in rollup.files else STATUS_IGNORED
+
+
+def outermost_paths(paths: Iterable[str]) -> Set[str]:
+    """Drop the paths that lie inside another path of the set."""
+    paths = set(paths)
+    return {path for path in paths
+            if not any(path.startswith(other + '/') for other in paths if other != path)}
+
+
+def is_excluded(relative_path: str, excluded_paths: Set[str]) -> bool:
+    """Whether ``relative_path`` or one of its parent folders is in ``excluded_paths``."""
+    parts = relative_path.split('/')
+    return any('/'.join(parts[:i]) in excluded_paths for i in range(1, len(parts) + 1))
+
+
+class TreeRollup:
+    """Included files and bytes per folder, filled by :meth:`run` (usually in a background thread).
+
+    The maps are only ever added to, so the UI thread may look values up while
+    the walk is still running.
+    """
+
+    def __init__(self, source, config: CollectorConfig):
+        self.source = os.fspath(source)
+        self.config = config
+        self.files: Dict[str, int] = {} # Included file -> size
+        self.dirs: Dict[str, List[int]] = {} # Folder ('' for the root) -> [included files, bytes]
+        self.done = False
+
+    def run(self, own_files: Optional[OwnFiles] = None, cancel: Optional[threading.Event] = None,
+            on_progress=None, every: int = 500):
+        """Walk the source like a collection would (without ``excluded_paths``, which the UI subtracts).
+
+        ``on_progress()`` is called every ``every`` files; ``done`` is set only
+        when the walk finished without being cancelled.
+        """
+        config = self.config
+        files = walk_files(self.source, config.compile_filters(), config.skip_dirs, own_files, None,
+                           config.use_gitignore, cancel)
+        for count, scanned in enumerate(files, 1):
+            try:
+                size = os.stat(scanned.path).st_size
+            except OSError:
+                size = 0
+            relative_path = scanned.relative_path.replace(os.sep, '/')
+            self.files[relative_path] = size
+            parts = relative_path.split('/')[:-1]
+            for i in range(len(parts) + 1):
+                totals = self.dirs.setdefault('/'.join(parts[:i]), [0, 0])
+                totals[0] += 1
+                totals[1] += size
+            if on_progress is not None and count % every == 0:
+                on_progress()
+        self.done = cancel is None or not cancel.is_set()
+
+    def totals(self, relative_dir: str, excluded_paths: Set[str] = frozenset()) -> Tuple[int, int]:
+        """(files, bytes) included below ``relative_dir`` once ``excluded_paths`` are left out."""
+        if relative_dir and is_excluded(relative_dir, excluded_paths):
+            return 0, 0
+        files, size = self.dirs.get(relative_dir, (0, 0))
+        prefix = relative_dir + '/' if relative_dir else ''
+        for path in outermost_paths(excluded_paths):
+            if not path.startswith(prefix):
+                continue
+            if path in self.dirs:
+                files -= self.dirs[path][0]
+                size -= self.dirs[path][1]
+            elif path in self.files:
+                files -= 1
+                size -= self.files[path]
+        return files, size
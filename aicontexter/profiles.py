@@ -0,0 +1,121 @@
+"""Named configuration profiles.
+
+A profile is a :class:`CollectorConfig` saved as JSON, with its filter sets
+already parsed (sorted lists, not comma separated strings), so loading it
+restores the exact same filters without re-parsing or retyping anything.
+Profiles live in one folder, by default ``~/.config/aicontexter/profiles``
+(``$XDG_CONFIG_HOME`` and ``$AICONTEXTER_PROFILES_DIR`` are honoured).
+
+Per-run settings (``resume``, ``stats_path``, ``profile_path``) and the
+number of readers, which depends on the machine, are not saved.
+"""
+import json
+import os
+import re
+from dataclasses import fields, replace
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from .collector import CollectorConfig
+from .output import atomic_write_text
+
+PROFILES_DIR_ENV = "AICONTEXTER_PROFILES_DIR"
+PROFILE_VERSION = 1
+PROFILE_SUFFIX = ".json"
+
+_PER_RUN_FIELDS = {"resume", "stats_path", "profile_path", "workers"}
+_PATH_FIELDS = {"cache_path", "tree_index_path"}
+_NAME_RE = re.compile(r"^[\w.-]+$")
+
+
+def default_profiles_dir() -> Path:
+    if os.environ.get(PROFILES_DIR_ENV):
+        return Path(os.environ[PROFILES_DIR_ENV])
+    config_home = os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config"
+    return Path(config_home) / "aicontexter" / "profiles"
+
+
+def is_profile_file(name: str) -> bool:
+    """Whether ``name`` is a path to a profile file rather than the name of a saved profile."""
+    return name.endswith(PROFILE_SUFFIX) or os.sep in name or '/' in name
+
+
+def profile_path(name: str, profiles_dir: Optional[Path] = None) -> Path:
+    """File of the profile ``name``. A name ending in ``.json`` or containing a path separator is used as a path."""
+    if is_profile_file(name):
+        return Path(name)
+    if not _NAME_RE.match(name):
+        raise ValueError(f"Profile names may only contain letters, digits, '_', '-' and '.', not '{name}'")
+    return Path(profiles_dir or default_profiles_dir()) / (name + PROFILE_SUFFIX)
+
+
+def list_profiles(profiles_dir: Optional[Path] = None) -> List[str]:
+    profiles_dir = Path(profiles_dir or default_profiles_dir())
+    try:
+        return sorted(path.stem for path in profiles_dir.glob("*" + PROFILE_SUFFIX) if path.is_file())
+    except OSError:
+        return []
+
+
+def config_to_dict(config: CollectorConfig) -> dict:
+    """The profile-relevant settings of ``config`` as JSON-ready values."""
+    data = {}
+    for f in fields(CollectorConfig):
+        if f.name in _PER_RUN_FIELDS:
+            continue
+        value = getattr(config, f.name)
+        if isinstance(value, (set, frozenset)):
+            value = sorted(value)
+        elif isinstance(value, Path):
+            value = str(value)
+        data[f.name] = value
+    return data
+
+
+def config_from_dict(data: dict) -> CollectorConfig:
+    """Inverse of :func:`config_to_dict` (raises ValueError on unknown or invalid settings)."""
+    known = {f.name for f in fields(CollectorConfig)} - _PER_RUN_FIELDS
+    unknown = set(data) - known
+    if unknown:
+        raise ValueError(f"Unknown profile settings: {', '.join(sorted(unknown))}")
+    options = {key: Path(value) if key in _PATH_FIELDS and value else value for key, value in data.items()}
+    try:
+        return CollectorConfig(**options)
+    except TypeError as e:
+        raise ValueError(f"Invalid profile: {e}") from None
+
+
+def save_profile(name: str, config: CollectorConfig, profiles_dir: Optional[Path] = None) -> Path:
+    """Write ``config`` as the profile ``name``; returns the file written."""
+    path = profile_path(name, profiles_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(path, json.dumps({"version": PROFILE_VERSION, "config": config_to_dict(config)}, indent=2) + "\n")
+    return path
+
+
+def load_profile(name: str, profiles_dir: Optional[Path] = None) -> CollectorConfig:
+    """The configuration saved as ``name`` (raises ValueError if it is missing or invalid)."""
+    path = profile_path(name, profiles_dir)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        raise ValueError(f"No profile named '{name}' (looked for {path})") from None
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Could not read profile '{name}': {e}") from None
+    if not isinstance(data, dict) or data.get("version") != PROFILE_VERSION:
+        raise ValueError(f"Profile '{name}' was saved by an incompatible version")
+    return config_from_dict(data.get("config", {}))
+
+
+def delete_profile(name: str, profiles_dir: Optional[Path] = None):
+    profile_path(name, profiles_dir).unlink()
+
+
+def merge_config(base: CollectorConfig, override: CollectorConfig, names: Iterable[str]) -> CollectorConfig:
+    """``base`` with the settings ``names`` taken from ``override``.
+
+    Used to apply the options given on the command line on top of a profile:
+    an option given explicitly wins even when it repeats the built-in default.
+    """
+    return replace(base, **{name: getattr(override, name) for name in names})
@@ -0,0 +1,100 @@
+"""Offline relevance ranking of files against the task prompt (BM25).
+
+The prompt is split into terms (identifiers are split on ``snake_case`` and
+``camelCase`` boundaries). An inverted index maps each term to the files that
+contain it, with its frequency in the file's content and in its path. Files
+are then scored with BM25, path matches weighted higher than content matches.
+
+Terms are matched case-insensitively as substrings, so ``config`` also matches
+``configuration`` and ``parseConfig``: a cheap stand-in for stemming that
+suits source code.
+"""
+import math
+import re
+from typing import Dict, List, Tuple
+
+# Usual BM25 parameters
+K1 = 1.2
+B = 0.75
+# A term in the path (file or folder name) counts this much more than one in the content
+PATH_WEIGHT = 2.0
+MIN_TERM_LENGTH = 3
+
+STOPWORDS = frozenset("""
+a about after all also an and any are as at be because been but by can could did do does doing for from
+had has have how i if in into is it its just like make me more most my no not now of on only or other our
+out please should so some such than that the their them then there these they this those to too up use
+using very want was way we were what when where which while who why will with would you your
+add code change file files fix implement need new project update
+""".split())
+
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+
+def query_terms(text: str) -> List[str]:
+    """Distinct lowercase search terms of ``text``, in order of appearance."""
+    terms = []
+    for word in _WORD_RE.findall(text):
+        for part in [word] + _CAMEL_RE.findall(word):
+            term = part.lower()
+            if len(term) >= MIN_TERM_LENGTH and term not in STOPWORDS and term not in terms:
+                terms.append(term)
+    return terms
+
+
+class RelevanceIndex:
+    """Inverted index over the query terms: term -> [(document, content tf, path tf)].
+
+    Only the counts are kept, never the content, so indexing a large tree
+    needs memory per file, not per byte.
+    """
+
+    def __init__(self, terms: List[str]):
+        self.terms = list(terms)
+        self.postings: Dict[str, List[Tuple[int, int, int]]] = {term: [] for term in self.terms}
+        self._lengths: List[int] = []
+        self._path_lengths: List[int] = []
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def add(self, path: str, content) -> int:
+        """Index one document (``content`` may be None for unreadable files); returns its id."""
+        doc = len(self._lengths)
+        text = content.lower() if content else ""
+        path = path.lower()
+        for term in self.terms:
+            tf = text.count(term)
+            path_tf = path.count(term)
+            if tf or path_tf:
+                self.postings[term].append((doc, tf, path_tf))
+        self._lengths.append(len(text))
+        self._path_lengths.append(len(path))
+        return doc
+
+    def scores(self) -> List[float]:
+        count = len(self._lengths)
+        scores = [0.0] * count
+        if not count:
+            return scores
+        avg_length = sum(self._lengths) / count or 1
+        avg_path_length = sum(self._path_lengths) / count or 1
+        for postings in self.postings.values():
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc, tf, path_tf in postings:
+                score = 0.0
+                if tf:
+                    score += tf * (K1 + 1) / (tf + K1 * (1 - B + B * self._lengths[doc] / avg_length))
+                if path_tf:
+                    score += PATH_WEIGHT * path_tf * (K1 + 1) / (
+                        path_tf + K1 * (1 - B + B * self._path_lengths[doc] / avg_path_length))
+                scores[doc] += idf * score
+        return scores
+
+    def ranking(self) -> List[int]:
+        """Document ids, most relevant first; ties keep indexing order."""
+        scores = self.scores()
+        return sorted(range(len(scores)), key=lambda doc: -scores[doc])
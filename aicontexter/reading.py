@@ -0,0 +1,192 @@
+"""Reading files as text: one binary read, binary sniffing and decoding with fallbacks."""
+import codecs
+import hashlib
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .compaction import compact_text
+from .filters import file_extension
+
+# Only the start of the file is checked for the binary indicator
+BINARY_SNIFF_BYTES = 1024
+
+# Tried in order on the same buffer. cp1252 must come before latin-1:
+# latin-1 maps every byte and never fails, so anything after it is unreachable.
+ENCODINGS_TO_TRY = ('utf-8', 'cp1252', 'latin-1')
+
+OVERSIZE_MODES = ("skip", "truncate")
+DEFAULT_EXCERPT_BYTES = 32 * 1024
+
+
+@dataclass(frozen=True)
+class ReadLimits:
+    """Per-file size guardrail. Files over ``max_size`` bytes are skipped or cut to a head/tail excerpt."""
+    max_size: Optional[int] = None
+    mode: str = "skip" # One of OVERSIZE_MODES
+    excerpt_bytes: int = DEFAULT_EXCERPT_BYTES # Size of the head and of the tail kept by "truncate", at most half of max_size
+
+    def __post_init__(self):
+        if self.mode not in OVERSIZE_MODES:
+            raise ValueError(f"Oversize mode must be one of {', '.join(OVERSIZE_MODES)}, not '{self.mode}'")
+
+
+@dataclass
+class ReadResult:
+    """Outcome of reading one file. Exactly one of ``content``/``error`` is set."""
+    content: Optional[str] = None
+    error: Optional[str] = None
+    encoding: Optional[str] = None
+    size: int = 0 # Raw bytes read
+    decode_retries: int = 0 # Encodings that failed before one succeeded
+    binary: bool = False
+    cached: bool = False # Served from the incremental cache instead of read from disk
+    truncated: bool = False # Only a head/tail excerpt was read
+    too_large: bool = False # Skipped without reading because of the size limit
+    digest: Optional[str] = None # Hash of ``content``, only computed when deduplicating
+    compaction_saved: int = 0 # UTF-8 bytes compaction removed from ``content``
+    seconds: float = 0.0 # Time spent reading and decoding (0 for cache hits)
+
+
+def decode_bytes(data: bytes, result: ReadResult) -> ReadResult:
+    """Decode ``data`` into ``result`` using the first encoding that succeeds."""
+    if b'\0' in data[:BINARY_SNIFF_BYTES]:
+        result.error = "[Read Error: Could not read file as text (Reason: Contains null bytes (likely binary))]"
+        result.binary = True
+        return result
+
+    for enc in ENCODINGS_TO_TRY:
+        try:
+            content = data.decode(enc)
+        except UnicodeDecodeError:
+            result.decode_retries += 1
+            continue
+        # Match text-mode reading: universal newlines
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        result.content = content
+        result.encoding = enc
+        return result
+
+    # Unreachable while latin-1 is in the list, kept for custom encoding lists
+    result.error = f"[Read Error: Could not read file as text (Reason: Failed to decode with {', '.join(ENCODINGS_TO_TRY)})]"
+    return result
+
+
+def content_digest(content: str) -> str:
+    """Hash of decoded text, so files that produce the same output text share a digest."""
+    return hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+
+def format_bytes(size: int) -> str:
+    """Human readable byte count (e.g. '1.5 MB')."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def _decode_excerpt(head: bytes, tail: bytes, result: ReadResult):
+    """Decode a head/tail pair cut out of a larger file, tolerating characters split by the cut."""
+    # A multi-byte UTF-8 character may start before the tail: drop its continuation bytes
+    skip = 0
+    while skip < min(3, len(tail)) and 0x80 <= tail[skip] <= 0xBF:
+        skip += 1
+    for enc in ENCODINGS_TO_TRY:
+        try:
+            # Non-final decoding keeps a character split at the end of the head pending instead of failing
+            head_text = codecs.getincrementaldecoder(enc)().decode(head, final=False)
+            tail_text = (tail[skip:] if enc == 'utf-8' else tail).decode(enc)
+        except UnicodeDecodeError:
+            result.decode_retries += 1
+            continue
+        result.encoding = enc
+        return head_text, tail_text
+    return None
+
+
+def _read_excerpt(f, size: int, limits: ReadLimits, result: ReadResult) -> ReadResult:
+    """Read only the first and last ``limits.excerpt_bytes`` of an oversized file."""
+    # Head plus tail must fit within the cap, whatever the excerpt size; as size > max_size, they never overlap
+    excerpt = max(1, min(limits.excerpt_bytes, limits.max_size // 2))
+    head = f.read(excerpt)
+    if b'\0' in head[:BINARY_SNIFF_BYTES]:
+        result.size = len(head)
+        result.error = "[Read Error: Could not read file as text (Reason: Contains null bytes (likely binary))]"
+        result.binary = True
+        return result
+    f.seek(size - excerpt)
+    tail = f.read(excerpt)
+    result.size = len(head) + len(tail)
+
+    decoded = _decode_excerpt(head, tail, result)
+    if decoded is None:
+        result.error = f"[Read Error: Could not read file as text (Reason: Failed to decode with {', '.join(ENCODINGS_TO_TRY)})]"
+        return result
+    head_text, tail_text = decoded
+    # Cut at line boundaries so the excerpt does not start or end mid-line
+    if '\n' in head_text:
+        head_text = head_text[:head_text.rindex('\n') + 1]
+    if '\n' in tail_text:
+        tail_text = tail_text[tail_text.index('\n') + 1:]
+    omitted = size - len(head_text.encode(result.encoding, 'replace')) - len(tail_text.encode(result.encoding, 'replace'))
+    content = (f"{head_text}\n[... truncated: about {format_bytes(omitted)} of {format_bytes(size)} omitted, "
+               f"file exceeds the {format_bytes(limits.max_size)} size limit ...]\n\n{tail_text}")
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    result.content = content
+    result.truncated = True
+    return result
+
+
+def read_text_file(file_path: Path, limits: Optional[ReadLimits] = None, hash_content: bool = False,
+                   compaction: Optional[str] = None) -> ReadResult:
+    """Read ``file_path`` with a single binary read and decode it once.
+
+    With ``limits``, the size is checked with ``os.stat`` before opening:
+    oversized files are either not opened at all or only their head and tail
+    are read (by seeking), so memory stays bounded whatever the file size.
+    With ``hash_content``, the decoded text is also hashed here, in the reader,
+    so deduplication costs the writer nothing. ``compaction`` (see
+    :mod:`.compaction`) is applied here too, before hashing.
+    """
+    start = time.perf_counter()
+    result = _read_text_file(file_path, limits)
+    if compaction and result.content is not None:
+        compacted = compact_text(result.content, file_extension(os.path.basename(file_path)), compaction)
+        if compacted != result.content:
+            result.compaction_saved = (len(result.content.encode('utf-8', 'replace'))
+                                       - len(compacted.encode('utf-8', 'replace')))
+            result.content = compacted
+    if hash_content and result.content is not None:
+        result.digest = content_digest(result.content)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def _read_text_file(file_path: Path, limits: Optional[ReadLimits]) -> ReadResult:
+    result = ReadResult()
+    try:
+        if limits is not None and limits.max_size is not None:
+            size = os.stat(file_path).st_size
+            if size > limits.max_size:
+                if limits.mode == "skip":
+                    result.too_large = True
+                    result.error = (f"[Skipped: file is {format_bytes(size)}, over the "
+                                    f"{format_bytes(limits.max_size)} size limit]")
+                    return result
+                with open(file_path, 'rb') as f:
+                    return _read_excerpt(f, size, limits, result)
+        with open(file_path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        result.error = f"[Read Error: Could not read file as text (Reason: OS Error reading: {e})]"
+        return result
+    except Exception as e:
+        result.error = f"[Read Error: Could not read file as text (Reason: Unexpected Error reading: {type(e).__name__} - {e})]"
+        return result
+
+    result.size = len(data)
+    return decode_bytes(data, result)
@@ -0,0 +1,168 @@
+"""Splitting the output into numbered, size-bounded parts.
+
+With a part size (``split_tokens`` or ``split_bytes``), the collector hands
+each file's block to a :class:`PartWriter` instead of the output stream.
+Blocks are assigned to parts in order and a new part starts when the next
+block would not fit, so a file only spans parts when it is larger than a part
+on its own (the collector then cuts it at line boundaries). Once a part is
+assigned it is final: a small thread pool writes (and compresses) it while
+later parts fill up. At the end an index manifest lists the files of every
+part.
+
+``out.txt`` is split into ``out.part001.txt``, ``out.part002.txt``, ... and
+the index ``out.parts.json``.
+"""
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from .output import atomic_write_text, compression_for_path, open_output
+
+MANIFEST_SUFFIX = ".parts.json"
+MANIFEST_VERSION = 1
+# Parts written at the same time; also bounds how many assigned parts wait in memory
+PART_WRITERS = 4
+
+
+def split_output_name(output_path) -> Tuple[str, str]:
+    """``(base, suffix)`` of the output's file name: ``out.txt.gz`` -> ``('out', '.txt.gz')``."""
+    name = Path(output_path).name
+    suffix = Path(name).suffix
+    if compression_for_path(name):
+        suffix = Path(name[:-len(suffix)]).suffix + suffix
+    return name[:len(name) - len(suffix)], suffix
+
+
+def part_path(output_path, number: int) -> Path:
+    base, suffix = split_output_name(output_path)
+    return Path(output_path).with_name(f"{base}.part{number:03d}{suffix}")
+
+
+def part_pattern(output_path) -> Path:
+    """Glob matching every part of ``output_path`` (for keeping them out of the collection)."""
+    base, suffix = split_output_name(output_path)
+    return Path(output_path).with_name(f"{base}.part[0-9][0-9][0-9]*{suffix}")
+
+
+def manifest_path(output_path) -> Path:
+    return Path(output_path).with_name(split_output_name(output_path)[0] + MANIFEST_SUFFIX)
+
+
+@dataclass
+class Part:
+    number: int
+    path: Path
+    files: List[str] = field(default_factory=list) # Relative paths, '/' separated
+    blocks: List[str] = field(default_factory=list, repr=False) # Dropped once written
+    cost: int = 0 # Tokens or bytes of the blocks, whichever the split is measured in
+    size: int = 0 # Bytes on disk once written
+
+
+class PartWriter:
+    """Assigns blocks to parts of at most ``capacity`` and writes full parts in the background.
+
+    ``header_for(part)`` gives the text written before a part's blocks; its
+    cost must be left out of ``capacity`` by the caller. Writing errors are
+    raised from :meth:`add` or :meth:`close`.
+    """
+
+    def __init__(self, output_path: Path, capacity: int, compression: Optional[str] = None,
+                 header_for: Optional[Callable[[Part], str]] = None, writers: int = PART_WRITERS):
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, not {capacity}")
+        self.output_path = Path(output_path)
+        self.capacity = capacity
+        self.compression = compression
+        self._header_for = header_for
+        self.parts: List[Part] = []
+        self._current: Optional[Part] = None
+        self._pool = ThreadPoolExecutor(max_workers=max(1, writers), thread_name_prefix="aicontexter-part")
+        self._slots = threading.BoundedSemaphore(max(1, writers))
+        self._futures: List[Future] = []
+
+    def add(self, relative_path: str, block: str, cost: int):
+        """Append ``block`` to the current part, or to a new one if it would not fit."""
+        part = self._current
+        if part is not None and part.blocks and part.cost + cost > self.capacity:
+            self._seal(part)
+            part = None
+        if part is None:
+            part = self._current = Part(len(self.parts) + 1, part_path(self.output_path, len(self.parts) + 1))
+            self.parts.append(part)
+        relative_path = relative_path.replace(os.sep, '/')
+        if not part.files or part.files[-1] != relative_path:
+            part.files.append(relative_path)
+        part.blocks.append(block)
+        part.cost += cost
+
+    def _seal(self, part: Part, footer: str = ""):
+        """Hand ``part`` to the writers; waits while all of them are busy."""
+        self._check_failed()
+        self._slots.acquire()
+        header = self._header_for(part) if self._header_for is not None else ""
+        try:
+            future = self._pool.submit(self._write, part, header, footer)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+        self._current = None
+
+    def _write(self, part: Part, header: str, footer: str):
+        with open_output(part.path, self.compression) as f:
+            f.write(header)
+            for block in part.blocks:
+                f.write(block)
+            f.write(footer)
+        part.blocks = []
+        part.size = part.path.stat().st_size
+
+    def _check_failed(self):
+        for future in self._futures:
+            if future.done() and future.exception() is not None:
+                raise future.exception()
+
+    def close(self, footer_for: Optional[Callable[[int], str]] = None, complete: bool = True, source=None) -> Path:
+        """Write the last part (ending with ``footer_for(number of parts)``) and the index; returns the index path.
+
+        Parts left over from an earlier run with more parts are removed.
+        """
+        try:
+            if self._current is not None:
+                self._seal(self._current, footer_for(len(self.parts)) if footer_for is not None else "")
+            for future in self._futures:
+                future.result()
+        finally:
+            self._pool.shutdown()
+        number = len(self.parts) + 1
+        while part_path(self.output_path, number).exists():
+            part_path(self.output_path, number).unlink()
+            number += 1
+        return self._write_manifest(complete, source)
+
+    def abort(self):
+        """Stop after a failure: queued parts are dropped, no index is written."""
+        for future in self._futures:
+            future.cancel()
+        self._pool.shutdown()
+
+    def _write_manifest(self, complete: bool, source) -> Path:
+        path = manifest_path(self.output_path)
+        data = {
+            "version": MANIFEST_VERSION,
+            "source": str(Path(source).resolve()) if source is not None else None,
+            "complete": complete, # False when the run was cancelled
+            "parts": [{"part": part.number, "path": part.path.name, "files": part.files, "size": part.size}
+                      for part in self.parts],
+        }
+        atomic_write_text(path, json.dumps(data, indent=2) + "\n")
+        return path
+
+    @property
+    def bytes_written(self) -> int:
+        return sum(part.size for part in self.parts)
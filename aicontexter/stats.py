@@ -0,0 +1,148 @@
+"""Run statistics: time per phase, bytes, encodings and the slowest files.
+
+The phases of a collection overlap (scanning, reading and writing run at the
+same time), so each phase is timed where its work happens:
+
+- rank: the relevance ranking pass, which scans and reads everything once
+- scan: time inside the walker, filter checks included (scanner thread)
+- filter: the include/exclude checks alone
+- read: reading and decoding, summed over all reader threads
+- wait: the writer waiting for the next file to be read
+- format: building blocks, counting tokens, deduplication (writer)
+- write: writing to the output (writer)
+"""
+import heapq
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .output import sidecar_path
+from .reading import format_bytes
+
+# Environment variable naming a file to dump cProfile data to (same as --cprofile)
+PROFILE_ENV = "AICONTEXTER_PROFILE"
+SLOWEST_FILES = 10
+STATS_SUFFIX = ".stats.json"
+
+
+def default_stats_path(output_path: Path) -> Path:
+    """Sidecar statistics location for ``output_path`` (e.g. ``out.txt.stats.json``)."""
+    return sidecar_path(output_path, STATS_SUFFIX)
+
+
+@dataclass
+class CollectionStats:
+    wall_seconds: float = 0.0
+    count_seconds: float = 0.0 # The optional count-only pre-pass
+    rank_seconds: float = 0.0 # The relevance ranking pass (scan and read included)
+    scan_seconds: float = 0.0
+    filter_seconds: float = 0.0 # Only measured when the statistics are saved or the run is profiled
+    read_seconds: float = 0.0
+    wait_seconds: float = 0.0
+    format_seconds: float = 0.0
+    write_seconds: float = 0.0
+    files_read: int = 0
+    bytes_read: int = 0
+    bytes_written: Optional[int] = None # Size of the output file; None for stdout
+    decode_retries: int = 0
+    encodings: Counter = field(default_factory=Counter) # Encoding (or binary/error/cached) -> files
+    _slowest: List[Tuple[float, str]] = field(default_factory=list, repr=False)
+
+    def add_read(self, relative_path: str, read):
+        """Account for one file handed to the writer."""
+        self.files_read += 1
+        self.bytes_read += 0 if read.cached else read.size
+        self.decode_retries += read.decode_retries
+        if read.cached:
+            self.encodings["cached"] += 1
+        elif read.binary:
+            self.encodings["binary"] += 1
+        else:
+            self.encodings[read.encoding or "error"] += 1
+        self.read_seconds += read.seconds
+        # Min-heap of the slowest reads seen so far
+        if len(self._slowest) < SLOWEST_FILES:
+            heapq.heappush(self._slowest, (read.seconds, relative_path))
+        elif read.seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (read.seconds, relative_path))
+
+    @property
+    def slowest_files(self) -> List[Tuple[float, str]]:
+        return sorted(self._slowest, reverse=True)
+
+    def to_dict(self) -> Dict:
+        return {
+            "seconds": {
+                "wall": round(self.wall_seconds, 4),
+                "count": round(self.count_seconds, 4),
+                "rank": round(self.rank_seconds, 4),
+                "scan": round(self.scan_seconds, 4),
+                "filter": round(self.filter_seconds, 4),
+                "read": round(self.read_seconds, 4),
+                "wait": round(self.wait_seconds, 4),
+                "format": round(self.format_seconds, 4),
+                "write": round(self.write_seconds, 4),
+            },
+            "files_read": self.files_read,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "decode_retries": self.decode_retries,
+            "encodings": dict(self.encodings.most_common()),
+            "slowest_files": [{"path": path, "seconds": round(seconds, 4)} for seconds, path in self.slowest_files],
+        }
+
+    def save(self, path: Path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write("\n")
+
+    def summary_lines(self, slowest: int = 3) -> List[str]:
+        """Short human readable report for the completion message."""
+        lines = [f"Time: {self.wall_seconds:.2f} s ("
+                 + (f"ranking {self.rank_seconds:.2f} s, " if self.rank_seconds else "")
+                 + f"scan {self.scan_seconds:.2f} s"
+                 + (f" incl. filter {self.filter_seconds:.2f} s" if self.filter_seconds else "") + ", "
+                 f"read {self.read_seconds:.2f} s across readers, write {self.write_seconds:.2f} s)"]
+        throughput = format_bytes(int(self.bytes_read / self.wall_seconds)) + "/s" if self.wall_seconds else "-"
+        lines.append(f"Read {format_bytes(self.bytes_read)} ({throughput})"
+                     + (f", wrote {format_bytes(self.bytes_written)}" if self.bytes_written is not None else ""))
+        if self.encodings:
+            lines.append("Encodings: " + ", ".join(f"{name} {count}" for name, count in self.encodings.most_common())
+                         + (f"; {self.decode_retries} decode retries" if self.decode_retries else ""))
+        if slowest and self._slowest:
+            lines.append("Slowest: " + ", ".join(f"{path} ({seconds * 1000:.0f} ms)"
+                                                 for seconds, path in self.slowest_files[:slowest]))
+        return lines
+
+
+class TimedFilter:
+    """Wraps filter rules so the time spent in ``matches`` is added to ``stats.filter_seconds``."""
+    __slots__ = ("_matches", "_stats")
+
+    def __init__(self, rules, stats: CollectionStats):
+        self._matches = rules.matches
+        self._stats = stats
+
+    def matches(self, name: str) -> bool:
+        start = time.perf_counter()
+        try:
+            return self._matches(name)
+        finally:
+            self._stats.filter_seconds += time.perf_counter() - start
+
+
+def timed_iter(iterable, stats: CollectionStats, attribute: str):
+    """Yield from ``iterable``, adding the time spent producing each item to ``stats.<attribute>``."""
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            setattr(stats, attribute, getattr(stats, attribute) + time.perf_counter() - start)
+        yield item
@@ -0,0 +1,121 @@
+"""Token estimation and the per-file/per-directory token summary."""
+import os
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+Tokenizer = Callable[[str], int]
+
+# Rough average for source code and English text with BPE tokenizers
+CHARS_PER_TOKEN = 4
+# Stand-in for the counts no budget bounds (files and tokens left out) when sizing the summary table
+WIDEST_COUNT = 10 ** 15 - 1
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast offline estimate: about one token per four characters."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _tiktoken_tokenizer(encoding_name: str = "cl100k_base") -> Tokenizer:
+    import tiktoken # Optional dependency, only needed for exact counts
+    encoding = tiktoken.get_encoding(encoding_name)
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+TOKENIZERS = {
+    "heuristic": lambda: estimate_tokens,
+    "tiktoken": _tiktoken_tokenizer,
+}
+
+
+def get_tokenizer(name: str = "heuristic") -> Tokenizer:
+    """Return the tokenizer registered as ``name`` (raises ValueError for unknown or unavailable ones)."""
+    try:
+        factory = TOKENIZERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown tokenizer '{name}' (available: {', '.join(sorted(TOKENIZERS))})") from None
+    try:
+        return factory()
+    except ImportError as e:
+        raise ValueError(f"Tokenizer '{name}' is not available: {e}") from None
+
+
+class TokenSummary:
+    """Tokens per collected file, rolled up per directory, plus files left out by the budget.
+
+    With a budget, ``limit`` bounds every count in the table: the token column
+    then has a fixed width, so :meth:`added_rows` and :meth:`skeleton` tell
+    up front how much the table can grow and the budget can account for it.
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        self.files: List[Tuple[str, int]] = []
+        self.omitted: List[Tuple[str, int]] = []
+        self.omitted_files = 0
+        self.omitted_tokens = 0
+        self.dirs: Dict[str, int] = defaultdict(int)
+        self.total_tokens = 0
+        self.limit = limit
+        self.width = len(f"{limit:,}") if limit else 0 # Minimum width of the token column
+
+    def add(self, relative_path: str, tokens: int):
+        self.files.append((relative_path, tokens))
+        self.total_tokens += tokens
+        parent = os.path.dirname(relative_path)
+        while parent:
+            self.dirs[parent] += tokens
+            parent = os.path.dirname(parent)
+
+    def omit(self, relative_path: str, tokens: int, listed: bool = True):
+        """Count a file left out by the budget; ``listed=False`` leaves its row out too (no room left for it)."""
+        self.omitted_files += 1
+        self.omitted_tokens += tokens
+        if listed:
+            self.omitted.append((relative_path, tokens))
+
+    def added_rows(self, relative_path: str, tokens: int) -> str:
+        """The rows :meth:`add` puts into the table: the file's, and those of directories new to the table."""
+        rows = [self._row(tokens, relative_path)]
+        parent = os.path.dirname(relative_path)
+        while parent and parent not in self.dirs:
+            # A directory total only grows, up to the limit
+            rows.append(self._row(self.limit or tokens, parent + os.sep))
+            parent = os.path.dirname(parent)
+        return "".join(rows)
+
+    def omitted_row(self, relative_path: str, tokens: int) -> str:
+        return self._row(tokens, relative_path)
+
+    def skeleton(self, budget_note: Optional[str] = None) -> str:
+        """The lines of the table other than the rows, with every count at the limit."""
+        widest = self.limit or 0
+        return (self._headline(widest, widest, budget_note) + "Directories:\nFiles:\n"
+                + self._omitted_headline(WIDEST_COUNT, WIDEST_COUNT, WIDEST_COUNT))
+
+    def render(self, budget_note: Optional[str] = None) -> str:
+        """Plain-text table for the output header."""
+        width = max([len(f"{tokens:,}") for _, tokens in self.files] + [len(f"{self.total_tokens:,}"), self.width])
+        lines = [self._headline(self.total_tokens, len(self.files), budget_note)]
+        if self.dirs:
+            lines.append("Directories:\n")
+            lines.extend(self._row(tokens, f"{path}{os.sep}", width) for path, tokens in sorted(self.dirs.items()))
+        lines.append("Files:\n")
+        lines.extend(self._row(tokens, path, width) for path, tokens in self.files)
+        if self.omitted_files:
+            lines.append(self._omitted_headline(self.omitted_files, self.omitted_tokens,
+                                                self.omitted_files - len(self.omitted)))
+            lines.extend(self._row(tokens, path, width) for path, tokens in self.omitted)
+        return "".join(lines)
+
+    def _row(self, tokens: int, path: str, width: Optional[int] = None) -> str:
+        return f"  {tokens:>{self.width if width is None else width},}  {path}\n"
+
+    @staticmethod
+    def _headline(total_tokens: int, file_count: int, budget_note: Optional[str]) -> str:
+        return (f"Token Summary (estimated): {total_tokens:,} tokens in {file_count} files, header not included"
+                + (f", {budget_note}" if budget_note else "") + "\n")
+
+    @staticmethod
+    def _omitted_headline(file_count: int, tokens: int, unlisted: int) -> str:
+        return (f"Omitted (over budget): {file_count} files, {tokens:,} tokens"
+                + (f" ({unlisted} not listed, over the budget)" if unlisted else "") + "\n")
@@ -0,0 +1,161 @@
+"""Persistent index of a source tree's directory listings.
+
+Walking a large tree lists every directory again on each run. The index keeps
+each directory's sorted listing with stat info, keyed on the directory's
+modification time. Adding, removing or renaming an entry changes the mtime of
+its directory, so a later walk needs one ``stat`` per directory: only
+directories whose mtime changed are listed again.
+
+Editing a file in place does not change its directory's mtime. The stored size
+and mtime of such a file are stale until its directory changes. Contents are
+always read fresh, and the cache stats files itself, so this only affects the
+listing.
+
+A directory changed within :data:`RACY_WINDOW_NS` before it was listed is
+listed again next time. A coarse filesystem clock could otherwise hide a change
+made in the same tick as the listing.
+
+The index can be kept in memory between runs (the GUI does) and saved to a
+JSON file (``--tree-index``). It is not thread-safe: one walk at a time.
+"""
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .output import TMP_SUFFIX, atomic_write_text, sidecar_path
+
+# Bump when the stored layout changes
+TREE_INDEX_VERSION = 1
+# Directories modified this close to their listing are not trusted
+RACY_WINDOW_NS = 2_000_000_000
+
+# (name, is_dir, is_symlink, size, mtime_ns, st_dev, st_ino)
+Row = Tuple[str, bool, bool, Optional[int], Optional[int], int, int]
+
+
+def tree_index_files(path: Path):
+    """The index file plus the temporary file used to replace it atomically."""
+    return [Path(path), sidecar_path(path, TMP_SUFFIX)]
+
+
+class _EntryStat:
+    """The parts of ``os.stat_result`` the walker uses."""
+    __slots__ = ("st_size", "st_mtime_ns", "st_dev", "st_ino")
+
+    def __init__(self, row: Row):
+        _, _, _, self.st_size, self.st_mtime_ns, self.st_dev, self.st_ino = row
+
+
+class IndexedEntry:
+    """Stand-in for ``os.DirEntry`` served from the index."""
+    __slots__ = ("_dir_path", "_row")
+
+    def __init__(self, dir_path: str, row: Row):
+        self._dir_path = dir_path
+        self._row = row
+
+    @property
+    def name(self) -> str:
+        return self._row[0]
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self._dir_path, self._row[0])
+
+    def is_dir(self) -> bool:
+        return self._row[1]
+
+    def is_symlink(self) -> bool:
+        return self._row[2]
+
+    def stat(self, follow_symlinks: bool = True) -> _EntryStat:
+        return _EntryStat(self._row)
+
+
+def _row(entry: os.DirEntry) -> Row:
+    try:
+        is_dir = entry.is_dir()
+    except OSError:
+        is_dir = False
+    is_symlink = entry.is_symlink()
+    try:
+        st = entry.stat(follow_symlinks=False)
+        dev, ino = st.st_dev, st.st_ino
+        if is_symlink:
+            st = entry.stat() # Size and mtime of the target
+        return entry.name, is_dir, is_symlink, st.st_size, st.st_mtime_ns, dev, ino
+    except OSError:
+        return entry.name, is_dir, is_symlink, None, None, 0, 0
+
+
+class TreeIndex:
+    """Directory listings of one source tree, refreshed by directory mtime."""
+
+    def __init__(self, root):
+        self.root = str(Path(root).resolve())
+        # Relative directory prefix ("" or "a/b/" with OS separators) -> (mtime_ns, st_ino, listed_ns, rows)
+        self._dirs: Dict[str, tuple] = {}
+        self.listed_dirs = 0 # Directories listed from disk
+        self.reused_dirs = 0 # Directories served from the index
+        self.dirty = False # Changed since loaded or saved
+
+    def __len__(self):
+        return len(self._dirs)
+
+    def entries(self, dir_path: str, prefix: str) -> List[IndexedEntry]:
+        """Sorted entries of ``dir_path`` (``prefix`` relative to the root), listed again only if it changed.
+
+        Raises OSError like ``os.scandir`` when the directory cannot be read.
+        """
+        st = os.stat(dir_path)
+        cached = self._dirs.get(prefix)
+        if (cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_ino
+                and cached[0] < cached[2] - RACY_WINDOW_NS):
+            self.reused_dirs += 1
+            rows = cached[3]
+        else:
+            rows = self._list(dir_path, prefix, st, cached)
+        return [IndexedEntry(dir_path, row) for row in rows]
+
+    def _list(self, dir_path: str, prefix: str, st: os.stat_result, cached: Optional[tuple]) -> List[Row]:
+        listed_ns = time.time_ns() # Taken before listing, so changes made meanwhile count as racy
+        with os.scandir(dir_path) as it:
+            rows = [_row(entry) for entry in sorted(it, key=lambda e: e.name)]
+        if cached is not None:
+            # Forget the subtrees of folders that are gone
+            subdirs = {row[0] for row in rows if row[1]}
+            for row in cached[3]:
+                if row[1] and row[0] not in subdirs:
+                    self._forget(prefix + row[0] + os.sep)
+        self._dirs[prefix] = (st.st_mtime_ns, st.st_ino, listed_ns, rows)
+        self.listed_dirs += 1
+        self.dirty = True
+        return rows
+
+    def _forget(self, prefix: str):
+        for key in [key for key in self._dirs if key.startswith(prefix)]:
+            del self._dirs[key]
+
+    def save(self, path: Path):
+        """Write atomically as JSON."""
+        data = {"version": TREE_INDEX_VERSION, "root": self.root,
+                "dirs": {prefix: list(cached) for prefix, cached in self._dirs.items()}}
+        atomic_write_text(path, json.dumps(data, separators=(',', ':')))
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: Path, root) -> "TreeIndex":
+        """The index saved at ``path`` for ``root``; an empty one if missing, unreadable or for another tree."""
+        index = cls(root)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != TREE_INDEX_VERSION or data.get("root") != index.root:
+                return index
+            index._dirs = {prefix: (mtime_ns, ino, listed_ns, [tuple(row) for row in rows])
+                           for prefix, (mtime_ns, ino, listed_ns, rows) in data["dirs"].items()}
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            index._dirs = {}
+        return index
@@ -0,0 +1,181 @@
+"""Directory walker built on ``os.scandir``.
+
+Works on plain strings and ``DirEntry`` objects: no ``Path`` is created per
+file and the only per-file work is the filter check. Output is in the same
+order as a sorted top-down ``os.walk``: a directory's files first, then its
+subdirectories, each sorted by name.
+"""
+import fnmatch
+import os
+import sys
+from typing import Iterable, NamedTuple, Optional
+
+from .filters import FilterRules, file_extension
+from .ignore import is_ignored, load_ignore_rules, root_ignore_rules
+
+
+class ScannedFile(NamedTuple):
+    path: str # Path as given to the walker joined with the relative path
+    relative_path: str # Relative to the walk root, OS separators
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.relative_path)
+
+    @property
+    def extension(self) -> str:
+        return file_extension(self.name)
+
+
+class WalkStats:
+    """Counters filled in while walking."""
+    __slots__ = ("scanned_dirs", "skipped_dirs", "ignored_paths")
+
+    def __init__(self):
+        self.scanned_dirs = 0
+        self.skipped_dirs = 0
+        self.ignored_paths = 0 # Files and folders matched by .gitignore/.ignore rules
+
+
+def _file_identity(path: str) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_dev, st.st_ino
+
+
+class _OwnNames(set):
+    """Normalised file names of one directory, plus ``fnmatch`` patterns also counted as members."""
+
+    def __init__(self):
+        super().__init__()
+        self.patterns = []
+
+    def __contains__(self, name):
+        return set.__contains__(self, name) or any(fnmatch.fnmatchcase(name, p) for p in self.patterns)
+
+
+class OwnFiles:
+    """Files that must never be collected (the output itself, caches, ...).
+
+    Instead of comparing every file's absolute path, the parent directories of
+    these files are identified by (device, inode) once. While walking, only a
+    directory whose inode matches gets its file names compared. ``patterns``
+    are paths whose last component is a glob, for files whose exact names are
+    not known up front (the numbered parts of a split output).
+    """
+
+    def __init__(self, paths: Iterable[os.PathLike], patterns: Iterable[os.PathLike] = ()):
+        self._by_dir = {}
+        for path in paths:
+            names = self._names_for(path)
+            if names is not None:
+                names.add(os.path.normcase(os.path.basename(os.path.abspath(os.fspath(path)))))
+        for pattern in patterns:
+            names = self._names_for(pattern)
+            if names is not None:
+                names.patterns.append(os.path.normcase(os.path.basename(os.path.abspath(os.fspath(pattern)))))
+
+    def _names_for(self, path) -> Optional[_OwnNames]:
+        parent = _file_identity(os.path.dirname(os.path.abspath(os.fspath(path))))
+        return self._by_dir.setdefault(parent, _OwnNames()) if parent is not None else None
+
+    def names_in(self, dir_identity: Optional[tuple]):
+        """File names to skip in the directory with this (device, inode), or None."""
+        if not self._by_dir or dir_identity is None:
+            return None
+        return self._by_dir.get(dir_identity)
+
+
+def walk_order_key(relative_path: str) -> tuple:
+    """Sort key reproducing the walker's output order for a relative file path.
+
+    Files come before the subdirectories of the same folder, so every folder
+    component sorts as ``(1, name)`` and the file name as ``(0, name)``.
+    """
+    *dirs, name = relative_path.split(os.sep)
+    return tuple((1, d) for d in dirs) + ((0, name),)
+
+
+def walk_files(root, rules: FilterRules, skip_dirs, own_files: Optional[OwnFiles] = None,
+               stats: Optional[WalkStats] = None, use_ignore_files: bool = False, cancel=None, index=None,
+               excluded_paths=None):
+    """Yield a :class:`ScannedFile` for every file below ``root`` accepted by ``rules``.
+
+    ``skip_dirs`` holds lowercase directory names that are never entered.
+    Symlinked directories are not followed, like ``os.walk``'s default.
+    With ``use_ignore_files``, ``.gitignore``/``.ignore`` files are compiled
+    as their folder is entered and ignored folders are pruned before descending.
+    ``cancel`` is an optional ``threading.Event``; the walk stops at the next
+    folder once it is set. ``index`` is an optional ``treeindex.TreeIndex``
+    for ``root``; directories unchanged since it listed them are not listed again.
+    ``excluded_paths`` holds relative paths ('/' separated) of folders and
+    files to leave out; excluded folders are never entered.
+    """
+    root = os.fspath(root)
+    stats = stats if stats is not None else WalkStats()
+    matches = rules.matches
+    track_identity = own_files is not None
+    posix_paths = os.sep == '/'
+    root_chain = tuple(root_ignore_rules(root)) if use_ignore_files else ()
+    # (directory path, relative prefix, directory identity, ignore rules in effect)
+    stack = [(root, "", _file_identity(root) if track_identity else None, root_chain)]
+    while stack:
+        if cancel is not None and cancel.is_set():
+            return
+        dir_path, prefix, dir_identity, ignore_chain = stack.pop()
+        stats.scanned_dirs += 1
+        try:
+            if index is not None:
+                entries = index.entries(dir_path, prefix)
+            else:
+                with os.scandir(dir_path) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            # Never stdout: it may be the output stream (-o -)
+            print(f"Warning: Could not list directory '{dir_path}': {e}", file=sys.stderr)
+            continue
+
+        posix_prefix = prefix if posix_paths else prefix.replace(os.sep, '/')
+        if use_ignore_files:
+            # Compiled once per folder level and inherited by the whole subtree
+            ignore_chain = ignore_chain + tuple(load_ignore_rules(dir_path, posix_prefix, {e.name for e in entries}))
+
+        own_names = own_files.names_in(dir_identity) if own_files is not None else None
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if name.lower() in skip_dirs or (excluded_paths and posix_prefix + name in excluded_paths):
+                    stats.skipped_dirs += 1
+                elif ignore_chain and is_ignored(ignore_chain, posix_prefix + name, True):
+                    stats.ignored_paths += 1
+                elif not entry.is_symlink():
+                    subdirs.append(entry)
+                continue
+            if own_names is not None and os.path.normcase(name) in own_names:
+                continue
+            if excluded_paths and posix_prefix + name in excluded_paths:
+                continue
+            if matches(name):
+                if ignore_chain and is_ignored(ignore_chain, posix_prefix + name, False):
+                    stats.ignored_paths += 1
+                    continue
+                yield ScannedFile(entry.path, prefix + name)
+
+        # Push in reverse so the smallest name is visited first
+        for entry in reversed(subdirs):
+            identity = None
+            if track_identity:
+                # One stat per directory (not per file) to identify the output's folder
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                    identity = (st.st_dev, st.st_ino)
+                except OSError:
+                    pass
+            stack.append((entry.path, prefix + entry.name + os.sep, identity, ignore_chain))
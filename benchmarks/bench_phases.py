@@ -0,0 +1,140 @@
+"""Benchmark: scan, filter, read and write phases timed separately, reported as JSON.
+
+Generates a synthetic repository (see synthrepo.py) or uses --source, then
+times each phase of a collection on its own plus one end-to-end run:
+
+- scan:   walking the tree (skip-dirs and ignore files applied, every name kept)
+- filter: include/exclude checks on the scanned names
+- read:   reading and decoding the filtered files with the reader pool
+- write:  formatting the blocks and writing the output file
+
+Every phase reports files/s and MB/s; peak RSS is sampled after each phase.
+
+    python benchmarks/bench_phases.py --shape wide --files 50000 --json results.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from aicontexter.collector import SEPARATOR, CollectorConfig, FileCollector # noqa: E402
+from aicontexter.filters import FilterRules # noqa: E402
+from aicontexter.walker import OwnFiles, walk_files # noqa: E402
+from synthrepo import SHAPES, RepoSpec, make_repo # noqa: E402
+
+MB = 1024 * 1024
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, or None where unavailable (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (MB if sys.platform == "darwin" else 1024), 1)
+
+
+def phase_report(seconds, files, size=None):
+    report = {"seconds": round(seconds, 4), "files": files,
+              "files_per_s": round(files / seconds) if seconds else None}
+    if size is not None:
+        report["mb"] = round(size / MB, 2)
+        report["mb_per_s"] = round(size / MB / seconds, 1) if seconds else None
+    report["peak_rss_mb"] = peak_rss_mb()
+    return report
+
+
+def run_phases(source: Path, output: Path, config: CollectorConfig) -> dict:
+    phases = {}
+
+    start = time.perf_counter()
+    everything = FilterRules(True, set(), set())
+    scanned = list(walk_files(source, everything, config.skip_dirs, OwnFiles([output]),
+                              use_ignore_files=config.use_gitignore))
+    phases["scan"] = phase_report(time.perf_counter() - start, len(scanned))
+
+    start = time.perf_counter()
+    matches = config.compile_filters().matches
+    kept = [scanned_file for scanned_file in scanned if matches(scanned_file.name)]
+    phases["filter"] = phase_report(time.perf_counter() - start, len(scanned))
+    phases["filter"]["kept"] = len(kept)
+
+    collector = FileCollector(config)
+    start = time.perf_counter()
+    reads = list(collector.read_files(kept))
+    bytes_read = sum(read.size for _, read in reads)
+    phases["read"] = phase_report(time.perf_counter() - start, len(reads), bytes_read)
+    phases["read"]["decode_retries"] = sum(read.decode_retries for _, read in reads)
+    phases["read"]["binary"] = sum(1 for _, read in reads if read.binary)
+
+    start = time.perf_counter()
+    with open(output, 'w', encoding='utf-8', errors='replace') as out_file:
+        out_file.write(collector._format_header(source, len(reads)) + SEPARATOR + "\n\n")
+        for scanned_file, read in reads:
+            out_file.write(collector._format_block(scanned_file, read))
+    phases["write"] = phase_report(time.perf_counter() - start, len(reads), output.stat().st_size)
+    del reads
+
+    start = time.perf_counter()
+    result = collector.collect(source, output)
+    phases["end_to_end"] = phase_report(time.perf_counter() - start, result.processed_files, output.stat().st_size)
+    return phases
+
+
+def best_of(runs, func, *args) -> dict:
+    """Run ``func`` ``runs`` times and keep each phase's fastest run."""
+    best = {}
+    for _ in range(runs):
+        for name, report in func(*args).items():
+            if name not in best or report["seconds"] < best[name]["seconds"]:
+                best[name] = report
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", help="Existing folder to benchmark instead of a synthetic tree")
+    parser.add_argument("--shape", choices=sorted(SHAPES), default="balanced", help="Synthetic tree shape")
+    parser.add_argument("--files", type=int, default=RepoSpec.files, help="Synthetic tree size")
+    parser.add_argument("--huge-files", type=int, default=RepoSpec.huge_files)
+    parser.add_argument("--huge-mb", type=int, default=RepoSpec.huge_size // MB)
+    parser.add_argument("--skip-dir-files", type=int, default=RepoSpec.skip_dir_files)
+    parser.add_argument("-j", "--workers", type=int, default=CollectorConfig.workers, help="Parallel readers")
+    parser.add_argument("--processes", action="store_true", help="Read in worker processes")
+    parser.add_argument("--runs", type=int, default=3, help="Best of N runs per phase (default: 3)")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="aicontexter-bench-") as tmp:
+        report = {"python": sys.version.split()[0], "cpus": os.cpu_count(),
+                  "workers": args.workers, "processes": args.processes}
+        if args.source:
+            source = Path(args.source)
+            report["source"] = str(source.resolve())
+        else:
+            source = Path(tmp) / "repo"
+            spec = RepoSpec(files=args.files, shape=args.shape, huge_files=args.huge_files,
+                            huge_size=args.huge_mb * MB, skip_dir_files=args.skip_dir_files)
+            start = time.perf_counter()
+            report["synthetic"] = {"shape": args.shape, **make_repo(source, spec),
+                                   "generate_seconds": round(time.perf_counter() - start, 2)}
+        config = CollectorConfig(workers=args.workers, use_processes=args.processes)
+        report["phases"] = best_of(args.runs, run_phases, source, Path(tmp) / "out.txt", config)
+        report["peak_rss_mb"] = peak_rss_mb()
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.json:
+        Path(args.json).write_text(text + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
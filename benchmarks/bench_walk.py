@@ -0,0 +1,94 @@
+"""Benchmark: file discovery with the scandir walker vs the original os.walk + Path loop.
+
+Builds a synthetic tree (or uses --source) and reports files per second for
+the scan-and-filter stage only; nothing is read.
+
+    python benchmarks/bench_walk.py --files 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aicontexter.collector import CollectorConfig # noqa: E402
+from aicontexter.walker import OwnFiles, walk_files # noqa: E402
+
+EXTENSIONS = ("py", "js", "css", "md", "txt", "png", "json", "lock", "")
+
+
+def make_tree(root: Path, files: int, per_dir: int = 50):
+    """Create ``files`` empty files, ``per_dir`` per directory, two levels deep."""
+    for i in range(files):
+        d = root / f"pkg{i // (per_dir * 20)}" / f"mod{(i // per_dir) % 20}"
+        if i % per_dir == 0:
+            d.mkdir(parents=True, exist_ok=True)
+        ext = EXTENSIONS[i % len(EXTENSIONS)]
+        (d / (f"file{i}.{ext}" if ext else f"FILE{i}")).touch()
+    (root / "node_modules" / "dep").mkdir(parents=True)
+    (root / "node_modules" / "dep" / "index.js").touch()
+
+
+def legacy_scan(source_path: Path, output_path: Path, config: CollectorConfig):
+    """The pre-scandir discovery loop: Path per file, absolute() per file, Path-based filter."""
+    resolved_output_path = output_path.absolute()
+    found = []
+    for root, dirs, files in os.walk(source_path, topdown=True):
+        current_root_path = Path(root)
+        dirs[:] = sorted(d for d in dirs if d.lower() not in config.skip_dirs)
+        for filename in sorted(files):
+            file_path = current_root_path / filename
+            if file_path.absolute() == resolved_output_path:
+                continue
+            file_name_lower = file_path.name.lower()
+            extension_lower = file_path.suffix[1:].lower() if file_path.suffix else ""
+            if file_name_lower in config.exclude_entries:
+                continue
+            if extension_lower and extension_lower in config.exclude_entries:
+                continue
+            if config.use_all_files or (extension_lower and extension_lower in config.include_extensions):
+                found.append(file_path)
+    return len(found)
+
+
+def scandir_scan(source_path: Path, output_path: Path, config: CollectorConfig):
+    return sum(1 for _ in walk_files(source_path, config.compile_filters(), config.skip_dirs, OwnFiles([output_path])))
+
+
+def best_of(runs, func, *args):
+    best, count = None, 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        count = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", help="Existing folder to scan instead of a synthetic tree")
+    parser.add_argument("--files", type=int, default=50000, help="Synthetic tree size (default: 50000)")
+    parser.add_argument("--runs", type=int, default=3, help="Best of N runs (default: 3)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="aicontexter-bench-") as tmp:
+        source = Path(args.source) if args.source else Path(tmp) / "tree"
+        if not args.source:
+            make_tree(source, args.files)
+        output = Path(tmp) / "out.txt"
+        config = CollectorConfig()
+
+        results = {}
+        for label, func in (("os.walk + Path", legacy_scan), ("scandir walker", scandir_scan)):
+            elapsed, count = best_of(args.runs, func, source, output, config)
+            results[label] = elapsed
+            print(f"{label:16} {count:8d} files  {elapsed:7.3f} s  {count / elapsed:12,.0f} files/s")
+        print(f"speedup          {results['os.walk + Path'] / results['scandir walker']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
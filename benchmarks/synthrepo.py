@@ -0,0 +1,155 @@
+"""Synthetic repository generator for the benchmarks.
+
+Creates a deterministic tree with a configurable shape: directory depth and
+fan-out, many tiny source files, a few huge logs, files in mixed encodings,
+binaries (with and without excluded extensions) and skip-dirs such as
+``node_modules`` and ``.git``.
+
+    python benchmarks/synthrepo.py /tmp/repo --shape deep --files 20000
+"""
+import argparse
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+# (depth, fan-out): deep trees are narrow, wide trees are shallow
+SHAPES = {
+    "balanced": (3, 8),
+    "deep": (12, 2),
+    "wide": (1, 400),
+}
+
+_WORDS = ("def", "return", "self", "value", "config", "path", "result", "items", "update", "import")
+_NON_ASCII = "é ü ß ñ ø € “quoted” — 日本語"
+
+
+@dataclass
+class RepoSpec:
+    files: int = 20000 # Regular files outside skip-dirs
+    shape: str = "balanced"
+    tiny_ratio: float = 0.7 # Share of files under 256 bytes
+    huge_files: int = 2
+    huge_size: int = 16 * 1024 * 1024
+    binary_ratio: float = 0.03
+    mixed_encoding_ratio: float = 0.05 # cp1252 and latin-1-only files, which need decode retries
+    skip_dir_files: int = 2000 # Files inside node_modules/.git that must never be read
+    seed: int = 0
+
+
+def _corpus(rng: random.Random, size: int) -> str:
+    lines = []
+    length = 0
+    while length < size:
+        line = "    " * rng.randrange(3) + " ".join(rng.choice(_WORDS) for _ in range(rng.randrange(2, 10)))
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)
+
+
+class _TextSource:
+    """Code-like text cut from one pre-generated corpus, so generating large trees stays fast."""
+
+    def __init__(self, rng: random.Random, corpus_size: int = 1024 * 1024):
+        self.rng = rng
+        self.corpus = _corpus(rng, corpus_size)
+
+    def text(self, size: int) -> str:
+        size = min(size, len(self.corpus))
+        start = self.rng.randrange(len(self.corpus) - size + 1)
+        return self.corpus[start:start + size] + "\n"
+
+
+def _directories(root: Path, depth: int, fanout: int, limit: int):
+    """Breadth-first list of up to ``limit`` directories below ``root``."""
+    dirs = [root]
+    frontier = [root]
+    for level in range(depth):
+        next_frontier = []
+        for parent in frontier:
+            for i in range(fanout):
+                if len(dirs) >= limit:
+                    return dirs
+                child = parent / f"d{level}_{i}"
+                dirs.append(child)
+                next_frontier.append(child)
+        frontier = next_frontier
+    return dirs
+
+
+def _file_size(rng: random.Random, spec: RepoSpec) -> int:
+    if rng.random() < spec.tiny_ratio:
+        return rng.randrange(0, 256)
+    return rng.choice((1024, 4096, 16384, 65536))
+
+
+def make_repo(root, spec: Optional[RepoSpec] = None) -> dict:
+    """Write the tree described by ``spec`` below ``root``; returns counts per kind."""
+    spec = spec or RepoSpec()
+    root = Path(root)
+    rng = random.Random(spec.seed)
+    source = _TextSource(rng)
+    depth, fanout = SHAPES[spec.shape]
+    dirs = _directories(root, depth, fanout, limit=max(1, spec.files // 10))
+    for d in dirs:
+        d.mkdir(parents=True, exist_ok=True)
+
+    counts = {"text": 0, "mixed_encoding": 0, "binary": 0, "huge": 0, "skip_dir": 0, "bytes": 0}
+    for i in range(spec.files):
+        d = dirs[i % len(dirs)]
+        roll = rng.random()
+        if roll < spec.binary_ratio:
+            # Half with an excluded extension (filtered by name), half only recognisable by content
+            name = f"blob{i}.png" if i % 2 else f"blob{i}.dat"
+            data = b"\x7fBIN\0" + rng.randbytes(rng.randrange(64, 4096))
+            counts["binary"] += 1
+        elif roll < spec.binary_ratio + spec.mixed_encoding_ratio:
+            name = f"legacy{i}.txt"
+            text = source.text(_file_size(rng, spec)) + _NON_ASCII + "\n"
+            # cp1252 for the smart quotes, latin-1 bytes that cp1252 rejects for the rest
+            data = text.encode("cp1252", "replace") if i % 2 else text.encode("latin-1", "replace") + b"\x81\x8d\n"
+            counts["mixed_encoding"] += 1
+        else:
+            name = f"mod{i}.{rng.choice(('py', 'js', 'ts', 'css', 'md', 'json'))}"
+            text = source.text(_file_size(rng, spec))
+            if i % 7 == 0:
+                text += _NON_ASCII + "\n"
+            data = text.encode("utf-8")
+            counts["text"] += 1
+        (d / name).write_bytes(data)
+        counts["bytes"] += len(data)
+
+    chunk = source.corpus.encode("utf-8")
+    for i in range(spec.huge_files):
+        with open(root / f"huge{i}.log", "wb") as f:
+            written = 0
+            while written < spec.huge_size:
+                f.write(chunk[:spec.huge_size - written])
+                written += min(len(chunk), spec.huge_size - written)
+        counts["huge"] += 1
+        counts["bytes"] += spec.huge_size
+
+    for i in range(spec.skip_dir_files):
+        skip_root = root / ("node_modules" if i % 2 else ".git") / f"pkg{i % 50}"
+        skip_root.mkdir(parents=True, exist_ok=True)
+        (skip_root / f"index{i}.js").write_text(source.text(512), encoding="utf-8")
+        counts["skip_dir"] += 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("root", help="Folder to create the tree in")
+    parser.add_argument("--shape", choices=sorted(SHAPES), default="balanced")
+    parser.add_argument("--files", type=int, default=RepoSpec.files)
+    parser.add_argument("--huge-files", type=int, default=RepoSpec.huge_files)
+    parser.add_argument("--huge-mb", type=int, default=RepoSpec.huge_size // (1024 * 1024))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    counts = make_repo(args.root, RepoSpec(files=args.files, shape=args.shape, huge_files=args.huge_files,
+                                           huge_size=args.huge_mb * 1024 * 1024, seed=args.seed))
+    print(counts)
+
+
+if __name__ == "__main__":
+    main()
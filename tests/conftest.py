@@ -0,0 +1,25 @@
+import pytest
+
+from aicontexter.collector import CollectorConfig, FileCollector
+
+
+@pytest.fixture
+def make_source(tmp_path):
+    """Build a source tree: ``make_source({"pkg/a.py": "text", ...})`` -> its root (``tmp_path / "src"``)."""
+    def make(files, name="src"):
+        root = tmp_path / name
+        root.mkdir(parents=True, exist_ok=True)
+        for relative, text in files.items():
+            path = root / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+        return root
+    return make
+
+
+@pytest.fixture
+def collect():
+    """Collect with a single reader: ``collect(source, output, progress=None, cancel=None, **config_options)``."""
+    def run(source, output, progress=None, cancel=None, **options):
+        return FileCollector(CollectorConfig(workers=1, **options), progress, cancel).collect(source, output)
+    return run
@@ -0,0 +1,72 @@
+import os
+
+from aicontexter.cache import default_cache_path
+
+FILES = {f"pkg{i % 3}/m{i:02d}.py": f"value = {i}\n" * (i + 1) for i in range(12)}
+
+
+def _touch(path, seconds):
+    """Move ``path``'s mtime ``seconds`` away from its current one, like a later edit would."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + int(seconds * 1e9)))
+
+
+def test_unchanged_files_are_served_from_the_cache(tmp_path, make_source, collect):
+    source = make_source(FILES)
+    first = collect(source, tmp_path / "out.txt", use_cache=True)
+    assert (first.cache_hits, first.cache_misses) == (0, len(FILES))
+    assert default_cache_path(tmp_path / "out.txt").exists()
+    second = collect(source, tmp_path / "out.txt", use_cache=True)
+    assert (second.cache_hits, second.cache_misses) == (len(FILES), 0)
+    collect(source, tmp_path / "fresh.txt")
+    assert (tmp_path / "out.txt").read_bytes() == (tmp_path / "fresh.txt").read_bytes()
+
+
+def test_changed_added_and_removed_files_are_picked_up(tmp_path, make_source, collect):
+    source = make_source(FILES)
+    collect(source, tmp_path / "out.txt", use_cache=True)
+    (source / "pkg0" / "m00.py").write_text("edited = True\n") # Other size
+    (source / "pkg1" / "m01.py").write_text("value = 9\nvalue = 9\n") # Same size, later mtime
+    _touch(source / "pkg1" / "m01.py", 5)
+    (source / "pkg2" / "m02.py").unlink()
+    (source / "pkg2" / "new.py").write_text("added = True\n")
+
+    result = collect(source, tmp_path / "out.txt", use_cache=True)
+    assert (result.cache_hits, result.cache_misses) == (len(FILES) - 3, 3)
+    text = (tmp_path / "out.txt").read_text()
+    assert "edited = True" in text and "value = 9\nvalue = 9" in text and "added = True" in text
+    assert "m02.py" not in text
+    collect(source, tmp_path / "fresh.txt")
+    assert (tmp_path / "out.txt").read_bytes() == (tmp_path / "fresh.txt").read_bytes()
+
+
+def test_removed_files_are_pruned(tmp_path, make_source, collect):
+    source = make_source(FILES)
+    collect(source, tmp_path / "out.txt", use_cache=True)
+    path = source / "pkg2" / "m02.py"
+    content, mtime_ns = path.read_text(), path.stat().st_mtime_ns
+    path.unlink()
+    collect(source, tmp_path / "out.txt", use_cache=True)
+    # Recreated with the same size and mtime as before, it is read again: its entry is gone
+    path.write_text(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    result = collect(source, tmp_path / "out.txt", use_cache=True)
+    assert (result.cache_hits, result.cache_misses) == (len(FILES) - 1, 1)
+
+
+def test_other_read_settings_discard_the_cache(tmp_path, make_source, collect):
+    source = make_source({**FILES, "pkg0/doc.py": '"""Docstring."""\n# comment\nx = 1\n'})
+    collect(source, tmp_path / "out.txt", use_cache=True)
+    result = collect(source, tmp_path / "out.txt", use_cache=True, compaction="strip")
+    assert result.cache_hits == 0
+    collect(source, tmp_path / "fresh.txt", compaction="strip")
+    assert (tmp_path / "out.txt").read_bytes() == (tmp_path / "fresh.txt").read_bytes()
+    assert "# comment" not in (tmp_path / "out.txt").read_text()
+
+
+def test_cache_is_not_collected(make_source, collect):
+    source = make_source(FILES)
+    collect(source, source / "out.txt", use_cache=True)
+    result = collect(source, source / "out.txt", use_cache=True)
+    assert result.processed_files == len(FILES)
+    assert ".cache.sqlite" not in (source / "out.txt").read_text()
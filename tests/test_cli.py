@@ -0,0 +1,38 @@
+from dataclasses import fields
+
+from aicontexter.__main__ import OPTION_FIELDS, build_config, build_parser, explicit_options
+from aicontexter.collector import CollectorConfig
+from aicontexter.profiles import save_profile
+
+# Options that do not map to CollectorConfig fields
+_NOT_CONFIG = {"help", "source", "output", "batch", "jobs", "profile", "save_profile", "list_profiles",
+               "quiet", "verbose", "gui"}
+
+
+def _config(argv):
+    return build_config(build_parser().parse_args(argv), explicit_options(argv))
+
+
+def test_every_option_is_mapped():
+    dests = {action.dest for action in build_parser()._actions}
+    assert dests - _NOT_CONFIG == set(OPTION_FIELDS)
+    names = {f.name for f in fields(CollectorConfig)}
+    assert {name for mapped in OPTION_FIELDS.values() for name in mapped} <= names
+
+
+def test_explicit_default_overrides_profile(tmp_path):
+    profile = str(tmp_path / "p.json")
+    save_profile(profile, CollectorConfig(budget_strategy="skip", max_tokens=5000, dedupe=True, tokenizer="heuristic",
+                                          output_format="jsonl", compaction="strip"))
+    config = _config(["src", "--profile", profile])
+    assert (config.budget_strategy, config.max_tokens, config.dedupe, config.output_format) == ("skip", 5000, True, "jsonl")
+    config = _config(["src", "--profile", profile, "--budget-strategy", "stop", "--format", "text", "-j", "3"])
+    assert (config.budget_strategy, config.output_format, config.workers) == ("stop", "text", 3)
+    assert (config.max_tokens, config.dedupe, config.compaction) == (5000, True, "strip")
+
+
+def test_output_suffix_compression_overrides_profile(tmp_path):
+    profile = str(tmp_path / "p.json")
+    save_profile(profile, CollectorConfig(compression="gzip"))
+    assert _config(["src", "--profile", profile, "-o", "out.txt"]).compression == "gzip"
+    assert _config(["src", "--profile", profile, "-o", "out.txt.zst", "--compress", "gzip"]).compression == "gzip"
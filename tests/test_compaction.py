@@ -0,0 +1,106 @@
+import ast
+import sys
+
+import pytest
+
+from aicontexter.compaction import compact_text, python_signatures, strip_python
+
+TRY_SOURCE = '''\
+try:
+    import fast
+except ImportError:
+    def f(x):
+        a = x + 1
+        b = a * 2
+        return b
+else:
+    def g(x):
+        return fast.g(x)
+finally:
+    def h():
+        pass
+
+CONST = 5
+'''
+
+MATCH_SOURCE = '''\
+match MODE:
+    case "a":
+        def f():
+            x = 1
+            return x
+    case _:
+        def f():
+            return 2
+
+try:
+    pass
+except* ValueError:
+    def e():
+        return 3
+else:
+    def g():
+        y = 4
+        return y
+
+AFTER = True
+'''
+
+
+def _function_bodies(source):
+    return {node.name: node.body for node in ast.walk(ast.parse(source))
+            if isinstance(node, ast.FunctionDef)}
+
+
+@pytest.mark.skipif(sys.version_info < (3, 8), reason="needs end positions")
+def test_signatures_try_except_else_finally():
+    result = python_signatures(TRY_SOURCE)
+    ast.parse(result)
+    assert "CONST = 5" in result
+    assert "return b" not in result
+    assert "fast.g(x)" not in result
+    for body in _function_bodies(result).values():
+        assert len(body) == 1 and isinstance(body[0], ast.Expr)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 11), reason="match and except* need Python 3.11")
+def test_signatures_match_case_and_except_star():
+    result = python_signatures(MATCH_SOURCE)
+    ast.parse(result)
+    assert "AFTER = True" in result
+    assert 'case "a":' in result and "case _:" in result
+    assert "return x" not in result and "return y" not in result
+
+
+def test_signatures_one_line_body():
+    assert python_signatures("def f(): return 1\nX = 2\n") == "def f(): ...\nX = 2\n"
+
+
+def test_signatures_invalid_python():
+    assert python_signatures("def f(:\n") is None
+
+
+def test_strip_python_comments_and_docstrings():
+    source = '''"""Module doc."""
+import os  # trailing
+# full line
+def f():
+    """Only a docstring."""
+
+class C:
+    r"""Doc."""
+    x = "# not a comment"
+'''
+    result = strip_python(source)
+    ast.parse(result)
+    assert "Module doc" not in result and "trailing" not in result and "full line" not in result
+    assert "def f():\n    ..." in result
+    assert 'x = "# not a comment"' in result
+    assert "Doc." not in result
+
+
+def test_compact_text_other_languages():
+    source = "// comment\nint x = 1; // kept\n/* block\n   comment */\nint y;\n\n\n\nint z;\n"
+    assert compact_text(source, "c") == "int x = 1; // kept\nint y;\n\nint z;\n"
+    assert compact_text("a  \n", "md") == "a  \n"
+    assert compact_text("- a  \n", "diff") == "- a  \n"
@@ -0,0 +1,132 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from aicontexter.filters import FilterRules
+from aicontexter.ignore import IgnoreRules, is_ignored, parse_ignore_line
+from aicontexter.walker import walk_files
+
+# (ignore file lines, path, is_dir, ignored by git)
+CASES = [
+    (["*.log"], "a.log", False, True),
+    (["*.log"], "dir/a.log", False, True),
+    (["*.log"], "a.logx", False, False),
+    (["/build"], "build", True, True),
+    (["/build"], "src/build", True, False),
+    (["build/"], "build", True, True),
+    (["build/"], "build", False, False),
+    (["build/"], "src/build", True, True),
+    (["doc/*.txt"], "doc/a.txt", False, True),
+    (["doc/*.txt"], "doc/sub/a.txt", False, False),
+    (["doc/*.txt"], "x/doc/a.txt", False, False),
+    (["**/foo"], "foo", False, True),
+    (["**/foo"], "a/b/foo", False, True),
+    (["a/**/b"], "a/b", False, True),
+    (["a/**/b"], "a/x/y/b", False, True),
+    (["a/**/b"], "xa/b", False, False),
+    (["logs/**"], "logs/a", False, True),
+    (["logs/**"], "logs/a/b", False, True),
+    (["logs/**"], "logs", True, False),
+    (["foo**bar"], "fooXbar", False, True),
+    (["*.log", "!keep.log"], "keep.log", False, False),
+    (["*.log", "!keep.log"], "a.log", False, True),
+    (["!keep.log", "*.log"], "keep.log", False, True),
+    (["\\#file"], "#file", False, True),
+    (["# comment"], "# comment", False, False),
+    (["\\!important"], "!important", False, True),
+    (["file[0-9].txt"], "file1.txt", False, True),
+    (["file[0-9].txt"], "filea.txt", False, False),
+    (["file[!0-9].txt"], "filea.txt", False, True),
+    (["file[!0-9].txt"], "file1.txt", False, False),
+    (["?.c"], "a.c", False, True),
+    (["?.c"], "ab.c", False, False),
+    (["?.c"], "d/a.c", False, True),
+    (["foo  "], "foo", False, True),
+    (["foo\\ "], "foo ", False, True),
+    (["foo\\ "], "foo", False, False),
+    (["*"], "any/thing", False, True),
+    (["/*.c"], "a.c", False, True),
+    (["/*.c"], "d/a.c", False, False),
+]
+
+
+def _case_id(case):
+    lines, path, is_dir, _ = case
+    return f"{'|'.join(lines)}:{path}{'/' if is_dir else ''}"
+
+
+@pytest.mark.parametrize("lines,path,is_dir,ignored", CASES, ids=map(_case_id, CASES))
+def test_matcher(lines, path, is_dir, ignored):
+    assert is_ignored([IgnoreRules(lines)], path, is_dir) is ignored
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+@pytest.mark.parametrize("lines,path,is_dir,ignored", CASES, ids=map(_case_id, CASES))
+def test_table_matches_git(tmp_path, lines, path, is_dir, ignored):
+    """The expectations above are what git itself decides."""
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    (tmp_path / ".gitignore").write_text("\n".join(lines) + "\n")
+    target = tmp_path / path
+    if is_dir:
+        target.mkdir(parents=True)
+    else:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text("")
+    check = subprocess.run(["git", "-c", "core.ignorecase=false", "check-ignore", "-q", "--no-index", path],
+                           cwd=tmp_path)
+    assert check.returncode in (0, 1)
+    assert (check.returncode == 0) is ignored
+
+
+def test_blank_and_comment_lines():
+    assert parse_ignore_line("") is None
+    assert parse_ignore_line("   ") is None
+    assert parse_ignore_line("# note") is None
+    assert parse_ignore_line("/") is None
+
+
+def _write(root, files):
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+TREE = {
+    ".gitignore": "*.log\nbuild/\n/top.txt\n",
+    "a.py": "",
+    "a.log": "",
+    "top.txt": "",
+    "build/out.py": "",
+    "sub/top.txt": "",
+    "sub/.gitignore": "!keep.log\n",
+    "sub/keep.log": "",
+    "sub/other.log": "",
+    "sub/build/x.py": "",
+    "vendor/.gitignore": "*\n!.gitignore\n",
+    "vendor/lib.py": "",
+}
+
+
+def test_walk_matches_git(tmp_path):
+    _write(tmp_path, TREE)
+    walked = sorted(f.relative_path.replace(os.sep, '/')
+                    for f in walk_files(tmp_path, FilterRules(True, set(), set()), set(), use_ignore_files=True))
+    expected = [".gitignore", "a.py", "sub/.gitignore", "sub/keep.log", "sub/top.txt", "vendor/.gitignore"]
+    assert walked == expected
+    if shutil.which("git") is not None:
+        subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+        listed = subprocess.run(["git", "ls-files", "--others", "--exclude-standard"], cwd=tmp_path,
+                                capture_output=True, text=True, check=True).stdout.split()
+        assert sorted(listed) == expected
+
+
+def test_parent_gitignore_applies_to_subfolder(tmp_path):
+    _write(tmp_path, {".gitignore": "sub/generated/\n*.tmp\n", "sub/a.py": "", "sub/b.tmp": "",
+                      "sub/generated/c.py": ""})
+    (tmp_path / ".git").mkdir()
+    walked = [f.relative_path for f in walk_files(tmp_path / "sub", FilterRules(True, set(), set()), set(),
+                                                  use_ignore_files=True)]
+    assert walked == ["a.py"]
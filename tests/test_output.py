@@ -0,0 +1,100 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from aicontexter.__main__ import main
+from aicontexter.output import atomic_write_text, sidecar_path
+
+FILES = {
+    "a.py": "print('hello')\n",
+    "docs/notes.md": "# Notes\n\nünïcödé, \"quotes\", tabs\tand \\ backslashes\n",
+    "docs/copy.md": "# Notes\n\nünïcödé, \"quotes\", tabs\tand \\ backslashes\n",
+    "pkg/empty.py": "",
+    "pkg/mod.py": "".join(f"line_{i} = {i}\n" for i in range(200)),
+}
+
+
+def test_jsonl_records_round_trip(tmp_path, make_source, collect):
+    source = make_source(FILES)
+    (source / "pkg" / "blob.py").write_bytes(b"\x00\x01binary")
+    result = collect(source, tmp_path / "out.jsonl", output_format="jsonl", dedupe=True)
+    lines = (tmp_path / "out.jsonl").read_text(encoding="utf-8").splitlines()
+    records = {record["path"]: record for record in map(json.loads, lines)}
+    assert list(records) == ["a.py", "docs/copy.md", "docs/notes.md", "pkg/blob.py", "pkg/empty.py", "pkg/mod.py"]
+    assert result.processed_files == len(lines)
+    for path in ("a.py", "docs/copy.md", "pkg/empty.py", "pkg/mod.py"):
+        record = records[path]
+        assert record["content"] == FILES[path]
+        assert record["ext"] == os.path.splitext(path)[1][1:]
+        assert record["size"] == len(FILES[path].encode("utf-8"))
+    assert records["docs/notes.md"]["content"] is None
+    assert records["docs/notes.md"]["identical_to"] == "docs/copy.md"
+    assert records["pkg/blob.py"]["content"] is None and "binary" in records["pkg/blob.py"]["error"]
+
+
+@pytest.mark.parametrize("output_format", ["text", "jsonl"])
+def test_gzip_output_decompresses_to_the_plain_output(tmp_path, make_source, collect, output_format):
+    source = make_source(FILES)
+    collect(source, tmp_path / "plain.out", output_format=output_format)
+    collect(source, tmp_path / "out.gz", output_format=output_format, compression="gzip")
+    assert gzip.decompress((tmp_path / "out.gz").read_bytes()) == (tmp_path / "plain.out").read_bytes()
+
+
+def test_zstd_output_decompresses_to_the_plain_output(tmp_path, make_source, collect):
+    zstandard = pytest.importorskip("zstandard")
+    source = make_source(FILES)
+    collect(source, tmp_path / "plain.txt")
+    collect(source, tmp_path / "out.zst", compression="zstd")
+    with zstandard.ZstdDecompressor().stream_reader(open(tmp_path / "out.zst", "rb")) as reader:
+        assert reader.read() == (tmp_path / "plain.txt").read_bytes()
+
+
+def test_compression_follows_the_output_suffix(tmp_path, make_source, collect):
+    source = make_source(FILES)
+    collect(source, tmp_path / "plain.txt")
+    assert main([str(source), "-o", str(tmp_path / "out.txt.gz"), "-q", "-j", "1"]) == 0
+    assert gzip.decompress((tmp_path / "out.txt.gz").read_bytes()) == (tmp_path / "plain.txt").read_bytes()
+
+
+@pytest.mark.parametrize("options", [[], ["--format", "jsonl"], ["--compress", "gzip"]])
+def test_stdout_gets_the_output_and_nothing_else(tmp_path, make_source, collect, monkeypatch, capfdbinary, options):
+    source = make_source(FILES)
+    collect(source, tmp_path / "plain.out", output_format="jsonl" if "jsonl" in options else "text")
+    monkeypatch.chdir(tmp_path)
+    capfdbinary.readouterr()
+    # Not quiet: progress and the completion report must go to stderr
+    assert main([str(source), "-o", "-", "-j", "1", *options]) == 0
+    captured = capfdbinary.readouterr()
+    out = gzip.decompress(captured.out) if "gzip" in options else captured.out
+    assert out == (tmp_path / "plain.out").read_bytes()
+    assert b"Processed" in captured.err
+    # No output, checkpoint or cache file left behind
+    assert sorted(os.listdir(tmp_path)) == ["plain.out", "src"]
+
+
+def test_unreadable_folder_warning_stays_off_stdout(make_source, monkeypatch, capfd):
+    source = make_source({"a.py": "a = 1\n", "sub/b.py": "b = 2\n", "locked/c.py": "c = 3\n"})
+    real_scandir = os.scandir
+
+    def scandir(path):
+        if os.path.basename(os.fspath(path)) == "locked":
+            raise PermissionError(13, "Permission denied", os.fspath(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+    assert main([str(source), "-o", "-", "--format", "jsonl", "-q", "-j", "1"]) == 0
+    captured = capfd.readouterr()
+    records = [json.loads(line) for line in captured.out.splitlines()]
+    assert [record["path"] for record in records] == ["a.py", "sub/b.py"]
+    assert "Could not list directory" in captured.err
+
+
+def test_atomic_write_keeps_the_previous_file_on_failure(tmp_path):
+    path = tmp_path / "state.json"
+    assert sidecar_path(path, ".tmp") == tmp_path / "state.json.tmp"
+    atomic_write_text(path, "old\n")
+    with pytest.raises(UnicodeEncodeError):
+        atomic_write_text(path, "new \udc80\n")
+    assert path.read_text() == "old\n"
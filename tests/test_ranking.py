@@ -0,0 +1,29 @@
+import pytest
+
+FILES = {
+    "alpha.py": "def render():\n    pass\n",
+    "beta.py": "def parse_invoice(invoice):\n    return invoice.total\n",
+    "gamma.py": "x = 1\n",
+}
+
+
+def _file_order(text):
+    return [line.split()[2] for line in text.splitlines() if line.startswith("==== FILE:")]
+
+
+def test_ranking_orders_by_prompt(tmp_path, make_source, collect):
+    result = collect(make_source(FILES), tmp_path / "out.txt", rank_files=True, prompt="Fix the invoice total")
+    text = (tmp_path / "out.txt").read_text()
+    assert _file_order(text)[0] == "beta.py"
+    assert "Files are ordered by relevance to the task prompt." in text
+    assert result.ranking_summary() == "Ranking: 3 files ordered by relevance to the prompt"
+
+
+@pytest.mark.parametrize("prompt", ["", "!!! ???"])
+def test_no_relevance_note_without_terms(tmp_path, make_source, collect, prompt):
+    result = collect(make_source(FILES), tmp_path / "out.txt", rank_files=True, prompt=prompt, top_k=2)
+    text = (tmp_path / "out.txt").read_text()
+    assert _file_order(text) == ["alpha.py", "beta.py"]
+    assert "ordered by relevance" not in text
+    assert result.ranking_terms == 0
+    assert result.ranking_summary() == "Ranking: the prompt has no terms to rank by, 2 files kept in walk order"
@@ -0,0 +1,38 @@
+import pytest
+
+from aicontexter.reading import DEFAULT_EXCERPT_BYTES, ReadLimits, read_text_file
+
+LINE = "line {:05d} ünïcödé\n"
+
+
+def _text(size):
+    """Multi-line text of exactly ``size`` UTF-8 bytes."""
+    text = "".join(LINE.format(i) for i in range(size // len(LINE.format(0).encode("utf-8")) + 1))
+    text = text.encode("utf-8")[:size].decode("utf-8", "ignore")
+    return text + "x" * (size - len(text.encode("utf-8")))
+
+
+@pytest.mark.parametrize("max_size,excerpt_bytes,size", [
+    (40 * 1024, DEFAULT_EXCERPT_BYTES, 60000), # Cap below twice the default excerpt
+    (DEFAULT_EXCERPT_BYTES + 1, DEFAULT_EXCERPT_BYTES, DEFAULT_EXCERPT_BYTES + 2), # Cap just above the excerpt
+    (1000, 100, 5000),
+    (1, 100, 2),
+])
+def test_truncated_excerpt_fits_the_cap(tmp_path, max_size, excerpt_bytes, size):
+    path = tmp_path / "big.txt"
+    path.write_text(_text(size), encoding="utf-8")
+    result = read_text_file(path, ReadLimits(max_size, "truncate", excerpt_bytes))
+    assert result.truncated and result.error is None
+    assert result.size <= max(max_size, 2)
+    head, marker, tail = result.content.partition("\n[... truncated: ")
+    assert marker and "size limit ...]" in tail
+    assert len(head.encode("utf-8")) + len(tail.split("...]\n\n", 1)[1].encode("utf-8")) <= max(max_size, 2)
+
+
+def test_truncate_counts_files_and_keeps_small_ones(tmp_path, make_source, collect):
+    source = make_source({"big.txt": _text(60000), "small.txt": "small\n"})
+    result = collect(source, tmp_path / "out.txt", max_file_size=40 * 1024, oversize_mode="truncate")
+    text = (tmp_path / "out.txt").read_text(encoding="utf-8")
+    assert result.truncated_files == 1
+    assert text.count("[... truncated: ") == 1 and "small\n" in text
+    assert len(text.encode("utf-8")) < 60000
@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+
+from aicontexter.checkpoint import default_checkpoint_path
+
+
+class Interrupt(Exception):
+    pass
+
+
+SOURCE = {
+    **{f"{d}/f{i}.py": f"# {d}/{i}\n" + f"x = {i}\n" * (i + 1) for d in ("a", "b", "c") for i in range(10)},
+    "a/dup.py": "x = 0\n",
+}
+
+
+def _interrupted_run(collect, source, output, after, how, **options):
+    """Collect until ``after`` files are written, then stop by cancelling or by an error."""
+    cancel = threading.Event()
+
+    def progress(message, processed=None, total=None):
+        if processed == after:
+            if how == "cancel":
+                cancel.set()
+            else:
+                raise Interrupt()
+
+    if how == "cancel":
+        result = collect(source, output, progress, cancel, **options)
+        assert result.cancelled and result.processed_files == after
+    else:
+        with pytest.raises(Interrupt):
+            collect(source, output, progress, cancel, **options)
+    assert default_checkpoint_path(output).exists()
+
+
+@pytest.mark.parametrize("how", ["cancel", "error"])
+@pytest.mark.parametrize("options", [{}, {"dedupe": True}, {"count_first": True}, {"max_tokens": 800, "budget_strategy": "skip"}])
+def test_resume_matches_uninterrupted_run(tmp_path, make_source, collect, how, options):
+    source = make_source(SOURCE)
+    collect(source, tmp_path / "full.txt", **options)
+    output = tmp_path / "out.txt"
+    _interrupted_run(collect, source, output, 12, how, **options)
+
+    result = collect(source, output, resume=True, **options)
+    assert result.resumed_files == 12
+    assert not default_checkpoint_path(output).exists()
+    assert output.read_bytes() == (tmp_path / "full.txt").read_bytes()
+
+
+def test_resume_after_source_changed(tmp_path, make_source, collect):
+    """Files not written before the interruption are read as they are when resuming."""
+    source = make_source(SOURCE)
+    output = tmp_path / "out.txt"
+    _interrupted_run(collect, source, output, 5, "cancel")
+    (source / "c" / "f3.py").write_text("changed = True\n")
+    (source / "b" / "new.py").write_text("added = True\n")
+    (source / "c" / "f9.py").unlink()
+
+    result = collect(source, output, resume=True)
+    assert result.resumed_files == 5
+    collect(source, tmp_path / "full.txt")
+    text = output.read_text()
+    assert "changed = True" in text and "added = True" in text and "c/f9.py" not in text
+    assert output.read_bytes() == (tmp_path / "full.txt").read_bytes()
+
+
+def test_resume_with_other_settings_starts_over(tmp_path, make_source, collect):
+    source = make_source(SOURCE)
+    output = tmp_path / "out.txt"
+    _interrupted_run(collect, source, output, 5, "cancel")
+    result = collect(source, output, resume=True, dedupe=True)
+    assert result.resumed_files == 0
+    collect(source, tmp_path / "full.txt", dedupe=True)
+    assert output.read_bytes() == (tmp_path / "full.txt").read_bytes()
+
+
+def test_resume_after_output_truncated_starts_over(tmp_path, make_source, collect):
+    source = make_source(SOURCE)
+    output = tmp_path / "out.txt"
+    _interrupted_run(collect, source, output, 5, "cancel")
+    output.write_text("")
+    result = collect(source, output, resume=True)
+    assert result.resumed_files == 0
+    collect(source, tmp_path / "full.txt")
+    assert output.read_bytes() == (tmp_path / "full.txt").read_bytes()
@@ -0,0 +1,190 @@
+import gzip
+import json
+import re
+import threading
+import time
+
+import pytest
+
+from aicontexter import splitting
+from aicontexter.collector import SEPARATOR, CollectorConfig
+from aicontexter.splitting import PartWriter, manifest_path, part_path
+from aicontexter.tokens import get_tokenizer
+
+_BLOCK_RE = re.compile(r"==== FILE: (?P<path>.+?) \[(?P<ext>[^\]]+)\](?P<piece> \(piece (?P<i>\d+) of (?P<n>\d+)\))? ====\n\n"
+                       r"(?P<body>.*?)\n\n" + SEPARATOR + r"\n\n", re.DOTALL)
+
+
+SOURCE = {
+    **{f"pkg/mod{i:02d}.py": "".join(f"value_{i}_{j} = {j} * {i}\n" for j in range(i * 3)) for i in range(40)},
+    # Larger than any part below: cut into pieces at line boundaries
+    "big.py": "".join(f"def function_{j}(argument):\n    return argument + {j}\n\n" for j in range(400)),
+    # One line longer than a part: cut inside the line
+    "data.json": '{"k": "' + "x" * 9000 + '"}\n',
+    "notes.md": "# Notes\n\nünïcödé text\n",
+}
+
+
+def _body(text):
+    """The blocks of a text output: header and end-of-collection footer removed."""
+    start = text.index(SEPARATOR + "\n\n") + len(SEPARATOR) + 2
+    body = text[start:]
+    return re.sub(r"End of collection: .*\n\Z", "", body)
+
+
+def _join_pieces(body):
+    """Put the pieces of files cut across parts back into one block each."""
+    out, pieces = [], []
+    position = 0
+    for match in _BLOCK_RE.finditer(body):
+        assert match.start() == position
+        position = match.end()
+        if match["piece"] is None:
+            out.append(match[0])
+            continue
+        pieces.append(match["body"])
+        if match["i"] == match["n"]:
+            assert len(pieces) == int(match["n"])
+            out.append(f"==== FILE: {match['path']} [{match['ext']}] ====\n\n{''.join(pieces)}\n\n{SEPARATOR}\n\n")
+            pieces = []
+    assert position == len(body) and not pieces
+    return "".join(out)
+
+
+@pytest.mark.parametrize("options,measure", [
+    ({"split_bytes": 4096}, lambda text: len(text.encode("utf-8"))),
+    ({"split_tokens": 1000}, get_tokenizer("heuristic")),
+])
+def test_split_parts_reassemble_to_unsplit_output(tmp_path, make_source, collect, options, measure):
+    source = make_source(SOURCE)
+    collect(source, tmp_path / "whole.txt")
+    result = collect(source, tmp_path / "out" / "ctx.txt", **options)
+    limit = options.get("split_bytes") or options.get("split_tokens")
+
+    manifest = json.loads(manifest_path(tmp_path / "out" / "ctx.txt").read_text())
+    assert manifest["complete"] is True
+    assert result.output_parts == len(manifest["parts"]) > 1
+    texts = []
+    for number, entry in enumerate(manifest["parts"], 1):
+        path = tmp_path / "out" / entry["path"]
+        assert path == part_path(tmp_path / "out" / "ctx.txt", number)
+        assert entry["size"] == path.stat().st_size
+        text = path.read_text(encoding="utf-8")
+        assert measure(text) <= limit
+        assert f"Part {number} of a split collection, with {len(entry['files'])} files" in text
+        texts.append(text)
+    assert texts[-1].endswith(f"End of collection: {result.processed_files} files in {len(texts)} parts.\n")
+    assert not (tmp_path / "out" / "ctx.txt").exists()
+
+    whole = _body((tmp_path / "whole.txt").read_text(encoding="utf-8"))
+    split = "".join(_body(text) for text in texts)
+    assert "(piece 1 of" in split
+    assert _join_pieces(split) == whole
+    # The manifest lists every file in output order (a file cut into pieces under each of its parts)
+    listed = [name for entry in manifest["parts"] for name in entry["files"]]
+    assert list(dict.fromkeys(listed)) == [m["path"] for m in _BLOCK_RE.finditer(whole)]
+    assert result.stats.bytes_written == sum(entry["size"] for entry in manifest["parts"])
+
+
+def test_split_jsonl_pieces(tmp_path, make_source, collect):
+    source = make_source(SOURCE)
+    collect(source, tmp_path / "whole.jsonl", output_format="jsonl")
+    collect(source, tmp_path / "ctx.jsonl", output_format="jsonl", split_bytes=4096)
+    whole = [json.loads(line) for line in open(tmp_path / "whole.jsonl", encoding="utf-8")]
+    records = []
+    for entry in json.loads((tmp_path / "ctx.parts.json").read_text())["parts"]:
+        part = tmp_path / entry["path"]
+        assert part.stat().st_size <= 4096
+        records.extend(json.loads(line) for line in open(part, encoding="utf-8"))
+    joined = []
+    for record in records:
+        if record.get("piece", 1) > 1:
+            joined[-1]["content"] += record["content"]
+        else:
+            joined.append(record)
+    for record in joined:
+        record.pop("piece", None)
+        record.pop("pieces", None)
+    assert joined == whole
+
+
+def test_split_gzip_and_stale_parts(tmp_path, make_source, collect):
+    source = make_source(SOURCE)
+    output = tmp_path / "ctx.txt.gz"
+    small = collect(source, output, split_bytes=2048, compression="gzip")
+    assert part_path(output, small.output_parts).name == f"ctx.part{small.output_parts:03d}.txt.gz"
+    large = collect(source, output, split_bytes=20000, compression="gzip")
+    assert large.output_parts < small.output_parts
+    parts = sorted(tmp_path.glob("ctx.part*.txt.gz"))
+    assert len(parts) == large.output_parts
+    collect(source, tmp_path / "whole.txt")
+    split = "".join(_body(gzip.open(part, "rt", encoding="utf-8").read()) for part in parts)
+    assert _join_pieces(split) == _body((tmp_path / "whole.txt").read_text(encoding="utf-8"))
+
+
+def test_output_inside_source_does_not_collect_parts(tmp_path, make_source, collect):
+    source = make_source(SOURCE)
+    first = collect(source, source / "ctx.txt", split_bytes=4096)
+    second = collect(source, source / "ctx.txt", split_bytes=4096)
+    assert first.processed_files == second.processed_files
+    manifest = json.loads((source / "ctx.parts.json").read_text())
+    assert not any(name.startswith("ctx.part") for entry in manifest["parts"] for name in entry["files"])
+
+
+def test_split_settings_are_validated(tmp_path, make_source, collect):
+    with pytest.raises(ValueError):
+        CollectorConfig(split_tokens=1000, token_summary=True)
+    with pytest.raises(ValueError):
+        CollectorConfig(split_tokens=1000, split_bytes=1000)
+    with pytest.raises(ValueError):
+        CollectorConfig(split_bytes=0)
+    source = make_source(SOURCE)
+    with pytest.raises(ValueError):
+        collect(source, "-", split_bytes=4096)
+    with pytest.raises(ValueError):
+        collect(source, tmp_path / "ctx.txt", split_bytes=10) # Smaller than the part header
+
+
+def test_part_writer_writes_parts_concurrently(tmp_path, monkeypatch):
+    active = 0
+    most_active = 0
+    lock = threading.Lock()
+    real_open_output = splitting.open_output
+
+    class SlowOutput:
+        def __init__(self, path, compression):
+            self._file = real_open_output(path, compression)
+
+        def __enter__(self):
+            nonlocal active, most_active
+            with lock:
+                active += 1
+                most_active = max(most_active, active)
+            return self._file
+
+        def __exit__(self, *exc):
+            nonlocal active
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return self._file.__exit__(*exc)
+
+    monkeypatch.setattr(splitting, "open_output", SlowOutput)
+    writer = PartWriter(tmp_path / "out.txt", capacity=10, header_for=lambda part: f"part {part.number}\n")
+    for i in range(20):
+        writer.add(f"dir/f{i}.txt", f"block {i:03d}\n", 10)
+    writer.close(lambda count: f"end of {count}\n")
+    assert most_active > 1
+    assert len(writer.parts) == 20
+    for i, part in enumerate(writer.parts):
+        expected = f"part {i + 1}\nblock {i:03d}\n" + ("end of 20\n" if i == 19 else "")
+        assert part.path.read_text() == expected
+        assert part.files == [f"dir/f{i}.txt"]
+
+
+def test_part_writer_raises_write_errors(tmp_path):
+    writer = PartWriter(tmp_path / "missing" / "out.txt", capacity=5)
+    writer.add("a", "aaaaa", 5)
+    writer.add("b", "bbbbb", 5)
+    with pytest.raises(OSError):
+        writer.close()
@@ -0,0 +1,26 @@
+import time
+
+import pytest
+
+from aicontexter import collector
+from aicontexter.collector import FileCollector
+
+FILES = {f"pkg{i % 4}/m{i:02d}.py": f"x = {i}\n" for i in range(40)}
+
+
+@pytest.mark.parametrize("save_stats", [False, True])
+def test_scan_time_leaves_out_waits_for_the_writer(tmp_path, make_source, collect, monkeypatch, save_stats):
+    """The scanner blocks on a full queue while the writer is slow; that wait is not scanning."""
+    monkeypatch.setattr(collector, "SCAN_QUEUE_SIZE", 1)
+    format_block = FileCollector._format_block
+
+    def slow_format_block(self, *args, **kwargs):
+        time.sleep(0.01)
+        return format_block(self, *args, **kwargs)
+
+    monkeypatch.setattr(FileCollector, "_format_block", slow_format_block)
+    options = {"stats_path": tmp_path / "stats.json"} if save_stats else {}
+    stats = collect(make_source(FILES), tmp_path / "out.txt", **options).stats
+    assert stats.wall_seconds >= 0.4
+    assert stats.scan_seconds < stats.wall_seconds / 4
+    assert (stats.filter_seconds > 0) is save_stats
@@ -0,0 +1,40 @@
+import re
+
+import pytest
+
+from aicontexter.tokens import estimate_tokens
+
+FILES = {f"pkg{i % 7}/sub{i % 3}/module_{i:03d}.py": f"# module {i}\n" + "value = 1\n" * (i % 11 + 1)
+         for i in range(300)}
+
+
+def test_token_summary_total_matches_report(tmp_path, make_source, collect):
+    source = make_source({f"pkg/m{i}.py": "value = 1\n" * (i + 1) for i in range(5)})
+    result = collect(source, tmp_path / "out.txt", token_summary=True)
+    text = (tmp_path / "out.txt").read_text()
+    table_total = int(re.search(r"Token Summary \(estimated\): ([\d,]+) tokens in 5 files, header not included",
+                                text).group(1).replace(",", ""))
+    assert table_total == result.file_tokens
+    assert result.estimated_tokens > result.file_tokens
+    assert result.token_summary_line() == (f"Estimated tokens: {result.estimated_tokens:,} including the header "
+                                           f"({result.file_tokens:,} in the files)")
+
+
+@pytest.mark.parametrize("token_summary", [True, False])
+@pytest.mark.parametrize("strategy", ["stop", "skip"])
+@pytest.mark.parametrize("budget", [{"max_tokens": 5000}, {"max_tokens": 600}, {"max_bytes": 12000}])
+def test_budget_covers_the_whole_output(tmp_path, make_source, collect, token_summary, strategy, budget):
+    output = tmp_path / "out.txt"
+    result = collect(make_source(FILES), output, token_summary=token_summary, budget_strategy=strategy, **budget)
+    text = output.read_text(encoding="utf-8")
+    assert 0 < result.processed_files < len(FILES) and result.omitted_files
+    assert text.count("==== FILE: ") == result.processed_files
+    if "max_tokens" in budget:
+        assert estimate_tokens(text) <= result.estimated_tokens <= budget["max_tokens"]
+    else:
+        assert len(text.encode("utf-8")) <= budget["max_bytes"]
+    if token_summary:
+        assert "Omitted (over budget): " in text
+        assert re.search(r"  +\d[\d,]*  pkg\d/sub\d/\n", text) # Per-directory rows
+    else:
+        assert text.endswith(f"End of collection: {result.processed_files} files.\n")
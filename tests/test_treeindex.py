@@ -0,0 +1,95 @@
+import os
+import time
+
+from aicontexter.treeindex import TreeIndex
+
+FILES = {f"{d}/m{i}.py": f"# {d}/{i}\n" for d in ("a", "a/inner", "b", "c") for i in range(3)}
+DIRS = ("", "a", "a/inner", "b", "c")
+
+
+def _age(source, dirs=DIRS, seconds=60):
+    """Date ``dirs`` ``seconds`` back, out of the racy window, as if they had not changed for a while."""
+    past = time.time_ns() - int(seconds * 1e9)
+    for d in dirs:
+        os.utime(source / d, ns=(past, past))
+
+
+def _collect_indexed(collect, source, tmp_path, name="out.txt"):
+    result = collect(source, tmp_path / name, tree_index_path=tmp_path / "tree.json")
+    collect(source, tmp_path / "fresh.txt")
+    assert (tmp_path / name).read_bytes() == (tmp_path / "fresh.txt").read_bytes()
+    return result
+
+
+def test_unchanged_folders_are_not_listed_again(tmp_path, make_source, collect):
+    source = make_source(FILES)
+    _age(source)
+    first = _collect_indexed(collect, source, tmp_path)
+    assert (first.index_listed_dirs, first.index_reused_dirs) == (len(DIRS), 0)
+    second = _collect_indexed(collect, source, tmp_path)
+    assert (second.index_listed_dirs, second.index_reused_dirs) == (0, len(DIRS))
+
+
+def test_changed_folders_are_listed_again(tmp_path, make_source, collect):
+    source = make_source(FILES)
+    _age(source)
+    _collect_indexed(collect, source, tmp_path)
+    (source / "a" / "inner" / "new.py").write_text("added = True\n")
+    (source / "b" / "m1.py").unlink()
+    (source / "c" / "m2.py").rename(source / "c" / "renamed.py")
+    (source / "d").mkdir()
+    (source / "d" / "m.py").write_text("in_new_folder = True\n")
+
+    result = _collect_indexed(collect, source, tmp_path)
+    # a/inner, b, c and d changed; the root changed too, as d was added to it
+    assert (result.index_listed_dirs, result.index_reused_dirs) == (5, 1)
+    text = (tmp_path / "out.txt").read_text()
+    assert "added = True" in text and "in_new_folder = True" in text and "renamed.py" in text
+    assert os.path.join("b", "m1.py") not in text
+
+
+def test_removed_folder_is_forgotten(tmp_path, make_source, collect):
+    source = make_source(FILES)
+    _age(source)
+    _collect_indexed(collect, source, tmp_path)
+    for i in range(3):
+        (source / "a" / "inner" / f"m{i}.py").unlink()
+    (source / "a" / "inner").rmdir()
+    result = _collect_indexed(collect, source, tmp_path)
+    assert result.index_listed_dirs == 1 # Only a, the folder that held it
+    assert "inner" not in (tmp_path / "out.txt").read_text()
+    assert len(TreeIndex.load(tmp_path / "tree.json", source)) == len(DIRS) - 1
+
+
+def test_edited_file_content_is_read_fresh(tmp_path, make_source, collect):
+    """An in-place edit leaves the folder's mtime alone; the listing is reused, the content is not."""
+    source = make_source(FILES)
+    _age(source)
+    _collect_indexed(collect, source, tmp_path)
+    (source / "b" / "m0.py").write_text("edited = True\n")
+    result = _collect_indexed(collect, source, tmp_path)
+    assert result.index_listed_dirs == 0
+    assert "edited = True" in (tmp_path / "out.txt").read_text()
+
+
+def test_folder_listed_in_the_same_tick_as_a_change_is_listed_again(tmp_path, make_source, collect):
+    """A change that leaves the mtime as it was (a coarse clock) is still found if the listing was racy."""
+    source = make_source(FILES)
+    _age(source, [d for d in DIRS if d != "b"])
+    now = time.time_ns()
+    os.utime(source / "b", ns=(now, now))
+    _collect_indexed(collect, source, tmp_path)
+    (source / "b" / "late.py").write_text("late = True\n")
+    os.utime(source / "b", ns=(now, now))
+
+    result = _collect_indexed(collect, source, tmp_path)
+    assert result.index_listed_dirs == 1
+    assert "late = True" in (tmp_path / "out.txt").read_text()
+
+
+def test_index_for_another_tree_is_ignored(tmp_path, make_source, collect):
+    source = make_source(FILES)
+    other = make_source({"x.py": "x = 1\n"}, name="other")
+    collect(other, tmp_path / "other.txt", tree_index_path=tmp_path / "tree.json")
+    result = _collect_indexed(collect, source, tmp_path)
+    assert result.index_reused_dirs == 0
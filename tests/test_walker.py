@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+from aicontexter.filters import FilterRules, file_extension
+from aicontexter.walker import OwnFiles, WalkStats, walk_files, walk_order_key
+
+ALL_FILES = FilterRules(True, set(), set())
+
+
+def _files(*names):
+    return {name: f"# {name}\n" for name in names}
+
+
+def _names(root, rules=ALL_FILES, skip_dirs=(), **options):
+    return [f.relative_path for f in walk_files(root, rules, set(skip_dirs), **options)]
+
+
+def _sorted_os_walk(root):
+    """The reference order: a sorted top-down ``os.walk``."""
+    names = []
+    for dir_path, dirs, files in os.walk(root):
+        dirs.sort()
+        names.extend(os.path.relpath(os.path.join(dir_path, name), root) for name in sorted(files))
+    return names
+
+
+def test_walk_order_matches_sorted_os_walk(make_source):
+    root = make_source(_files("b.py", "a.py", "A.py", "_x.py", "sub/z.py", "sub/a.py", "sub-b/c.py", "sub.d/c.py",
+                              "sub/deep/er/e.py", "Sub/u.py", "z/a.py"))
+    names = _names(root)
+    assert names == _sorted_os_walk(root)
+    assert names == sorted(names, key=walk_order_key)
+
+
+@pytest.mark.parametrize("name,expected", [
+    ("a.py", "py"), ("A.PY", "py"), ("a.tar.gz", "gz"), (".env", ""), ("a.", ""), ("Makefile", ""),
+])
+def test_file_extension(name, expected):
+    assert file_extension(name) == expected
+
+
+@pytest.mark.parametrize("use_all,include,exclude,name,expected", [
+    (True, (), (), "Makefile", True),
+    (True, (), ("py",), "a.py", False),
+    (True, (), ("py",), "A.PY", False),
+    (True, (), ("package-lock.json",), "package-lock.json", False),
+    (True, (), ("package-lock.json",), "other.json", True),
+    (False, ("py",), (), "a.py", True),
+    (False, ("py",), (), "a.txt", False),
+    (False, ("py",), (), "Makefile", False),
+    (False, ("py",), ("secret.py",), "secret.py", False),
+])
+def test_filter_rules(use_all, include, exclude, name, expected):
+    assert FilterRules(use_all, include, exclude).matches(name) is expected
+
+
+def test_skip_dirs_excluded_paths_and_symlinks(make_source):
+    root = make_source(_files("a.py", "a.txt", "node_modules/m.py", "Build/b.py", "keep/k.py", "keep/drop.py",
+                              "gone/g.py"))
+    try:
+        os.symlink(root / "keep", root / "link", target_is_directory=True)
+    except OSError:
+        pytest.skip("symlinks are not available")
+    stats = WalkStats()
+    names = _names(root, FilterRules(False, {"py"}, set()), {"node_modules", "build"}, stats=stats,
+                   excluded_paths={"gone", "keep/drop.py"})
+    assert names == ["a.py", os.path.join("keep", "k.py")]
+    assert stats.skipped_dirs == 3
+
+
+def test_own_files_names_and_patterns(make_source):
+    root = make_source(_files("a.py", "out.txt", "out.part001.txt", "out.part012.txt", "out.parts.json",
+                              "out.partial.txt"))
+    own_files = OwnFiles([root / "out.txt", root / "out.parts.json"], [root / "out.part[0-9][0-9][0-9]*.txt"])
+    assert _names(root, own_files=own_files) == ["a.py", "out.partial.txt"]